@@ -0,0 +1,126 @@
+"""
+Script:         xray_filter_bench.py
+Author:         AutoForge Team
+
+Description:
+    Micro-benchmark for the XRay content normalization engine.
+    Generates a reproducible synthetic C source tree, runs both the former per-line implementation
+    and the current whole-buffer 'CoreXRayDB._filter_file_content()' over it, verifies that the
+    outputs are identical and reports the throughput of each.
+
+Usage:
+    python benchmarks/xray_filter_bench.py [--files N] [--seed N] [--rounds N]
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Callable, Optional
+
+# AutoForge imports
+from auto_forge.core.xray import CoreXRayDB
+
+
+def legacy_filter_file_content(text: str) -> Optional[str]:
+    """ Reference copy of the original per-line normalization implementation. """
+    with suppress(Exception):
+        if '\x00' in text:
+            return None
+
+        if text.startswith('\ufeff'):
+            text = text.lstrip('\ufeff')
+
+        text = text.replace('\r\n', '\n').replace('\n\r', '\n').replace('\r', '\n')
+
+        lines = []
+        for line in text.split('\n'):
+            line = line.rstrip(" \t\v\f")
+            line = line.replace('\t', '    ')
+            line = re.sub(r'(?<=\S)[ \t]+(?=\S)', ' ', line)
+            lines.append(line)
+
+        while lines and not lines[-1].strip():
+            lines.pop()
+
+        return '\n'.join(lines) if lines else None
+
+    return None
+
+
+def generate_c_tree(root: Path, files: int, seed: int) -> list[Path]:
+    """
+    Generate a synthetic C tree with a realistic mix of indentation, tabs, trailing whitespace,
+    CRLF line endings, BOM markers and trailing blank lines.
+    Returns:
+        list[Path]: The generated files.
+    """
+    rnd = random.Random(seed)
+    generated: list[Path] = []
+    indents = ["", "\t", "    ", "\t\t", "        ", "  \t"]
+    trailers = ["", "", "", " ", "\t", "   ", " \f"]
+    statements = ["int {v} = {n};", "if ({v}  >  {n})\t{{", "return   {v} + {n};", "}}", "/* {v}   note */",
+                  "#define  {V}_MAX\t\t{n}", "{v}({n},  {v});", ""]
+
+    for index in range(files):
+        module_dir = root / f"module_{index % 32:02d}" / ("include" if index % 3 else "src")
+        module_dir.mkdir(parents=True, exist_ok=True)
+        lines = [f"#include <mod_{index % 7}.h>", ""]
+        for _ in range(rnd.randint(50, 600)):
+            var = f"var_{rnd.randint(0, 999)}"
+            text = rnd.choice(statements).format(v=var, V=var.upper(), n=rnd.randint(0, 4096))
+            lines.append(rnd.choice(indents) + text + rnd.choice(trailers))
+        newline = "\r\n" if index % 11 == 0 else "\n"
+        content = newline.join(lines) + newline * rnd.randint(0, 3)
+        if index % 17 == 0:
+            content = "\ufeff" + content
+
+        path = module_dir / f"file_{index:05d}.{'c' if index % 3 == 0 else 'h'}"
+        path.write_text(content, encoding="utf-8", newline="")
+        generated.append(path)
+
+    return generated
+
+
+def run_pass(name: str, func: Callable[[str], Optional[str]], texts: list[str], rounds: int) -> float:
+    """ Time 'rounds' passes of 'func' over all texts and print the throughput. """
+    total_bytes = sum(len(text) for text in texts) * rounds
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            func(text)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14} {elapsed:8.3f} sec  {total_bytes / elapsed / (1024 * 1024):8.2f} MB/sec")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="XRay content normalization micro-benchmark")
+    parser.add_argument("--files", type=int, default=2000, help="Number of synthetic C files (default: 2000)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed passes over the tree (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="xray_bench_") as temp_path:
+        files = generate_c_tree(Path(temp_path), files=args.files, seed=args.seed)
+        texts = [file.read_bytes().decode("utf-8", errors="ignore") for file in files]
+
+    # Outputs must be identical before timing means anything
+    for file, text in zip(files, texts):
+        if legacy_filter_file_content(text) != CoreXRayDB._filter_file_content(text):
+            print(f"Output mismatch for '{file.name}'", file=sys.stderr)
+            return 1
+
+    print(f"{len(texts)} files, {sum(len(t) for t in texts) / (1024 * 1024):.2f} MB, {args.rounds} rounds")
+    legacy_time = run_pass("per-line", legacy_filter_file_content, texts, args.rounds)
+    current_time = run_pass("whole-buffer", CoreXRayDB._filter_file_content, texts, args.rounds)
+    print(f"Speedup: {legacy_time / current_time:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Script:         xray_index_bench.py
+Author:         AutoForge Team
+
+Description:
+    Indexing benchmark for the XRay source tree database.
+    Generates a reproducible synthetic C/H/CMake tree with a configurable size and duplication rate, then runs
+    'CoreXRayDB._perform_indexing()' three times against it:
+        - cold:      empty index, every file is read and written.
+        - warm:      unchanged tree, files are skipped on their stat() metadata.
+        - changed:   a percentage of the files (1% by default) was modified since the warm pass.
+    Each pass starts from a fresh indexer, as a new AutoForge session would, and reports files/sec, MB/sec,
+    peak RSS and the database size. The report is written as JSON so runs can be compared between releases.
+
+Usage:
+    python benchmarks/xray_index_bench.py [--files N] [--roots N] [--dup-rate F] [--changed-pct F] [--seed N]
+                                          [--storage-mode MODE] [--reader-backend BACKEND] [--shard]
+                                          [--output FILE] [--verbose]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+# AutoForge imports
+import auto_forge
+from auto_forge import CoreModuleInterface
+from auto_forge.core.jsonc_processor import CoreJSONCProcessor
+from auto_forge.core.xray import CoreXRayDB
+
+
+class _BenchXRayDB(CoreXRayDB):
+    """ CoreXRayDB running outside an AutoForge session, only the indexing pipeline is usable """
+    auto_forge = SimpleNamespace(version="benchmark")
+
+
+def load_package_configuration() -> dict[str, Any]:
+    """ Load the package 'auto_forge.jsonc', which holds the 'db_*' defaults """
+    config_file = Path(auto_forge.__file__).parent / "config" / "auto_forge.jsonc"
+    text = CoreJSONCProcessor._strip_comments(config_file.read_text(encoding="utf-8"))
+    return json.loads(CoreJSONCProcessor._normalize_multiline_strings(text))
+
+
+def create_indexer(configuration: dict[str, Any], roots: list[Path], index_path: Path) -> CoreXRayDB:
+    """
+    Build an indexer without the AutoForge singletons: the framework constructor is skipped and only the
+    attributes used by _initialize_database() and _perform_indexing() are set up.
+    """
+    xray = object.__new__(_BenchXRayDB)
+    with mock.patch.object(CoreModuleInterface, "__init__", lambda *_args, **_kwargs: None):
+        CoreXRayDB.__init__(xray)
+
+    xray._logger = logging.getLogger("XRayBench")
+    xray._solution = SimpleNamespace(solution_name="benchmark")
+    xray._managed_paths = roots
+    xray._index_path = index_path
+    xray._load_configuration(configuration)
+    xray._clean_slate = not any(db_file.exists() for db_file in xray._db_files)
+    return xray
+
+
+def generate_tree(root: Path, files: int, roots: int, dup_rate: float, seed: int) -> dict[str, Any]:
+    """
+    Generate a synthetic SDK like tree: 'roots' managed paths made of modules, each with 'src' and 'include'
+    directories and a 'CMakeLists.txt'. A 'dup_rate' fraction of the sources are copies of earlier files,
+    half of them exact and half with a single changed line (near-duplicates).
+    Returns:
+        dict[str, Any]: Tree statistics, including the managed 'roots' paths.
+    """
+    rnd = random.Random(seed)
+    root_paths = [root / f"sdk_{index}" for index in range(roots)]
+    sources: list[str] = []
+    total_bytes: int = 0
+    duplicates: int = 0
+
+    def _c_source(_index: int) -> str:
+        _lines = [f"#include \"mod_{rnd.randint(0, 63)}.h\"", "#include <stdint.h>", ""]
+        for _function in range(rnd.randint(2, 12)):
+            _name = f"func_{_index}_{_function}"
+            _lines.append(f"static int {_name}(int value, const uint8_t *buffer)")
+            _lines.append("{")
+            for _ in range(rnd.randint(5, 40)):
+                _lines.append(rnd.choice([
+                    f"    value += buffer[{rnd.randint(0, 255)}] * {rnd.randint(1, 97)};",
+                    f"    if (value > {rnd.randint(0, 4096)}) {{ value -= {rnd.randint(1, 64)}; }}",
+                    f"    value = (value << {rnd.randint(1, 7)}) ^ 0x{rnd.randint(0, 0xffff):04x};",
+                    f"    /* step {rnd.randint(0, 999)} */"]))
+            _lines.extend(["    return value;", "}", ""])
+        return "\n".join(_lines) + "\n"
+
+    def _header(_index: int) -> str:
+        _guard = f"MOD_{_index}_H"
+        _lines = [f"#ifndef {_guard}", f"#define {_guard}", ""]
+        _lines += [f"#define MOD_{_index}_CONST_{_n} {rnd.randint(0, 65535)}" for _n in range(rnd.randint(3, 30))]
+        _lines += ["", f"int mod_{_index}_init(void);", "", f"#endif /* {_guard} */"]
+        return "\n".join(_lines) + "\n"
+
+    for index in range(files):
+        module_dir = root_paths[index % roots] / f"module_{(index // roots) % 64:02d}"
+        if index % 5 == 4:
+            path = module_dir / "include" / f"mod_{index}.h"
+            content = _header(index)
+        elif index % 50 == 0:
+            path = module_dir / f"cmake_{index}" / "CMakeLists.txt"
+            content = (f"cmake_minimum_required(VERSION 3.16)\nproject(module_{index} C)\n"
+                       f"add_library(module_{index} STATIC src/file_{index}.c)\n"
+                       f"target_include_directories(module_{index} PUBLIC include)\n")
+        else:
+            path = module_dir / "src" / f"file_{index}.c"
+            if sources and rnd.random() < dup_rate:
+                content = rnd.choice(sources)
+                if duplicates % 2:
+                    lines = content.split("\n")
+                    lines[rnd.randrange(len(lines))] = f"/* near-duplicate {index} */"
+                    content = "\n".join(lines)
+                duplicates += 1
+            else:
+                content = _c_source(index)
+                sources.append(content)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        total_bytes += len(content.encode("utf-8"))
+
+    return {"files": files, "roots": [str(path) for path in root_paths], "bytes": total_bytes,
+            "duplicates": duplicates, "dup_rate": dup_rate, "seed": seed}
+
+
+def modify_tree(roots: list[Path], percent: float, seed: int) -> int:
+    """ Append a line to 'percent' of the files, returns the number of modified files """
+    files = sorted(path for root in roots for path in root.rglob("*") if path.is_file())
+    rnd = random.Random(seed)
+    selected = rnd.sample(files, k=max(1, int(len(files) * percent / 100)))
+    for path in selected:
+        with path.open("a", encoding="utf-8") as file:
+            file.write(f"/* modified {rnd.randint(0, 1 << 30)} */\n")
+    return len(selected)
+
+
+def _reset_peak_rss() -> None:
+    """ Reset the process peak RSS (Linux 'VmHWM'), so each pass reports its own peak """
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass  # Not supported, the peak is then accumulated over passes
+
+
+def _peak_rss_mb() -> float:
+    """ Peak resident set size of this process in MB """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _db_size_mb(index_path: Path) -> float:
+    """ Size of all database files, including WAL and shared memory files """
+    return sum(path.stat().st_size for path in index_path.glob("*.db*")) / (1024 * 1024)
+
+
+def run_pass(name: str, configuration: dict[str, Any], roots: list[Path], index_path: Path,
+             tree_bytes: int) -> dict[str, Any]:
+    """ Run a single indexing pass on a fresh indexer and collect its metrics """
+    xray = create_indexer(configuration, roots, index_path)
+    _reset_peak_rss()
+
+    start = time.perf_counter()
+    xray._initialize_database()
+    xray._perform_indexing()
+    elapsed = time.perf_counter() - start
+
+    progress = xray.indexing_progress
+    result = {
+        "name": name,
+        "elapsed_sec": round(elapsed, 3),
+        "files": progress["handled"],
+        "changed": progress["changed"],
+        "unchanged": progress["unchanged"],
+        "errors": progress["errors"],
+        "files_per_sec": int(progress["handled"] / elapsed) if elapsed > 0 else 0,
+        "mb_per_sec": round(tree_bytes / elapsed / (1024 * 1024), 2) if elapsed > 0 else 0,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "children_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "db_size_mb": round(_db_size_mb(index_path), 2),
+        "writer": xray.writer_stats,
+    }
+    print(f"{name:<8} {result['elapsed_sec']:8.3f} sec  {result['files_per_sec']:>8,d} files/sec  "
+          f"{result['mb_per_sec']:8.2f} MB/sec  RSS {result['peak_rss_mb']:7.1f} MB  DB {result['db_size_mb']:7.2f} MB",
+          file=sys.stderr)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="XRay indexing benchmark")
+    parser.add_argument("--files", type=int, default=5000, help="Number of synthetic files (default: 5000)")
+    parser.add_argument("--roots", type=int, default=2, help="Number of managed paths (default: 2)")
+    parser.add_argument("--dup-rate", type=float, default=0.1, help="Fraction of duplicated sources (default: 0.1)")
+    parser.add_argument("--changed-pct", type=float, default=1.0,
+                        help="Percentage of files modified before the last pass (default: 1.0)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--storage-mode", choices=["plain", "dedup", "compressed"], help="Override 'db_storage_mode'")
+    parser.add_argument("--reader-backend", choices=["threads", "processes"], help="Override 'db_reader_backend'")
+    parser.add_argument("--shard", action="store_true", help="Enable 'db_shard_by_path'")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="Show the indexer debug log")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, stream=sys.stderr)
+
+    configuration = load_package_configuration()
+    if args.storage_mode:
+        configuration["db_storage_mode"] = args.storage_mode
+    if args.reader_backend:
+        configuration["db_reader_backend"] = args.reader_backend
+    configuration["db_shard_by_path"] = args.shard
+
+    report: dict[str, Any] = {
+        "benchmark": "xray_indexing",
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "configuration": {key: configuration.get(key) for key in (
+            "db_storage_mode", "db_reader_backend", "db_shard_by_path", "db_filter_files_content",
+            "db_index_symbols", "db_index_similarity", "db_index_fingerprints", "db_writer_commit_rows")},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="xray_index_bench_") as temp_path:
+        tree_path, index_path = Path(temp_path) / "tree", Path(temp_path) / "index"
+        index_path.mkdir(parents=True)
+
+        start = time.perf_counter()
+        report["tree"] = generate_tree(tree_path, files=args.files, roots=max(1, args.roots),
+                                       dup_rate=args.dup_rate, seed=args.seed)
+        report["tree"]["generation_sec"] = round(time.perf_counter() - start, 3)
+        roots = [Path(path) for path in report["tree"]["roots"]]
+        tree_bytes = report["tree"]["bytes"]
+
+        passes = [run_pass("cold", configuration, roots, index_path, tree_bytes),
+                  run_pass("warm", configuration, roots, index_path, tree_bytes)]
+        report["tree"]["modified"] = modify_tree(roots, percent=args.changed_pct, seed=args.seed)
+        passes.append(run_pass("changed", configuration, roots, index_path, tree_bytes))
+        report["passes"] = passes
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -108,7 +108,8 @@ class AICommand(CommandInterface):
         - Always group OR conditions in parentheses when combined with AND.
         
         Content Search Rules:
-        - You may use SQL LIKE or MATCH, but only for literal substring searches.
+        - You may use SQL LIKE or files.content MATCH, but only for literal substring searches.
+        - Never use the table name form 'files MATCH', and never use rank, bm25(), snippet() or highlight().
         - If a user says "uses X", and X is a known package or symbol, match it as code, e.g.:
             - "uses rich" → look for 'import rich' or 'from rich import'
             - "uses numpy" → 'import numpy'
@@ -154,7 +155,7 @@ class AICommand(CommandInterface):
         self._console.print(sql_syntax)
         print()
 
-        self.sdk.xray_db.query_raw(query=sql_query, print_table=True)
+        self.sdk.xray_db.print_query(query=sql_query)
 
     async def _async_get_source_summary(self, filename: str, max_description_lines: int = 10):
         """
@@ -20,13 +20,14 @@ from typing import Any, Optional
 from rich import box
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
 # AutoForge imports
 from auto_forge import (CommandInterface, CoreSolution, AutoForgCommandType)
 
 AUTO_FORGE_MODULE_NAME = "xray"
 AUTO_FORGE_MODULE_DESCRIPTION = "XRayDB Play Ground"
-AUTO_FORGE_MODULE_VERSION = "1.1"
+AUTO_FORGE_MODULE_VERSION = "1.3"
 
 
 # noinspection SqlNoDataSourceInspection
@@ -169,6 +170,29 @@ class XRayCommand(CommandInterface):
 
         return combined
 
+    def _print_page(self, rows: list[tuple], columns: list[tuple[str, dict[str, Any]]], title: Optional[str],
+                    first_page: bool, show_lines: bool = False) -> None:
+        """
+        Print a single page of streamed results as a Rich table, only the first page carries the title and header.
+        Args:
+            rows (list[tuple]): Already formatted cell values.
+            columns (list[tuple[str, dict]]): Column header and 'add_column()' keyword arguments.
+            title (Optional[str]): Table title.
+            first_page (bool): True for the first printed page.
+            show_lines (bool): Draw lines between rows.
+        """
+        table = Table(title=title if first_page else None, show_header=first_page, show_lines=show_lines,
+                      box=box.ROUNDED)
+        for header, options in columns:
+            table.add_column(header, **options)
+        for row in rows:
+            table.add_row(*row)
+
+        if first_page:
+            self._console.print('\n', table)
+        else:
+            self._console.print(table)
+
     @staticmethod
     def _strip_if_filename(path_str: Optional[str]) -> Optional[str]:
         """
@@ -193,7 +217,7 @@ class XRayCommand(CommandInterface):
 
     def _locate_files(self, file_name_pattern: str,
                       extensions: Optional[list[str]] = None, limit: int = 500,
-                      show_cmake_paths: bool = False) -> Optional[int]:
+                      show_cmake_paths: bool = False, page_size: int = 100) -> Optional[int]:
         """
         Locate files by name pattern with optional extension filter and result limit.
         Also attempts to show how each file could be included in CMake, based on
@@ -204,6 +228,7 @@ class XRayCommand(CommandInterface):
             extensions (Optional[list[str]]): List of extensions to filter by (e.g., ['c', 'h']).
             limit (int): Maximum number of results to return.
             show_cmake_paths (bool): Show CMake include paths analysis.
+            page_size (int): Results are streamed and printed in pages of this size.
 
         Returns:
             Optional[int]: 0 if files were found, 1 otherwise.
@@ -253,76 +278,104 @@ class XRayCommand(CommandInterface):
             query += " ORDER BY path LIMIT ?"
             params.append(str(limit or 500))
 
-            rows = self.sdk.xray_db.query_raw(query, tuple(params))
-            if not rows:
+            # The CMake column is shown whenever mappings are available, rows are printed as they arrive
+            show_cmake_column = bool(cmake_prefixes)
+            columns: list[tuple[str, dict[str, Any]]] = [
+                ("#", {"style": "dim", "justify": "right", "width": 4}),
+                ("Type", {"style": "cyan", "width": 4}),
+                ("Path", {"style": "white"})]
+            if show_cmake_column:
+                columns.append(("CMake Include", {"style": "magenta"}))
+
+            idx = 0
+            for rows in self.sdk.xray_db.iter_query(query, tuple(params), page_size=page_size):
+                table_rows = []
+                for path, ext in rows:
+                    idx += 1
+                    row = [str(idx), ext or "", f"[link=file://{path}]{path}[/link]"]
+                    if show_cmake_column:
+                        resolved_path = str(Path(path).resolve())
+                        cmake_hint = ""
+                        for var, base_path in cmake_prefixes:
+                            if resolved_path.startswith(base_path):
+                                relative = os.path.relpath(resolved_path, base_path)
+                                cmake_hint = f"${{{var}}}/{relative}"
+                                cmake_hint = self._strip_if_filename(path_str=cmake_hint)
+                                break
+                        row.append(_highlight_var_substitution(text=cmake_hint))
+                    table_rows.append(row)
+
+                self._print_page(table_rows, columns, title=f"Search results for '{file_name_pattern}'",
+                                 first_page=idx == len(rows))
+
+            if not idx:
                 print("No matching files found.")
                 return 1
-
-            # Determine if at least one file can be matched to a CMake path
-            table_rows = []
-            show_cmake_column = False
-
-            for idx, (path, ext) in enumerate(rows, 1):
-                resolved_path = str(Path(path).resolve())
-                cmake_hint = ""
-                for var, base_path in cmake_prefixes:
-                    if resolved_path.startswith(base_path):
-                        relative = os.path.relpath(resolved_path, base_path)
-                        cmake_hint = f"${{{var}}}/{relative}"
-                        cmake_hint = self._strip_if_filename(path_str=cmake_hint)
-                        show_cmake_column = True
-                        break
-                cmake_hint = _highlight_var_substitution(text=cmake_hint)
-                table_rows.append((idx, ext or "", path, cmake_hint))
-
-            # Build the display table
-            table = Table(title=f"Search results for '{file_name_pattern}'", box=box.ROUNDED)
-            table.add_column("#", style="dim", justify="right", width=4)
-            table.add_column("Type", style="cyan", width=4)
-            table.add_column("Path", style="white")
-            if show_cmake_column:
-                table.add_column("CMake Include", style="magenta")
-
-            for idx, ext, path, cmake_hint in table_rows:
-                row = [str(idx), ext, f"[link=file://{path}]{path}[/link]"]
-                if show_cmake_column:
-                    row.append(cmake_hint)
-                table.add_row(*row)
-
-            self._console.print('\n', table)
             return 0
 
         except Exception as xray_error:
             raise xray_error from xray_error
 
-    def _find_all_duplicates(self, limit: int = 500) -> Optional[int]:
+    def _find_all_duplicates(self, limit: int = 500, page_size: int = 100) -> Optional[int]:
         """
         Print sets of files that have identical purified content, grouped by checksum.
+        Results are streamed and printed in pages of 'page_size' sets.
         """
         try:
-            rows = self.sdk.xray_db.query_raw(f"""
-                SELECT checksum, GROUP_CONCAT(path, '|') 
+            printed = 0
+            columns: list[tuple[str, dict[str, Any]]] = [
+                ("#", {"style": "dim", "justify": "right", "width": 4}),
+                ("Checksum", {"style": "bold yellow", "width": 20}),
+                ("Files", {"style": "green"})]
+
+            for rows in self.sdk.xray_db.iter_query("""
+                SELECT checksum, GROUP_CONCAT(path, '|')
                 FROM file_meta
                 WHERE checksum IS NOT NULL
                   AND ext IN ('c', 'h')
                 GROUP BY checksum
                 HAVING COUNT(*) > 1
-                LIMIT {limit};
-            """)
-
-            if not rows:
+                LIMIT ?;
+            """, (limit,), page_size=page_size):
+                table_rows = []
+                for checksum, paths_concat in rows:
+                    printed += 1
+                    file_links = "\n".join(f"[link=file://{p}]{p}[/link]" for p in paths_concat.split('|'))
+                    table_rows.append((str(printed), checksum, file_links))
+                self._print_page(table_rows, columns, title=None, first_page=printed == len(rows), show_lines=True)
+
+            if not printed:
                 print("No duplicate files found.")
                 return 1
+            return 0
+
+        except Exception as xray_error:
+            raise xray_error from xray_error
+
+    def _find_similar_files(self, threshold: float = 0.8, extensions: Optional[list[str]] = None,
+                            limit: int = 500) -> Optional[int]:
+        """
+        Print clusters of near-identical files (for example forked vendor files differing by a license header),
+        based on the MinHash / LSH data collected during indexing.
+        Args:
+            threshold (float): Minimum estimated similarity, 0..1.
+            extensions (Optional[list[str]]): File extensions to consider.
+            limit (int): Maximum number of clusters to print.
+        """
+        try:
+            clusters = self.sdk.xray_db.find_similar_files(threshold=threshold, extensions=extensions, limit=limit)
+            if not clusters:
+                print(f"No similar files above {threshold:.0%} were found.")
+                return 1
 
-            table = Table(show_lines=True, box=box.ROUNDED)
+            table = Table(title=f"Near-duplicate files (>= {threshold:.0%})", show_lines=True, box=box.ROUNDED)
             table.add_column("#", style="dim", justify="right", width=4)
-            table.add_column("Checksum", style="bold yellow", width=20)
+            table.add_column("Similarity", style="bold yellow", justify="right", width=10)
             table.add_column("Files", style="green")
 
-            for idx, (checksum, paths_concat) in enumerate(rows, 1):
-                paths = paths_concat.split('|')
+            for idx, (similarity, paths) in enumerate(clusters, 1):
                 file_links = "\n".join(f"[link=file://{p}]{p}[/link]" for p in paths)
-                table.add_row(str(idx), checksum, file_links)
+                table.add_row(str(idx), f"{similarity:.0%}", file_links)
 
             self._console.print('\n', table)
             return 0
@@ -330,53 +383,135 @@ class XRayCommand(CommandInterface):
         except Exception as xray_error:
             raise xray_error from xray_error
 
-    def _find_all_mains(self, limit: int = 500) -> Optional[int]:
+    def _find_duplicate_blocks(self, min_lines: int = 10, extensions: Optional[list[str]] = None,
+                               limit: int = 500) -> Optional[int]:
         """
-        Print all files that implement a likely C-style `main()` function, with line numbers.
-        This function queries the XRay content index for files containing the word 'main',
-        then applies a regular expression to filter only those files that include a valid
-        C/C++-style main function signature (e.g., `int main()`, `void main(int argc, char** argv)`).
+        Print copy-pasted code regions shared between (or within) files, largest first,
+        based on the winnowing fingerprints collected during indexing.
+        Args:
+            min_lines (int): Minimum region length in source lines.
+            extensions (Optional[list[str]]): File extensions to consider.
+            limit (int): Maximum number of regions to print.
+        """
+        try:
+            regions = self.sdk.xray_db.find_duplicate_blocks(min_lines=min_lines, extensions=extensions, limit=limit)
+            if not regions:
+                print(f"No duplicated blocks of {min_lines} lines or more were found.")
+                return 1
 
-        For each matching file, the full path and the line number of the match are printed.
+            table = Table(title="Duplicated code blocks", show_lines=True, box=box.ROUNDED)
+            table.add_column("#", style="dim", justify="right", width=4)
+            table.add_column("Lines", style="bold yellow", justify="right", width=5)
+            table.add_column("Location", style="green", overflow="fold")
+            table.add_column("Duplicate", style="green", overflow="fold")
+
+            for idx, (lines, path_a, start_a, end_a, path_b, start_b, end_b) in enumerate(regions, 1):
+                table.add_row(str(idx), str(lines),
+                              f"[link=file://{path_a}]{path_a}:{start_a}-{end_a}[/link]",
+                              f"[link=file://{path_b}]{path_b}:{start_b}-{end_b}[/link]")
+
+            self._console.print('\n', table)
+            return 0
 
+        except Exception as xray_error:
+            raise xray_error from xray_error
+
+    def _grep(self, pattern: str, extensions: Optional[list[str]] = None, ignore_case: bool = False,
+              context: int = 0, limit: int = 500) -> Optional[int]:
+        """
+        Regular expression search over the indexed files, printed grep style as 'path:line:column: text'
+        while results arrive. Context lines are printed as 'path-line- text' and groups are separated by '--'.
         Args:
-            limit (int): Maximum number of candidate files to scan. Default is 500.
+            pattern (str): Python regular expression, matched line by line.
+            extensions (Optional[list[str]]): File extensions to search.
+            ignore_case (bool): Case-insensitive matching.
+            context (int): Number of context lines around each match.
+            limit (int): Maximum number of matching lines.
         """
         try:
-            rows = self.sdk.xray_db.query_raw(f"""
-                SELECT files.path, files.content
-                FROM files
-                JOIN file_meta ON files.path = file_meta.path
-                WHERE file_meta.ext IN ('c')
-                  AND files.content MATCH 'main'
-                LIMIT {limit}
-            """)
-
-            main_regex = re.compile(
-                r'\b(?:int|void)\s+main\s*\(\s*(?:void|int\s+\w+\s*,\s*char\s*\*+\s*\w+.*)?\s*\)',
-                re.IGNORECASE,
-            )
+            printed = 0
+            for path, line_no, column, end_column, text, before, after in self.sdk.xray_db.grep(
+                    pattern=pattern, extensions=extensions, ignore_case=ignore_case, context=context, limit=limit):
 
-            matches = []
-            for path, content in rows:
-                for lineno, line in enumerate(content.splitlines(), start=1):
-                    if main_regex.search(line):
-                        matches.append((path, lineno, line.strip()))
-                        break  # Only first match per file
+                if context and printed:
+                    self._console.print("--", style="dim")
+                location = Text(path, style=f"magenta link file://{path}")
 
-            if not matches:
-                print("No results containing 'main' ware found.")
+                for offset, context_line in enumerate(before, start=line_no - len(before)):
+                    self._console.print(location + Text(f"-{offset}- ", style="dim") + Text(context_line, style="dim"))
+
+                line_text = Text(text)
+                line_text.stylize("bold red", column - 1, end_column - 1)
+                self._console.print(location + Text(f":{line_no}:{column}: ", style="cyan") + line_text)
+
+                for offset, context_line in enumerate(after, start=line_no + 1):
+                    self._console.print(location + Text(f"-{offset}- ", style="dim") + Text(context_line, style="dim"))
+                printed += 1
+
+            if not printed:
+                print(f"No matches for '{pattern}' were found.")
                 return 1
+            return 0
 
-            # Render with Rich
-            table = Table(title="Detected C-style main() Implementations", box=box.ROUNDED)
-            table.add_column("Path", style="white", overflow="fold")
-            table.add_column("Line", justify="right", style="cyan")
-            table.add_column("Snippet", style="bright_yellow", overflow="fold")
+        except Exception as xray_error:
+            raise xray_error from xray_error
 
-            for path, lineno, line in matches:
-                file_link = f"[link=file://{path}]{path}[/link]"
-                table.add_row(file_link, str(lineno), line)
+    def _find_symbol(self, name: str, kind: Optional[str] = None, limit: int = 500) -> Optional[int]:
+        """
+        Print where C symbols are defined, using the indexed 'symbols' table.
+        Args:
+            name (str): Symbol name, shell style wildcards ('*', '?') are accepted.
+            kind (Optional[str]): Optional symbol kind filter, for example 'function' or 'macro'.
+            limit (int): Maximum number of results to return.
+        """
+        try:
+            rows = self.sdk.xray_db.find_symbol(name=name, kind=kind, limit=limit)
+            if not rows:
+                print(f"No definitions of '{name}' were found.")
+                return 1
+
+            table = Table(title=f"Definitions of '{name}'", box=box.ROUNDED)
+            table.add_column("Symbol", style="bold yellow")
+            table.add_column("Kind", style="cyan")
+            table.add_column("Location", style="white", overflow="fold")
+            table.add_column("Signature", style="bright_yellow", overflow="fold")
+
+            for symbol_name, symbol_kind, path, line, signature in rows:
+                table.add_row(symbol_name, symbol_kind, f"[link=file://{path}]{path}:{line}[/link]", signature or "")
+
+            self._console.print('\n', table)
+            return 0
+
+        except Exception as xray_error:
+            raise xray_error from xray_error
+
+    def _show_include_graph(self, file: str, reverse: bool, depth: int = 0,
+                            translation_units_only: bool = False) -> Optional[int]:
+        """
+        Print the transitive includers (reverse=True) or includees of a file using the indexed include graph.
+        Args:
+            file (str): Absolute path, file name or trailing path fragment.
+            reverse (bool): True to list the files including 'file', False to list the files it includes.
+            depth (int): Maximum include chain length, 0 for unlimited.
+            translation_units_only (bool): Only list '.c' files (includers only).
+        """
+        try:
+            xray_db = self.sdk.xray_db
+            depth_args = {"max_depth": depth} if depth > 0 else {}
+            if reverse:
+                rows = xray_db.find_includers(file, translation_units_only=translation_units_only, **depth_args)
+            else:
+                rows = xray_db.find_includees(file, **depth_args)
+
+            if not rows:
+                print(f"No {'includers' if reverse else 'includees'} of '{file}' were found.")
+                return 1
+
+            table = Table(title=f"Files {'including' if reverse else 'included by'} '{file}'", box=box.ROUNDED)
+            table.add_column("Depth", style="cyan", justify="right", width=5)
+            table.add_column("Path", style="white", overflow="fold")
+            for path, path_depth in rows:
+                table.add_row(str(path_depth), f"[link=file://{path}]{path}[/link]")
 
             self._console.print('\n', table)
             return 0
@@ -384,6 +519,75 @@ class XRayCommand(CommandInterface):
         except Exception as xray_error:
             raise xray_error from xray_error
 
+    def _find_all_mains(self, limit: int = 500, page_size: int = 100) -> Optional[int]:
+        """
+        Print all files that implement a C-style `main()` function, with line numbers.
+        Definitions are looked up in the indexed 'symbols' table. When it is empty (symbols indexing disabled),
+        the indexed '.c' files are searched with a regular expression matching a valid C/C++-style main function
+        signature (e.g., `int main()`, `void main(int argc, char** argv)`).
+
+        For each matching file, the full path and the line number of the match are printed.
+
+        Args:
+            limit (int): Maximum number of candidate files to scan. Default is 500.
+            page_size (int): Candidate files fetched at once, matches are printed after each page.
+        """
+        try:
+            columns: list[tuple[str, dict[str, Any]]] = [
+                ("Path", {"style": "white", "overflow": "fold"}),
+                ("Line", {"justify": "right", "style": "cyan"}),
+                ("Snippet", {"style": "bright_yellow", "overflow": "fold"})]
+            title = "Detected C-style main() Implementations"
+
+            printed = 0
+            for rows in self.sdk.xray_db.iter_query("""
+                SELECT symbols.path, symbols.line, symbols.signature
+                FROM symbols
+                JOIN file_meta ON symbols.path = file_meta.path
+                WHERE symbols.name = 'main'
+                  AND symbols.kind = 'function'
+                  AND file_meta.ext IN ('c')
+                ORDER BY symbols.path
+                LIMIT ?
+            """, (limit,), page_size=page_size):
+                matches = [(f"[link=file://{path}]{path}[/link]", str(line), signature or "")
+                           for path, line, signature in rows]
+                self._print_page(matches, columns, title=title, first_page=not printed)
+                printed += len(matches)
+
+            if printed:
+                return 0
+
+            # Fallback: the symbols table is not populated, search the indexed files (prefiltered on 'main')
+            main_pattern = r'\b(?:int|void)\s+main\s*\(\s*(?:void|int\s+\w+\s*,\s*char\s*\*+\s*\w+.*)?\s*\)'
+            matches = []
+            reported_paths = set()
+            for path, lineno, _column, _end_column, line, _before, _after in self.sdk.xray_db.grep(
+                    pattern=main_pattern, extensions=["c"], ignore_case=True):
+                if path in reported_paths:
+                    continue  # Only first match per file
+                reported_paths.add(path)
+                matches.append((f"[link=file://{path}]{path}[/link]", str(lineno), line.strip()))
+
+                if len(matches) >= page_size:
+                    self._print_page(matches, columns, title=title, first_page=not printed)
+                    printed += len(matches)
+                    matches = []
+                if len(reported_paths) >= limit:
+                    break
+
+            if matches:
+                self._print_page(matches, columns, title=title, first_page=not printed)
+                printed += len(matches)
+
+            if not printed:
+                print("No results containing 'main' ware found.")
+                return 1
+            return 0
+
+        except Exception as xray_error:
+            raise xray_error from xray_error
+
     def create_parser(self, parser: argparse.ArgumentParser) -> None:
         """
         Adds command-line arguments.
@@ -398,14 +602,47 @@ class XRayCommand(CommandInterface):
             "-m", "--find-mains", action='store_true', help="Find files with main() implementations")
         parser.add_argument(
             "-d", "--find-duplicates", action='store_true', help="Find duplicated files")
+        parser.add_argument(
+            "-n", "--find-similar", action='store_true', help="Find near-duplicate files (see --threshold)")
+        parser.add_argument(
+            "--threshold", type=float, default=0.8,
+            help="Minimum similarity (0..1) for --find-similar (default: 0.8)")
+        parser.add_argument(
+            "-b", "--find-blocks", action='store_true', help="Find copy-pasted code blocks (see --min-lines)")
+        parser.add_argument(
+            "--min-lines", type=int, default=10, help="Minimum block length for --find-blocks (default: 10)")
+        parser.add_argument(
+            "-g", "--grep", type=str, metavar="REGEX", help="Regular expression search over the indexed files")
+        parser.add_argument(
+            "--ignore-case", action="store_true", help="Case-insensitive --grep")
+        parser.add_argument(
+            "--context", type=int, default=0, help="Context lines printed around --grep matches")
         parser.add_argument(
             "-l", "--locate-files", type=str, help="Locate files (optionally limit number of results")
+        parser.add_argument(
+            "-s", "--find-symbol", type=str, help="Find where a C symbol is defined (wildcards are accepted)")
+        parser.add_argument(
+            "--includers", type=str, metavar="FILE", help="List files which (transitively) include FILE")
+        parser.add_argument(
+            "--includees", type=str, metavar="FILE", help="List indexed files (transitively) included by FILE")
+        parser.add_argument(
+            "--depth", type=int, default=0, help="Maximum include chain length for --includers/--includees")
+        parser.add_argument(
+            "--tu-only", action="store_true", help="Only list translation units ('.c' files) with --includers")
+        parser.add_argument(
+            "--kind", type=str, choices=["function", "struct", "union", "enum", "typedef", "macro", "variable"],
+            help="Restrict --find-symbol to a symbol kind")
 
-        parser.add_argument("-r", "--refresh-indexes", action="store_true", help="Perform DB indexes refresh")
+        parser.add_argument("-r", "--refresh-indexes", nargs="?", const="", default=None, metavar="PATH",
+                            help="Perform DB indexes refresh, optionally of a single managed path")
 
         parser.add_argument(
             "--limit", type=int, default=500, help="Maximum number of results to return (default: 500)")
 
+        parser.add_argument(
+            "--page-size", type=int, default=100,
+            help="Results are streamed and printed in pages of this size (default: 100)")
+
         parser.add_argument(
             "--ext",
             type=_split_extensions, default=["c", "h"], help="Comma-separated extensions (e.g. --ext c,h). Default: c,h"
@@ -425,19 +662,40 @@ class XRayCommand(CommandInterface):
 
         limit: int = args.limit if args.limit else 500
         extensions: list = args.ext if args.ext else ["c", "h"]
+        page_size: int = args.page_size if args.page_size and args.page_size > 0 else 100
 
-        if args.refresh_indexes:
-            return self.sdk.xray_db.refresh()
+        if args.refresh_indexes is not None:
+            return self.sdk.xray_db.refresh(root=args.refresh_indexes or None)
 
         elif args.find_mains:
-            return_code = self._find_all_mains(limit=limit)
+            return_code = self._find_all_mains(limit=limit, page_size=page_size)
+
+        elif args.find_similar:
+            return_code = self._find_similar_files(threshold=args.threshold, extensions=extensions, limit=limit)
+
+        elif args.grep:
+            return_code = self._grep(pattern=args.grep, extensions=extensions, ignore_case=args.ignore_case,
+                                     context=max(0, args.context), limit=limit)
+
+        elif args.find_blocks:
+            return_code = self._find_duplicate_blocks(min_lines=args.min_lines, extensions=extensions, limit=limit)
+
+        elif args.find_symbol:
+            return_code = self._find_symbol(name=args.find_symbol, kind=args.kind, limit=limit)
+
+        elif args.includers:
+            return_code = self._show_include_graph(file=args.includers, reverse=True, depth=args.depth,
+                                                   translation_units_only=args.tu_only)
+
+        elif args.includees:
+            return_code = self._show_include_graph(file=args.includees, reverse=False, depth=args.depth)
 
         elif args.find_duplicates:
-            return_code = self._find_all_duplicates(limit=limit)
+            return_code = self._find_all_duplicates(limit=limit, page_size=page_size)
 
         elif args.locate_files:
             return_code = self._locate_files(file_name_pattern=args.locate_files, limit=limit, extensions=extensions,
-                                             show_cmake_paths=args.cmake_include)
+                                             show_cmake_paths=args.cmake_include, page_size=page_size)
         else:
             # Error: no arguments
             return_code = CommandInterface.COMMAND_ERROR_NO_ARGUMENTS
@@ -5,16 +5,22 @@ Author:         AutoForge Team
 Description:
     Core module for preprocessing JSON files that may contain comments. It strips comments,
     validates the content, and returns a standard JSON-compatible dictionary to the caller.
+    Schema validators are compiled once per distinct schema content, and instances which already passed
+    validation against the same schema are not validated again.
 """
 
+import hashlib
 import json
 import os
 import re
 import shutil
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Optional, Union
 
 # Third-party
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 from rich.console import Console
 from rich.text import Text
 
@@ -191,6 +197,9 @@ class CoreJSONCProcessor(CoreModuleInterface):
             raise RuntimeError("failed to instantiate critical dependencies")
 
         self._normalize_multilines: bool = normalize_multilines
+        self._validators: dict[str, Any] = {}  # Compiled schema validators by schema content hash
+        self._validated: set[str] = set()  # Instance and schema digests which passed validation in this session
+        self._known_validated: set[str] = set()  # Digests which passed validation in earlier sessions
 
         # Register this module with the package registry
         self._registry.register_module(name=AUTO_FORGE_MODULE_NAME, description=AUTO_FORGE_MODULE_DESCRIPTION,
@@ -327,17 +336,17 @@ class CoreJSONCProcessor(CoreModuleInterface):
 
         return _text
 
-    def render(self, file_name: Union[str, Path]) -> Optional[dict[str, Any]]:
+    @staticmethod
+    def resolve_file_name(file_name: Union[str, Path]) -> str:
         """
-        Preprocess a JSON or JSONC file to remove embedded comments.
+        Returns the path of the file 'render()' reads for a given file name.
         If the specified file does not exist but a file with the alternate extension
         exists (.json ↔ .jsonc), the alternate will be used.
         Args:
             file_name (str | Path): Path to the JSON or JSONC file.
         Returns:
-            dict or None: Parsed JSON object, or None if an error occurs.
+            str: The expanded and normalized path.
         """
-        dirty_json: Optional[str] = None
         path_obj = Path(file_name)
         base = path_obj.with_suffix('')  # Remove .json or .jsonc if present
 
@@ -349,15 +358,26 @@ class CoreJSONCProcessor(CoreModuleInterface):
         else:
             raise FileNotFoundError("Neither .json nor .jsonc file could be found.")
 
-        # Optional: normalize early to str for downstream APIs
-        file_name: str = str(resolved_path)
+        # Expand and normalize
+        json_file = os.path.expanduser(os.path.expandvars(str(resolved_path)))
+        if not json_file.endswith(os.sep + '.'):
+            json_file = os.path.abspath(json_file)
+        return json_file
 
-        try:
-            # Expand and normalize
-            json_file = os.path.expanduser(os.path.expandvars(file_name))
-            if not json_file.endswith(os.sep + '.'):
-                json_file = os.path.abspath(json_file)
+    def render(self, file_name: Union[str, Path]) -> Optional[dict[str, Any]]:
+        """
+        Preprocess a JSON or JSONC file to remove embedded comments.
+        If the specified file does not exist but a file with the alternate extension
+        exists (.json ↔ .jsonc), the alternate will be used.
+        Args:
+            file_name (str | Path): Path to the JSON or JSONC file.
+        Returns:
+            dict or None: Parsed JSON object, or None if an error occurs.
+        """
+        dirty_json: Optional[str] = None
+        json_file = self.resolve_file_name(file_name)
 
+        try:
             if not os.path.exists(json_file):
                 raise FileNotFoundError(f"JSON/C file '{json_file}' does not exist.")
 
@@ -383,9 +403,104 @@ class CoreJSONCProcessor(CoreModuleInterface):
             if dirty_json is not None:
                 error_line = self._get_line_number_from_error(str(json_parsing_error))
                 if error_line is not None:
-                    self._show_debug_message(file_name, dirty_json, error_line, json_parsing_error)
+                    self._show_debug_message(json_file, dirty_json, error_line, json_parsing_error)
             raise
 
+    def get_validator(self, schema_file_name: str) -> tuple[Any, str]:
+        """
+        Returns a validator for a JSON/C schema file, the schema is checked and compiled only once
+        for any given schema content.
+        Args:
+            schema_file_name (str): Path to the schema file.
+        Returns:
+            tuple: The validator and the hash of the schema content.
+        """
+        with open(schema_file_name, "rb") as schema_file:
+            schema_hash = hashlib.blake2b(schema_file.read(), digest_size=16).hexdigest()
+
+        validator = self._validators.get(schema_hash)
+        if validator is None:
+            schema = self.render(file_name=schema_file_name)
+            validator_class = validator_for(schema)
+            validator_class.check_schema(schema)
+            validator = validator_class(schema)
+            self._validators[schema_hash] = validator
+
+        return validator, schema_hash
+
+    def validate(self, instance: Any, schema_file_name: str, source_file_name: Optional[str] = None) -> None:
+        """
+        Validates an instance against a JSON/C schema file. Validation is skipped when the very same content
+        already passed validation against the same schema, in this session or in a restored earlier one.
+        Args:
+            instance (Any): The JSON-compatible data to validate.
+            schema_file_name (str): Path to the schema file.
+            source_file_name (Optional[str]): The file the instance was loaded from, used to point errors
+                at the offending line.
+        Raises:
+            ValidationError: The most relevant validation error, its message suffixed with the file and line.
+        """
+        validator, schema_hash = self.get_validator(schema_file_name=schema_file_name)
+        instance_digest = hashlib.blake2b(json.dumps(instance, sort_keys=True, separators=(",", ":")).encode(),
+                                          digest_size=16, key=bytes.fromhex(schema_hash)).hexdigest()
+
+        if instance_digest in self._validated or instance_digest in self._known_validated:
+            self._validated.add(instance_digest)
+            return
+
+        error = best_match(validator.iter_errors(instance))
+        if error is not None:
+            if source_file_name is not None:
+                line_number = None
+                with open(source_file_name, encoding="utf-8", errors="replace") as source_file:
+                    line_number = self._get_line_number_from_path(source_file.read(), error.absolute_path)
+                error.message = (f"{error.message} ('{os.path.basename(source_file_name)}'"
+                                 f"{f' line {line_number}' if line_number else ''})")
+            raise error
+
+        self._validated.add(instance_digest)
+
+    @property
+    def validated_digests(self) -> list[str]:
+        """ Digests of everything which passed validation in this session, see 'restore_validated()'. """
+        return sorted(self._validated)
+
+    def restore_validated(self, digests: Iterable[str]) -> None:
+        """
+        Restores digests of content which passed validation in an earlier session, as previously
+        returned by 'validated_digests'. Digests cover both the instance and the schema content.
+        """
+        self._known_validated.update(digest for digest in digests if isinstance(digest, str))
+
+    @staticmethod
+    def _get_line_number_from_path(text: str, path: Iterable[Union[str, int]]) -> Optional[int]:
+        """
+        Best effort mapping of a path into a JSON/C document back to a line in its source text,
+        by locating each key of the path in turn. A list index is approximated by skipping that many
+        occurrences of the key which follows it, which holds for lists of similarly shaped objects.
+        Args:
+            text (str): The JSON/C source text, comments included.
+            path (Iterable[Union[str, int]]): Path to the offending element.
+        Returns:
+            Optional[int]: 1-based line number, or None if the first key could not be found.
+        """
+        position: Optional[int] = None
+        skip_count: int = 0
+        for element in path:
+            if isinstance(element, int):
+                skip_count = element
+                continue
+            key_pattern = re.compile(rf'"{re.escape(element)}"\s*:')
+            match = key_pattern.search(text, position or 0)
+            while match is not None and skip_count > 0:
+                match = key_pattern.search(text, match.end())
+                skip_count -= 1
+            if match is None:
+                break
+            position = match.start()
+            skip_count = 0
+
+        return text.count("\n", 0, position) + 1 if position is not None else None
 
     @staticmethod
     def pretty_print(obj:Any, indent: int = 4, sort_keys: bool = False, console: Optional[Console] = None,
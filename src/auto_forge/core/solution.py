@@ -16,12 +16,17 @@ Description:
       prevent runtime failures due to configuration errors.
     - Context-Aware Parsing: Capable of understanding and processing nested and hierarchical structures within
       the configuration files to support complex project requirements.
+    - Compiled Solution Cache: The fully resolved tree is persisted alongside the hashes of every file, schema and
+      variable it was built from, allowing later startups to skip the preprocessing and validation passes.
+    - Lazy Configurations: Optionally, configurations are only expanded once first queried, while the rest
+      of the solution, including all names, is resolved at startup.
 """
 import copy
+import hashlib
 import json
 import os
 import re
-from collections import deque
+import tempfile
 from collections.abc import Iterator
 from contextlib import suppress
 from enum import Enum
@@ -32,7 +37,6 @@ from typing import Any, Optional, Union
 import jmespath
 from jsonpath_ng.ext import parse
 from jsonschema.exceptions import ValidationError
-from jsonschema.validators import validate
 
 # AutoForge imports
 from auto_forge import (
@@ -41,6 +45,7 @@ from auto_forge import (
 
 AUTO_FORGE_MODULE_NAME = "Solution"
 AUTO_FORGE_MODULE_DESCRIPTION = "Solution Preprocessor Service"
+SOLUTION_CACHE_FORMAT = 1  # Bump whenever the layout of the compiled solution cache file changes
 
 
 class CoreSolution(CoreModuleInterface):
@@ -73,17 +78,33 @@ class CoreSolution(CoreModuleInterface):
         self._config_file_name: Optional[str] = None  # Loaded solution file name
         self._config_file_path: Optional[str] = None  # Loaded solution file path
         self._schema_files: Optional[dict[str, str]] = None  # Optional schema files path
-        self._max_iterations: int = 20  # Maximum allowed iterations for resolving references
-        self._pre_processed_iterations: int = 0  # Count of passes we did until all references ware resolved
+        self._max_iterations: int = 20  # Maximum allowed nesting when re-resolving untracked references
+        self._reference_sites: dict[tuple[int, Any], _ReferenceSite] = {}  # Reference sites by (container id, key)
+        self._reference_subtrees: dict[int, int] = {}  # Resolution state of containers referenced as a whole
+        self._reference_stack: list[_ReferenceSite] = []  # Sites being resolved, used for reporting cycles
+        self._reference_names: dict[int, dict[str, Any]] = {}  # Named list items by list id, while resolving
         self._scope = _ScopeState()  # Initialize scope state to track processing state and context
         self._solution_name: Optional[str] = None  # The solution name we're using
         self._solution_data: Optional[dict[str, Any]] = None  # To store processed solution data
-        self._solution_schema: Optional[dict[str, Any]] = None  # To store solution schema data
+        self._solution_schema_file: Optional[str] = None  # Solution schema file, validated through the processor
         self._root_context: Optional[dict[str, Any]] = None  # To store original, unaltered solution data
         self._caught_exception: bool = False  # Flag to manage exceptions during recursive processing
         self._signatures: Optional[CoreSignatures] = None  # Product binary signatures core class
         self._solution_loaded: bool = False  # Indicates if we have a validated solution to work with
         self._workspace_path: str = workspace_path  # Creation arguments
+        self._cache_file_name: Optional[str] = None  # Compiled solution cache file, None when caching is disabled
+        self._cache_includes: dict[str, Optional[str]] = {}  # Include directives and the files they were resolved to
+        self._cache_variables: dict[str, Optional[str]] = {}  # Variable tokens and the values they expanded to
+        self._solution_cached: bool = False  # Indicates the solution tree was restored from the cache file
+        self._projects: list[dict[str, Any]] = []  # Enabled projects, in solution order
+        self._projects_index: dict[str, dict[str, Any]] = {}  # Enabled projects by name
+        self._configurations_index: dict[str, tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]] = {}
+        self._items_index: Optional[dict[str, Any]] = None  # First value of every key in the solution, built on demand
+        self._lazy_configurations: bool = False  # Defer the expansion of configurations until first queried
+        self._lazy_sources: dict[str, list[dict[str, Any]]] = {}  # Configurations as written, by project name
+        self._lazy_pending: set[tuple[str, str]] = set()  # (project, configuration) names not expanded yet
+        self._lazy_deriving: set[tuple[str, str]] = set()  # Lazy derivation sources being expanded, for cycles
+        self._lazy_attached: list[dict[str, Any]] = []  # Lazy configurations attached to the running references pass
 
         # Load the solution
         self._preprocess(solution_file_name=solution_config_file_name, solution_name=solution_name)
@@ -132,26 +153,16 @@ class CoreSolution(CoreModuleInterface):
 
             return None
 
-        def _recursive_lookup(_obj: Any) -> Optional[Union[list[Any], dict[str, Any], str]]:
-            """ Solution wide recursive search."""
-            if isinstance(_obj, dict):
-                for k, v in _obj.items():
-                    if k == key and isinstance(v, (list, dict, str, bool, int)):
-                        return v
-                    _result = _recursive_lookup(v)
-                    if _result is not None:
-                        return _result
-            elif isinstance(_obj, list):
-                for item in _obj:
-                    _result = _recursive_lookup(item)
-                    if _result is not None:
-                        return _result
-            return None
-
         if not deep_search:
+            # Pending configurations are only held under the projects list
+            if key == "projects":
+                self._resolve_all_pending_configurations()
             returned_results = self._solution_data.get(key)
         else:
-            returned_results = _recursive_lookup(self._solution_data)
+            if self._items_index is None:
+                self._resolve_all_pending_configurations()
+                self._items_index = self._build_items_index(self._solution_data)
+            returned_results = self._items_index.get(key)
 
         if not isinstance(returned_results, (list, dict, str, bool, int)):
             return None
@@ -177,25 +188,11 @@ class CoreSolution(CoreModuleInterface):
         if not self._solution_loaded:
             return None
 
-        # Get all projects
-        data = self._query_json_path("$.projects[*]")
-
-        if not isinstance(data, list):
-            return None
-
-        # Filter out disabled projects
-        filtered = [p for p in data if not p.get("disabled", False)]
-
-        # If looking for a specific project, filter again by name
+        # Project names are unique, see '_traverse_and_process_syntax()'
         if project_name:
-            named = [p for p in filtered if p.get("name") == project_name]
-            if len(named) == 1:
-                return named[0]
-            elif not named:
-                return None
-            return named  # Just in case there are multiple with the same name
+            return self._projects_index.get(project_name)
         else:
-            return filtered if filtered else None
+            return list(self._projects) if self._projects else None
 
     def get_projects_names(self) -> Optional[list[str]]:
         """
@@ -229,32 +226,22 @@ class CoreSolution(CoreModuleInterface):
         if not self._solution_loaded:
             return None
 
-        # Retrieve all project objects
-        projects = self._query_json_path("$.projects[*]")
-        if not isinstance(projects, list):
-            return None
-
-        # Find the matching project
-        project = next((p for p in projects if p.get("name") == project_name and not p.get("disabled", False)), None)
-        if not project:
-            return None
-
-        configurations: Optional[list] = project.get("configurations", [])
-        if not isinstance(configurations, list):
+        configurations = self._configurations_index.get(project_name)
+        if configurations is None:
             return None
 
-        # Filter out disabled configurations
-        active_configs = [cfg for cfg in configurations if not cfg.get("disabled", False)]
-
+        # Configuration names are unique within a project, see '_traverse_and_process_syntax()'
+        active_configs, configurations_by_name = configurations
+        project = self._projects_index[project_name]
         if configuration_name:
-            matching = [cfg for cfg in active_configs if cfg.get("name") == configuration_name]
-            if len(matching) == 1:
-                return matching[0]
-            elif len(matching) == 0:
-                return None
-            return matching  # If multiple match (not expected, but handled)
+            configuration = configurations_by_name.get(configuration_name)
+            if configuration is not None:
+                self._resolve_pending_configuration(project=project, configuration=configuration)
+            return configuration
         else:
-            return active_configs if active_configs else None
+            for configuration in active_configs:
+                self._resolve_pending_configuration(project=project, configuration=configuration)
+            return list(active_configs) if active_configs else None
 
     def get_configurations_names(self, project_name: str) -> Optional[list[str]]:
         """
@@ -264,15 +251,14 @@ class CoreSolution(CoreModuleInterface):
         Returns:
             List[str]: List of configuration names, or None if not found.
         """
-        configurations: Optional[Union[dict, list]] = self.query_configurations(project_name=project_name)
-        if configurations is None:
+        if not self._solution_loaded:
             return None
 
-        if isinstance(configurations, dict):
-            return [configurations.get("name")]
-
-        if isinstance(configurations, list):
-            return [conf.get("name") for conf in configurations if isinstance(conf, dict)]
+        # Names are available without expanding lazily resolved configurations
+        configurations = self._configurations_index.get(project_name)
+        if configurations is None or not configurations[0]:
+            return None
+        return [conf.get("name") for conf in configurations[0]]
 
     def iter_menu_commands_with_context(self) -> Optional[Iterator[tuple[str, str, dict]]]:
         """
@@ -293,6 +279,9 @@ class CoreSolution(CoreModuleInterface):
                 for config in project.get("configurations", []):
                     if config.get("disabled", False):
                         continue
+                    # Expand lazily resolved configurations which have, or may derive, a menu command
+                    if "menu_command" in config or "data" in config:
+                        self._resolve_pending_configuration(project=project, configuration=config)
                     cfg_name = config.get("name", "<unknown-config>")
                     menu_cmd = config.get("menu_command")
                     if isinstance(menu_cmd, dict):
@@ -316,6 +305,7 @@ class CoreSolution(CoreModuleInterface):
         if name_only:
             return self._solution_name
 
+        self._resolve_all_pending_configurations()
         return copy.deepcopy(self._solution_data)
 
     def get_sequence_by_name(self, sequence_name: str) -> Optional[dict[str, Any]]:
@@ -362,7 +352,7 @@ class CoreSolution(CoreModuleInterface):
 
         solutions = self._root_context.get("solutions", [])
         solution_data: Optional[dict] = None
-        variables_schema: Optional[dict] = None
+        variables_schema_file: Optional[str] = None
 
         if isinstance(solutions, list) and solutions:
             solution_data = next(
@@ -390,9 +380,9 @@ class CoreSolution(CoreModuleInterface):
         else:
             # Initialize the variables core module based on the configuration file we got
             if self._schema_files is not None and self._schema_files.get("variables"):
-                variables_schema = self._processor.render(file_name=self._schema_files.get("variables"))
+                variables_schema_file = self._schema_files.get("variables")
             self._variables.load_from_file(config_file_name=variables_config_file_name,
-                                           variables_schema=variables_schema)
+                                           variables_schema_file=variables_schema_file)
 
         if self._schema_files is not None and self._schema_files.get("signatures"):
             # Instantiate the optional signatures core module based on the configuration file we got
@@ -400,20 +390,208 @@ class CoreSolution(CoreModuleInterface):
         else:
             self._logger.warning("Signatures schema file not found, signature support is disabled")
 
-        # Preprocess the solution schema file if we have it
+        self._solution_data = solution_data
+        self._solution_name = solution_name
+
+        self._lazy_configurations = bool(self.auto_forge.configuration.get("solution_lazy_configurations", False))
+
+        # Reuse the compiled tree when none of the inputs it was built from has changed
+        cache_file_name = self.auto_forge.configuration.get("solution_cache_file")
+        if cache_file_name:
+            cache_file_name = self._variables.expand(key=cache_file_name, quiet=True)
+            self._cache_file_name = cache_file_name if cache_file_name and "$" not in cache_file_name else None
+        if self._load_cached_solution():
+            self._logger.debug(f"Initialized using cached '{os.path.basename(self._config_file_name)}'")
+            return
+
+        # Validate against the solution schema file if we have it
         if self._schema_files is not None and self._schema_files.get("solution"):
-            self._solution_schema = self._processor.render(file_name=self._schema_files.get("solution"))
+            self._solution_schema_file = self._schema_files.get("solution")
         else:
             self._logger.warning("Solution schema file not foud")
 
-        # Having the solution structure validated we can build the tree
-        self._solution_data = solution_data
-        self._solution_name = solution_name
-
         # Start the heavy lifting
         self._build_solution_tree()
+        self._save_cached_solution()
         self._logger.debug(f"Initialized using '{os.path.basename(self._config_file_name)}'")
 
+    def _get_cache_inputs(self) -> dict[str, Any]:
+        """
+        Collects everything the compiled solution tree depends on, other than the content of its input files.
+        Returns:
+            dict[str, Any]: The cache key fields, compared verbatim when the cache is loaded.
+        """
+        return {"format": SOLUTION_CACHE_FORMAT,
+                "auto_forge_version": str(self.auto_forge.version),
+                "solution_file": self._processor.resolve_file_name(self._config_file_name),
+                "solution_name": self._solution_name,
+                "schemas": self._schema_files,
+                "lazy_configurations": self._lazy_configurations}
+
+    def _get_file_hash(self, file_name: str) -> Optional[str]:
+        """
+        Returns the content hash of the file the processor reads for a file name, which may be its .json / .jsonc
+        alternate, or None if it could not be read.
+        """
+        with suppress(OSError):
+            with open(self._processor.resolve_file_name(file_name), "rb") as input_file:
+                return hashlib.blake2b(input_file.read(), digest_size=16).hexdigest()
+        return None
+
+    def _load_cached_solution(self) -> bool:
+        """
+        Restores the fully resolved solution tree from the cache file, provided that it was built by this
+        version from the same solution, that every input file still has the same content hash, and that every
+        include directive and variable it used still resolves to the same value.
+        Returns:
+            bool: True if the solution was loaded from the cache, False if it has to be rebuilt.
+        """
+        if not self._cache_file_name or not os.path.isfile(self._cache_file_name):
+            return False
+
+        try:
+            with open(self._cache_file_name, encoding="utf-8") as cache_file:
+                cache_data: dict[str, Any] = json.load(cache_file)
+
+            # Validation verdicts are keyed by content, they hold even when the rest of the cache is stale
+            self._processor.restore_validated(cache_data.get("validated") or [])
+
+            if cache_data.get("key") != self._get_cache_inputs():
+                self._logger.debug("Solution cache is stale: solution, schemas or package version changed")
+                return False
+
+            for file_name, file_hash in cache_data["files"].items():
+                if self._get_file_hash(file_name) != file_hash:
+                    self._logger.debug(f"Solution cache is stale: '{file_name}' changed")
+                    return False
+
+            for directive, file_name in cache_data["includes"].items():
+                if self._resolve_include(element="", context=directive, search_path=self._config_file_path,
+                                         return_path=True) != file_name:
+                    self._logger.debug(f"Solution cache is stale: '{directive}' resolves differently")
+                    return False
+
+            for token, value in cache_data["variables"].items():
+                if self._variables.get(token, quiet=True) != value:
+                    self._logger.debug(f"Solution cache is stale: '{token}' expands differently")
+                    return False
+
+            solution_data = cache_data["solution"]
+            if not isinstance(solution_data, dict):
+                return False
+
+            # Configurations which were not expanded yet when the cache was written remain lazy
+            lazy_data: dict[str, Any] = cache_data.get("lazy") or {}
+            lazy_sources = lazy_data.get("sources", {})
+            lazy_pending = {(project_name, config_name) for project_name, config_name in lazy_data.get("pending", [])}
+
+        except Exception as cache_error:
+            self._logger.debug(f"Solution cache '{self._cache_file_name}' ignored: {cache_error}")
+            return False
+
+        self._solution_data = solution_data
+        self._lazy_sources = lazy_sources
+        self._lazy_pending = lazy_pending
+        self._build_lookup_indexes()
+        self._solution_loaded = True
+        self._solution_cached = True
+        return True
+
+    def _build_lookup_indexes(self) -> None:
+        """
+        Indexes the enabled projects and configurations of the resolved solution by name, so that queries
+        don't have to scan the solution. Must be called whenever the solution data is replaced.
+        """
+        self._projects = []
+        self._projects_index = {}
+        self._configurations_index = {}
+        self._items_index = None
+
+        projects = self._solution_data.get("projects", [])
+        if not isinstance(projects, list):
+            return
+
+        for project in projects:
+            if not isinstance(project, dict) or project.get("disabled", False):
+                continue
+            project_name = project.get("name")
+            if project_name in self._projects_index:
+                continue
+            self._projects.append(project)
+            self._projects_index[project_name] = project
+
+            configurations = project.get("configurations", [])
+            if not isinstance(configurations, list):
+                continue
+            active_configs = [cfg for cfg in configurations if isinstance(cfg, dict) and not cfg.get("disabled", False)]
+            configurations_by_name: dict[str, dict[str, Any]] = {}
+            for cfg in active_configs:
+                configurations_by_name.setdefault(cfg.get("name"), cfg)
+            self._configurations_index[project_name] = (active_configs, configurations_by_name)
+
+    @staticmethod
+    def _build_items_index(node: Any) -> dict[str, Any]:
+        """
+        Maps every key in the solution to the first value found for it, in the same depth-first order
+        a recursive search would visit them in, so that deep searches become a single lookup.
+        Args:
+            node (Any): The solution data.
+        Returns:
+            dict[str, Any]: First list, dict, str, bool or int value of every key.
+        """
+        items_index: dict[str, Any] = {}
+
+        def _index(_obj: Any) -> None:
+            """ Solution wide recursive walk, keys are recorded before their values are descended into. """
+            if isinstance(_obj, dict):
+                for k, v in _obj.items():
+                    if k not in items_index and isinstance(v, (list, dict, str, bool, int)):
+                        items_index[k] = v
+                    _index(v)
+            elif isinstance(_obj, list):
+                for item in _obj:
+                    _index(item)
+
+        _index(node)
+        return items_index
+
+    def _save_cached_solution(self) -> None:
+        """
+        Persists the fully resolved solution tree along with the hashes of every file it was built from.
+        The file is replaced atomically, and failing to write it is never fatal.
+        """
+        if not self._cache_file_name or not self._solution_loaded:
+            return
+
+        input_files = {self._config_file_name, *(self._schema_files or {}).values(),
+                       *(file_name for file_name in self._cache_includes.values() if file_name is not None)}
+        cache_data: dict[str, Any] = {
+            "key": self._get_cache_inputs(),
+            "files": {file_name: self._get_file_hash(file_name) for file_name in sorted(input_files)},
+            "includes": self._cache_includes,
+            "variables": self._cache_variables,
+            "solution": self._solution_data,
+            "validated": self._processor.validated_digests}
+        if self._lazy_configurations:
+            cache_data["lazy"] = {"sources": self._lazy_sources, "pending": list(self._lazy_pending)}
+
+        temp_file_name: Optional[str] = None
+        try:
+            cache_path = os.path.dirname(self._cache_file_name)
+            os.makedirs(cache_path, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=cache_path, suffix=".tmp",
+                                             delete=False) as temp_file:
+                temp_file_name = temp_file.name
+                json.dump(cache_data, temp_file, separators=(",", ":"))
+            os.replace(temp_file_name, self._cache_file_name)
+            self._logger.debug(f"Solution cache written to '{self._cache_file_name}'")
+
+        except Exception as cache_error:
+            self._logger.warning(f"Solution cache could not be written: {cache_error}")
+            if temp_file_name is not None:
+                with suppress(OSError):
+                    os.remove(temp_file_name)
+
     def _build_solution_tree(self):
         """
         Orchestrates preprocessing steps to dynamically resolve and process elements within the JSON structure.
@@ -433,27 +611,28 @@ class CoreSolution(CoreModuleInterface):
             # Each major step is processed and immediately refreshed
             self._process_and_refresh(method=self._traverse_and_process_syntax)
             self._process_and_refresh(method=self._traverse_and_process_includes)
+
+            # In lazy mode configurations are set aside, and only expanded once first queried
+            if self._lazy_configurations:
+                self._detach_configurations()
             self._process_and_refresh(method=self._traverse_and_process_derivations)
             self._process_and_refresh(method=self._traverse_and_process_variables)
+            if self._lazy_configurations:
+                self._attach_configurations()
 
-            # Continues processing and refreshing until no more references are found
-            # or the maximum number of iterations is reached to prevent infinite loops.
-            while self._find_references(self._solution_data) and self._pre_processed_iterations < self._max_iterations:
-                self._process_and_refresh(self._traverse_and_process_references)
-                self._pre_processed_iterations += 1
-
-            if self._pre_processed_iterations >= self._max_iterations:
-                raise RuntimeError(f"exceeded maximum reference resolution iterations '{self._max_iterations}', "
-                                   f"potential unresolved references or circular dependencies!")
+            # Resolves every reference exactly once, after the references it depends on
+            self._process_and_refresh(method=self._traverse_and_process_references)
 
             # Remove keys pointing to none
             self._process_and_refresh(method=self._traverse_and_process_nones)
 
             # If a schema was specified, validate the fully constructed solution configuration
-            if self._solution_schema is not None:
-                validate(instance=self._solution_data, schema=self._solution_schema)
+            if self._solution_schema_file is not None:
+                self._processor.validate(instance=self._solution_data, schema_file_name=self._solution_schema_file,
+                                         source_file_name=self._config_file_name)
 
             # From now on we can serve solution queries from 'AutoForge'
+            self._build_lookup_indexes()
             self._solution_loaded = True
 
         except ValidationError as validation_error:
@@ -465,6 +644,126 @@ class CoreSolution(CoreModuleInterface):
         except Exception as exception:
             raise RuntimeError(exception) from exception
 
+    def _detach_configurations(self) -> None:
+        """
+        Sets aside every configuration as written, leaving empty configuration lists behind, so that the
+        derivation and variable passes only expand the solution, tool chains and projects.
+        """
+        self._lazy_sources = {}
+        self._lazy_pending = set()
+
+        for project in self._solution_data.get("projects", []):
+            if isinstance(project, dict) and isinstance(project.get("configurations"), list):
+                self._lazy_sources[project.get("name")] = project["configurations"]
+                project["configurations"] = []
+
+    def _attach_configurations(self) -> None:
+        """
+        Puts back a private copy of every configuration set aside by '_detach_configurations()', and marks
+        them as pending. The references pass which follows skips pending configurations.
+        """
+        for project in self._solution_data.get("projects", []):
+            if not isinstance(project, dict) or project.get("name") not in self._lazy_sources:
+                continue
+            project["configurations"] = copy.deepcopy(self._lazy_sources[project.get("name")])
+            self._lazy_pending.update((project.get("name"), config.get("name"))
+                                      for config in project["configurations"] if isinstance(config, dict))
+
+    def _get_lazy_source(self, project_name: str, source: dict[str, Any]) -> dict[str, Any]:
+        """
+        Returns a private copy of a configuration as written, with its own derivation applied.
+        Args:
+            project_name (str): The name of the project the configuration belongs to.
+            source (Dict[str, Any]): The configuration as written.
+        Returns:
+            Dict[str, Any]: The copy, usable as a derivation source.
+        """
+        key = (project_name, source.get("name"))
+        if key in self._lazy_deriving:
+            raise ValueError(f"circular derivation in '{key[0]}.{key[1]}'")
+
+        source = copy.deepcopy(source)
+        derivation = source.get("data")
+        if isinstance(derivation, str) and "<$derived_from_" in derivation:
+            project = self._get_named_item(self._solution_data.get("projects", []), project_name)
+            saved_scope = self._scope
+            self._lazy_deriving.add(key)
+            try:
+                self._scope = _ScopeState()
+                self._scope.update("solutions", self._solution_data)
+                self._scope.update("projects", project)
+                self._traverse_and_process_derivations([source], "configurations")
+            finally:
+                self._scope = saved_scope
+                self._lazy_deriving.discard(key)
+
+        return source
+
+    def _attach_pending_configuration(self, project: dict[str, Any], configuration: dict[str, Any]) -> None:
+        """
+        Expands the derivation and variables of a lazily resolved configuration in place, and adds its reference
+        sites to the running references pass. Does nothing if the configuration is not pending.
+        Args:
+            project (Dict[str, Any]): The project the configuration belongs to.
+            configuration (Dict[str, Any]): The configuration, as found in the solution data.
+        """
+        key = (project.get("name"), configuration.get("name"))
+        if key not in self._lazy_pending:
+            return
+
+        self._lazy_pending.discard(key)
+        saved_scope = self._scope
+        try:
+            # Start over from the configuration as written, whole-solution passes may have touched the copy
+            source = next((config for config in self._lazy_sources.get(key[0], []) if config.get("name") == key[1]),
+                          None)
+            if source is not None:
+                configuration.clear()
+                configuration.update(copy.deepcopy(source))
+
+            self._scope = _ScopeState()
+            self._scope.update("solutions", self._solution_data)
+            self._scope.update("projects", project)
+            self._traverse_and_process_derivations([configuration], "configurations")
+            self._traverse_and_process_variables(configuration)
+
+            self._scope.update("projects", project)
+            self._collect_reference_sites(node=configuration, parent_key="configurations",
+                                          path=f"projects[{key[0]}].configurations[{key[1]}]")
+        finally:
+            self._scope = saved_scope
+
+        self._lazy_attached.append(configuration)
+        self._logger.debug(f"Lazily resolving configuration '{key[0]}.{key[1]}'")
+
+    def _resolve_pending_configuration(self, project: dict[str, Any], configuration: dict[str, Any]) -> None:
+        """
+        Expands a lazily resolved configuration in place, exactly as the startup passes would have.
+        Does nothing if the configuration was already expanded.
+        Args:
+            project (Dict[str, Any]): The project the configuration belongs to.
+            configuration (Dict[str, Any]): The configuration, as found in the solution data.
+        """
+        if (project.get("name"), configuration.get("name")) not in self._lazy_pending:
+            return
+
+        try:
+            # Updated in place, the lookup indexes keep pointing to the same node
+            self._traverse_and_process_references(configuration, project=project)
+        except Exception as exception:
+            raise RuntimeError(f"configuration '{project.get('name')}.{configuration.get('name')}' "
+                               f"could not be resolved: {exception}") from exception
+
+    def _resolve_all_pending_configurations(self) -> None:
+        """ Expands every configuration which is still pending, used by whole-solution accessors. """
+        if not self._lazy_pending:
+            return
+        for project in self._solution_data.get("projects", []):
+            if isinstance(project, dict):
+                for configuration in project.get("configurations", []):
+                    if isinstance(configuration, dict):
+                        self._resolve_pending_configuration(project=project, configuration=configuration)
+
     def _process_and_refresh(self, method):
         """
         Helper function to process part of the JSON structure and immediately refresh it to maintain consistency.
@@ -628,50 +927,204 @@ class CoreSolution(CoreModuleInterface):
                 elif isinstance(item, (dict, list)):
                     self._traverse_and_process_includes(item, parent_key)
 
-    def _traverse_and_process_references(self, node: Union[dict[str, Any], list[Any]], parent_key: Optional[str] = None,
-                                         current_context: Optional[dict[str, Any]] = None):
+    def _traverse_and_process_references(self, node: dict[str, Any], project: Optional[dict[str, Any]] = None) -> None:
+        """
+        Resolves all references such as (`<$ref_...>`) found in string values in a single pass.
+        Every reference site is first collected along with the scope it appears in. Sites are then resolved
+        depth-first: a site referring to another site, or to a node containing sites, resolves those first.
+        Each site is therefore resolved exactly once, and in its own scope, regardless of the order in which
+        they appear in the solution.
+        Lazy configurations met along the way are attached to the pass, see '_attach_pending_configuration()'.
+        Args:
+            node (Dict[str, Any]): The solution node being processed.
+            project (Optional[Dict[str, Any]]): When specified, 'node' is a lazy configuration of that project,
+                and only that configuration, along with whatever it depends on, is resolved.
+        Raises:
+            ValueError: If a circular reference is detected or a referenced key does not exist.
         """
-        Recursively traverses the JSON structure and resolves references such as (`<$ref_...>`) found in string values,
-        updating the node with the resolved values. It also maintains `current_context`, updating it when a named
-        solution, project, or configuration is encountered.
+        self._reference_sites = {}
+        self._reference_subtrees = {}
+        self._reference_stack = []
+        self._reference_names = {}
+        self._lazy_attached = []
 
+        try:
+            if project is None:
+                self._scope = _ScopeState()
+                self._collect_reference_sites(node=node, parent_key="solutions", path="")
+            else:
+                self._attach_pending_configuration(project=project, configuration=node)
+
+            # Attached lazy configurations add sites while resolving
+            while True:
+                pending = [site for site in self._reference_sites.values() if site.state == _ReferenceSite.PENDING]
+                if not pending:
+                    break
+                for site in pending:
+                    self._resolve_reference_site(site)
+
+            # Attached configurations are refreshed and cleaned up the same way the whole solution is
+            for configuration in self._lazy_attached:
+                refreshed = self._refresh_data(configuration)
+                self._traverse_and_process_nones(refreshed)
+                configuration.clear()
+                configuration.update(refreshed)
+
+        finally:
+            self._reference_sites = {}
+            self._reference_subtrees = {}
+            self._reference_stack = []
+            self._reference_names = {}
+            self._lazy_attached = []
+
+    def _collect_reference_sites(self, node: Union[dict[str, Any], list[Any]], parent_key: Optional[str],
+                                 path: str, scope: Optional["_ScopeState"] = None) -> None:
+        """
+        Recursively records every string value containing a reference, along with a snapshot of the scope
+        (solution, project, and configuration) it has to be resolved in.
         Args:
             node (Union[Dict[str, Any], List[Any]]): The current JSON node being processed.
             parent_key (Optional[str]): The key of the parent node, used to track context.
-            current_context (Optional[Dict[str, Any]]): The current scope (solution, project, or configuration).
+            path (str): Readable path to the node, used when reporting errors.
+            scope (Optional[_ScopeState]): Scope snapshot shared by the sites of the enclosing scope.
+        """
+        if isinstance(node, dict):
+            if parent_key == "configurations" and self._lazy_pending and \
+                    (self._scope.project.name_value, node.get("name")) in self._lazy_pending:
+                return  # Expanded once queried, or once another reference depends on it
+
+            if parent_key in ('solutions', 'tool_chains', 'projects', 'configurations') and "name" in node:
+                self._scope.update(parent_key, node)
+                scope = self._scope.snapshot()
+
+            for key, value in node.items():
+                key_path = f"{path}.{key}" if path else key
+                if isinstance(value, str):
+                    if "<$ref_" in value:
+                        self._reference_sites[(id(node), key)] = _ReferenceSite(node, key, key_path, scope)
+                elif isinstance(value, (dict, list)):
+                    self._collect_reference_sites(value, key, key_path, scope)
+
+        elif isinstance(node, list):
+            for index, item in enumerate(node):
+                if isinstance(item, str):
+                    if "<$ref_" in item:
+                        self._reference_sites[(id(node), index)] = _ReferenceSite(node, index, f"{path}[{index}]",
+                                                                                  scope)
+                elif isinstance(item, (dict, list)):
+                    name = item.get("name") if isinstance(item, dict) else None
+                    self._collect_reference_sites(item, parent_key, f"{path}[{name or index}]", scope)
 
+    def _resolve_reference_site(self, site: "_ReferenceSite") -> None:
+        """
+        Resolves a single reference site, after resolving every site its references depend on.
+        Args:
+            site (_ReferenceSite): The site to resolve.
         Raises:
-            ValueError: If a circular reference is detected or a referenced key does not exist.
+            ValueError: If the site depends on itself, directly or through other sites.
         """
+        if site.state == _ReferenceSite.RESOLVED:
+            return
+        if site.state == _ReferenceSite.RESOLVING:
+            chain = self._reference_stack[self._reference_stack.index(site):] + [site]
+            raise ValueError(f"circular reference: {' -> '.join(item.path for item in chain)}")
 
-        if isinstance(node, dict):
+        site.state = _ReferenceSite.RESOLVING
+        self._reference_stack.append(site)
 
-            for key, value in list(node.items()):  # Copy keys for safe iteration
-                # Store current tool china scope
-                if key == "name" and parent_key in ('solutions', 'tool_chains', 'projects', 'configurations'):
-                    self._scope.update(parent_key, node)
+        text: str = site.container[site.key]
+        for reference_path in re.findall(r"<\$ref_([^>]+)>", text):
+            self._resolve_reference_dependencies(reference_path, site.scope)
 
-                if isinstance(value, str) and "<$ref_" in value:
+        # Dependencies are now resolved in place, so the references can be substituted
+        self._scope = site.scope
+        resolved_value = self._resolve_variable_in_string(text, PreProcessType.REFERENCE)
 
-                    resolved_value = self._resolve_variable_in_string(value, PreProcessType.REFERENCE)
-                    if resolved_value is None:
-                        raise ValueError(f"unable to resolve reference '{value}' in '{parent_key or 'root'}'.")
-                    node[key] = resolved_value  # Replace reference with resolved value
+        # References which could not be tracked to a site may still bring in unresolved references
+        nesting: int = 0
+        while isinstance(resolved_value, str) and "<$ref_" in resolved_value:
+            nesting += 1
+            if nesting > self._max_iterations:
+                raise RuntimeError(f"exceeded maximum reference nesting '{self._max_iterations}' in '{site.path}'")
+            resolved_value = self._resolve_variable_in_string(resolved_value, PreProcessType.REFERENCE)
 
-                # Recurse into nested structures
-                self._traverse_and_process_references(value, key, current_context)
+        if resolved_value is None:
+            raise ValueError(f"unable to resolve reference '{text}' in '{site.path}'.")
 
-        elif isinstance(node, list):
+        site.container[site.key] = resolved_value
+        if isinstance(resolved_value, (dict, list)):
+            self._resolve_reference_subtree(resolved_value)
 
-            for index, item in enumerate(node):
-                if isinstance(item, str) and "<$ref_" in item:
-                    resolved_item = self._resolve_variable_in_string(item, PreProcessType.REFERENCE)
-                    if resolved_item is None:
-                        raise ValueError(
-                            f"Unable to resolve reference '{item}' in list under '{parent_key or 'root'}'.")
-                    node[index] = resolved_item  # Update the JSON list in place
-                elif isinstance(item, (dict, list)):
-                    self._traverse_and_process_references(item, parent_key, current_context)
+        self._reference_stack.pop()
+        site.state = _ReferenceSite.RESOLVED
+
+    def _resolve_reference_dependencies(self, reference_path: str, scope: "_ScopeState") -> None:
+        """
+        Walks the path a reference points to, the same way '_resolve_reference()' will, resolving any site met
+        along the way, and every site under the node it finally points to.
+        Paths which can't be followed are ignored here, '_resolve_reference()' reports them.
+        Args:
+            reference_path (str): The reference path, without the `<$ref_` and `>` markers.
+            scope (_ScopeState): The scope the reference is resolved in.
+        """
+        if reference_path.startswith('solutions[]'):
+            reference_path = reference_path.replace('solutions[]', f'solutions[{self._solution_name}]', 1)
+
+        parts = reference_path.split(".")
+        match_list = re.match(r"([a-zA-Z]+)\[]", parts[0])
+
+        if len(parts) == 1:
+            node = scope.current_context.node_data if scope.current_context else None
+        elif match_list:
+            node = scope.get_node(match_list.group(1))
+            parts = parts[1:]
+        elif parts[0] == f"solutions[{self._solution_name}]":
+            node = self._solution_data
+            parts = parts[1:]
+        else:
+            return
+
+        for part in parts:
+            if not isinstance(node, dict):
+                return
+            match = re.match(r"([^[]+)\[([^]]+)]", part)
+            name = match.group(1) if match else part
+            site = self._reference_sites.get((id(node), name))
+            if site is not None:
+                self._resolve_reference_site(site)
+            parent, node = node, node.get(name)
+            if match:
+                node = self._get_named_item(node, match.group(2)) if isinstance(node, list) else None
+                if name == "configurations" and isinstance(node, dict):
+                    self._attach_pending_configuration(project=parent, configuration=node)
+
+        if isinstance(node, (dict, list)):
+            self._resolve_reference_subtree(node)
+
+    def _resolve_reference_subtree(self, node: Union[dict[str, Any], list[Any]]) -> None:
+        """
+        Resolves every site under a node which is referenced as a whole, each node is walked only once.
+        Args:
+            node (Union[Dict[str, Any], List[Any]]): The referenced node.
+        Raises:
+            ValueError: If a site under the node depends on the node itself.
+        """
+        state = self._reference_subtrees.get(id(node))
+        if state == _ReferenceSite.RESOLVED:
+            return
+        if state == _ReferenceSite.RESOLVING:
+            chain = ' -> '.join(item.path for item in self._reference_stack)
+            raise ValueError(f"circular reference: {chain} refers to a node containing itself")
+
+        self._reference_subtrees[id(node)] = _ReferenceSite.RESOLVING
+        for key, value in list(node.items() if isinstance(node, dict) else enumerate(node)):
+            if isinstance(value, str):
+                site = self._reference_sites.get((id(node), key))
+                if site is not None:
+                    self._resolve_reference_site(site)
+            elif isinstance(value, (dict, list)):
+                self._resolve_reference_subtree(value)
+        self._reference_subtrees[id(node)] = _ReferenceSite.RESOLVED
 
     def _resolve_variable_in_string(self, text: str, variable_type: Optional["PreProcessType"]) -> Any:
         """
@@ -686,7 +1139,7 @@ class CoreSolution(CoreModuleInterface):
 
         if variable_type == PreProcessType.ENVIRONMENT:
             # Replace $VAR or ${VAR} — but skip $ref_ and <$ref_> patterns
-            return re.sub(r'\$(?!\{?ref_)(\w+)|\$\{([^}]*)}', lambda m: self._variables.get(m.group(0)), text)
+            return re.sub(r'\$(?!\{?ref_)(\w+)|\$\{([^}]*)}', lambda m: self._expand_variable(m.group(0)), text)
 
         elif variable_type == PreProcessType.REFERENCE:
             def _replace_match(match: re.Match) -> str:
@@ -721,6 +1174,12 @@ class CoreSolution(CoreModuleInterface):
         else:
             raise ValueError(f"unknown variable type: {variable_type}")
 
+    def _expand_variable(self, token: str) -> Optional[str]:
+        """ Expands a single variable token, recording its value since the solution cache depends on it. """
+        value = self._variables.get(token)
+        self._cache_variables[token] = value
+        return value
+
     def _resolve_reference(  # noqa: C901,
             self, reference_path: str) -> Union[str, dict]:
         """
@@ -847,10 +1306,8 @@ class CoreSolution(CoreModuleInterface):
                     name, key = match.groups()
                     sub_element = element.get(name, [])
                     if isinstance(sub_element, list):
-                        if name == "projects":
-                            element = self._get_project_by_name(sub_element, key)
-                        elif name == "configurations" or name == "tool_chains":
-                            element = self._get_configuration_by_name(sub_element, key)
+                        if name in ("projects", "configurations", "tool_chains"):
+                            element = self._get_named_item(sub_element, key) or {}
                     if not element:
                         raise ValueError(f"no {name} found with name '{key}' in path '{path}'")
                 else:
@@ -861,15 +1318,22 @@ class CoreSolution(CoreModuleInterface):
                     raise ValueError(f"'{path}' not found")
         return element
 
-    @staticmethod
-    def _get_project_by_name(projects: list, project_name: str) -> dict[str, Any]:
-        """ Retrieves a specific named project from a list of projects. """
-        return next((p for p in projects if p.get("name") == project_name), {})
+    def _get_named_item(self, items: list, name: str) -> Optional[dict[str, Any]]:
+        """
+        Retrieves the first item with the given name from a list of named items. While references are being
+        resolved, each list is indexed on first use so that lookups don't scan it again.
+        """
+        if not self._reference_sites:
+            return next((item for item in items if isinstance(item, dict) and item.get("name") == name), None)
 
-    @staticmethod
-    def _get_configuration_by_name(configurations: list, configuration_name: str) -> dict[str, Any]:
-        """ Retrieves a specific named configuration from a list of configurations. """
-        return next((c for c in configurations if c.get("name") == configuration_name), {})
+        named_items = self._reference_names.get(id(items))
+        if named_items is None:
+            named_items = {}
+            for item in items:
+                if isinstance(item, dict):
+                    named_items.setdefault(item.get("name"), item)
+            self._reference_names[id(items)] = named_items
+        return named_items.get(name)
 
     def _get_configuration_by_path(self, project_name: str, config_name: str) -> dict[str, Any]:
         """
@@ -878,6 +1342,13 @@ class CoreSolution(CoreModuleInterface):
             project_name (str): The name of the project.
             config_name (str): The name of the configuration.
         """
+        # Lazy configurations derive from their sources as written, not from their expanded form
+        if self._lazy_sources:
+            source = next((config for config in self._lazy_sources.get(project_name, [])
+                           if config.get("name") == config_name), None)
+            if source is not None:
+                return self._get_lazy_source(project_name=project_name, source=source)
+
         projects = self._solution_data.get("projects", [])
         for project in projects:
             if project.get("name") == project_name:
@@ -888,40 +1359,6 @@ class CoreSolution(CoreModuleInterface):
         raise ValueError(
             f"configuration {config_name} not found in project '{project_name}' of solution '{self._solution_name}'")
 
-    @staticmethod
-    def _find_references(root: Union[dict, list]) -> bool:
-        """
-        Performs a breadth-first search on the JSON structure to find any references
-        directly within the method without calling an external function.
-        Args:
-            root (Union[dict, list]): The root of the JSON structure.
-        Returns:
-            bool: True if a reference is found, False otherwise.
-        """
-        queue = deque([root])  # Initialize the queue with the root element
-        pattern = r"<\$ref_[^>]+>"  # Anything that looks like a reference
-
-        while queue:
-            current_node = queue.popleft()  # Get the first element from the queue
-
-            if isinstance(current_node, dict):
-                for _key, value in current_node.items():
-                    if isinstance(value, str):
-                        if re.search(pattern, value):  # Check for reference pattern in string
-                            return True  # Found a reference, return True
-                    elif isinstance(value, (dict, list)):
-                        queue.append(value)  # Enqueue the value for further processing
-
-            elif isinstance(current_node, list):
-                for item in current_node:
-                    if isinstance(item, str):
-                        if re.search(pattern, item):  # Check for reference pattern in string
-                            return True  # Found a reference, return True
-                    elif isinstance(item, (dict, list)):
-                        queue.append(item)  # Enqueue the item for further processing
-
-        return False  # No references found after processing all items
-
     @staticmethod
     def _validate_reference_format(ref_value: str, context: str) -> None:
         """
@@ -1041,6 +1478,7 @@ class CoreSolution(CoreModuleInterface):
             if not self._solution_loaded:
                 raise RuntimeError("no solution is presently loaded into the system")
 
+            self._resolve_all_pending_configurations()
             expr = parse(path)
             matches = [match.value for match in expr.find(self._solution_data)]
 
@@ -1088,7 +1526,10 @@ class CoreSolution(CoreModuleInterface):
                 fallback_path = os.path.join(search_path, raw_path)
                 expanded_path = self._tool_box.get_expanded_path(fallback_path)
 
-            if os.path.isfile(expanded_path):
+            # Unresolved directives are recorded as well, the cache is stale once they can be resolved
+            resolved = os.path.isfile(expanded_path)
+            self._cache_includes[value] = expanded_path if resolved else None
+            if resolved:
                 if return_path:
                     return expanded_path
                 with suppress(Exception):
@@ -1137,6 +1578,11 @@ class CoreSolution(CoreModuleInterface):
         """ Get the solution name. """
         return self._solution_name
 
+    @property
+    def solution_cached(self) -> bool:
+        """ Indicates whether the solution tree was restored from the compiled solution cache. """
+        return self._solution_cached
+
 
 # -----------------------------------------------------------------------------
 #
@@ -1226,6 +1672,33 @@ class ScopeInfo:
             self.name_value = None  # Invalidate inner name
 
 
+class _ReferenceSite:
+    """
+    A string value holding one or more references, along with the scope it has to be resolved in.
+
+    Attributes:
+        container (Union[Dict[str, Any], List[Any]]): The node holding the value.
+        key (Union[str, int]): The key or index of the value in its container.
+        path (str): Readable path to the value, used when reporting errors.
+        scope (_ScopeState): Snapshot of the scope the value appears in.
+        state (int): One of PENDING, RESOLVING or RESOLVED.
+    """
+
+    PENDING = 0
+    RESOLVING = 1
+    RESOLVED = 2
+
+    __slots__ = ("container", "key", "path", "scope", "state")
+
+    def __init__(self, container: Union[dict[str, Any], list[Any]], key: Union[str, int], path: str,
+                 scope: "_ScopeState"):
+        self.container = container
+        self.key = key
+        self.path = path
+        self.scope = scope
+        self.state = _ReferenceSite.PENDING
+
+
 class _ScopeState:
     """
     Manages the hierarchical state while traversing a JSON structure.
@@ -1282,6 +1755,18 @@ class _ScopeState:
             self.configuration.update(node_data=full_node)
             self.current_context = self.configuration
 
+    def snapshot(self) -> "_ScopeState":
+        """
+        Returns a copy of the current state, unaffected by later updates, while still pointing to the same nodes.
+        """
+        state = copy.copy(self)
+        state.solution, state.project, state.configuration = (
+            copy.copy(self.solution), copy.copy(self.project), copy.copy(self.configuration))
+        state.current_context = {id(self.solution): state.solution, id(self.project): state.project,
+                                 id(self.configuration): state.configuration}.get(id(self.current_context),
+                                                                                 self.current_context)
+        return state
+
     def get_node(self, scope_type_name: str) -> Optional[dict[str, Any]]:
         """
         Retrieves the dictionary representation of a scope based on its type.
@@ -20,9 +20,6 @@ from typing import Any, Optional, Union, Iterator
 from urllib.parse import urlparse
 from uuid import UUID
 
-# Third-party
-from jsonschema.validators import validate
-
 # AutoForge imports
 from auto_forge import (
     AutoForgFolderType, AutoForgeModuleType, AutoForgeWorkModeType, CoreJSONCProcessor, CoreLogger, CoreTelemetry,
@@ -428,7 +425,7 @@ class CoreVariables(CoreModuleInterface):
                 )
 
     def load_from_file(self, config_file_name: str, reset: bool = False,
-                       variables_schema: Optional[dict] = None) -> Optional[int]:
+                       variables_schema_file: Optional[str] = None) -> Optional[int]:
         """
         Constructs or rebuilds the configuration data based on a JSONc file.
 
@@ -438,7 +435,7 @@ class CoreVariables(CoreModuleInterface):
         Args:
             config_file_name(str): JSON file containing variables to load
             reset (bool): Specifies whether to forcibly rebuild the variable.
-            variables_schema (dict): If specified we will validate the variables against it.
+            variables_schema_file (str): If specified we will validate the variables against this schema file.
         Returns:
             Optional[int]: The count of variables successfully initialized and stored in the
                            `_variables` list if the operation is successful, otherwise 0.
@@ -451,8 +448,9 @@ class CoreVariables(CoreModuleInterface):
                 raise RuntimeError(f"unable to load variables file: {config_file_name}")
 
             # If a schema was specified, use it to validate the variables structure
-            if variables_schema is not None:
-                validate(instance=variables_root, schema=variables_schema)
+            if variables_schema_file is not None:
+                self._processor.validate(instance=variables_root, schema_file_name=variables_schema_file,
+                                         source_file_name=config_file_name)
 
             # Extract variables, defaults and other options
             variables_data: Optional[list[dict]] = variables_root.get('variables', [])
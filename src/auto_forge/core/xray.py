@@ -8,36 +8,69 @@ Description:
     supports optional content purification to normalize formatting and remove noise.
 
 Features:
-    - Multi-threaded file scanning and indexing
-    - Content de-duplication using checksums
+    - Multi-threaded file scanning and indexing, with an optional process-pool reader backend
+    - Content de-duplication using checksums, optionally storing each distinct content only once
+    - Optional compressed content storage behind an external-content FTS5 index
     - Optional whitespace and encoding normalization ("purify")
+    - Symbol-level index of C definitions (functions, types, macros, globals) using tree-sitter
+    - Include graph index with transitive includers / includees queries
+    - Near-duplicate detection using MinHash signatures and LSH buckets
+    - Block-level copy-paste detection using winnowing fingerprints
+    - Regular expression search ("grep") narrowed by FTS5 trigram prefiltering
+    - Optional per managed path database shards, written in parallel and attached at query time
     - Live progress reporting with file skip/error counts
+    - Optional inotify based watcher which keeps the index in sync with the working tree
     - CLI-friendly interface for structured and ad-hoc SQL queries
 
 """
 
+import ctypes
+import ctypes.util
 import getpass
 import hashlib
+import multiprocessing
 import os
 import platform
+import random
 import re
+import select
 import sqlite3
+import struct
 import threading
 import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from fnmatch import fnmatch
+from fnmatch import translate
 from pathlib import Path
 from queue import Queue
 from threading import Thread, Lock
-from typing import Optional, Any, Union
+from typing import Optional, Any, Union, Iterable, Iterator
 
+import tree_sitter_c as ts_c
 from rich import box
 from rich.console import Console
 from rich.table import Table
 # Third-party
 from rich.text import Text
+from tree_sitter import Parser, Language
+
+# Regular expressions parser, used to extract the literals required by a pattern
+try:
+    from re import _parser as _sre_parser  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parser
+
+# Optional: zstd compression codec for the 'compressed' storage mode, zlib is used when not installed.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Note: Compatibility bypass - no native "UTC" import in Python 3.9.
 UTC = timezone.utc
@@ -55,6 +88,51 @@ AUTO_FORGE_MODULE_DESCRIPTION = "Source Tree Data Base"
 XRAY_NUM_WORKERS = os.cpu_count() or 4
 XRAY_NUM_READERS = 4
 XRAY_BATCH_SIZE = 50
+XRAY_READER_BATCH_SIZE = 64  # Files sent to a reader process at once when using the 'processes' backend
+XRAY_QUERY_PAGE_SIZE = 200  # Rows fetched at once by the streaming query API
+XRAY_MINHASH_PERMUTATIONS = 64  # MinHash signature length, must not change for an existing database
+XRAY_LSH_BANDS = 16  # LSH bands, each of XRAY_MINHASH_PERMUTATIONS / XRAY_LSH_BANDS signature rows
+XRAY_MINHASH_MIN_SHINGLES = 8  # Files with fewer distinct line pairs are too small to compare meaningfully
+XRAY_LSH_MAX_BUCKET_SIZE = 64  # Larger buckets are boilerplate collisions and are not expanded into pairs
+XRAY_FINGERPRINT_LINES = 5  # Winnowing k-gram length, in significant (non-blank, non-brace-only) lines
+XRAY_FINGERPRINT_WINDOW = 4  # Winnowing window, any shared run of LINES + WINDOW - 1 lines is detected
+XRAY_FINGERPRINT_MAX_OCCURRENCES = 16  # More frequent fingerprints are boilerplate and are not reported
+XRAY_GREP_BATCH_SIZE = 32  # Candidate files handed to a grep worker process at once
+XRAY_MAX_SHARDS = 10  # SQLite attaches at most 10 databases to a single connection by default
+
+# Whole-buffer content normalization passes, see CoreXRayDB._filter_file_content()
+_XRAY_TRAILING_WS_RE = re.compile(r'[ \v\f]+\n')  # Trailing spaces/vtabs/formfeeds (tabs are expanded first)
+_XRAY_INNER_WS_RE = re.compile(r'(?<=\S)  +(?=\S)')  # Repeated internal spaces, leading indent is preserved
+_XRAY_C_LANGUAGE = Language(ts_c.language())
+_XRAY_SYMBOL_EXTENSIONS = ("c", "h")  # Files parsed for the 'symbols' table
+_XRAY_SYMBOL_SIGNATURE_MAX = 200  # Stored signature length limit
+_XRAY_INCLUDE_RE = re.compile(r'^[ \t]*#[ \t]*include[ \t]*[<"]([^>"\n]+)[>"]', re.MULTILINE)
+_XRAY_INCLUDE_MAX_DEPTH = 64  # Recursion bound for transitive include queries
+_xray_parsers = threading.local()  # tree-sitter parsers are not thread safe, one per reader thread / process
+_XRAY_MINHASH_PRIME = (1 << 61) - 1
+_XRAY_MINHASH_PERMUTATIONS = [(_rnd.randrange(1, _XRAY_MINHASH_PRIME), _rnd.randrange(0, _XRAY_MINHASH_PRIME))
+                              for _rnd in [random.Random(0x5852_4159)] for _ in range(XRAY_MINHASH_PERMUTATIONS)]
+_XRAY_FINGERPRINT_BASE = 1_000_003
+_XRAY_SHARDED_VIEWS = ("files", "file_meta", "symbols", "includes", "minhash", "lsh_buckets", "fingerprints", "meta")
+_XRAY_SQL_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_.]*$')  # Table / column names accepted by iter_keyset()
+
+
+def _path_id(path: str) -> int:
+    """
+    Derive a stable signed 64-bit identifier from a file path.
+    Used as the 'files' table rowid so that a re-indexed file replaces its previous row
+    instead of appending a new one, and so that stale rows can be deleted without scanning
+    the FTS table's unindexed 'path' column.
+    """
+    return int.from_bytes(hashlib.blake2b(path.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+
+def _content_id(checksum: str) -> int:
+    """
+    Convert a content checksum (8 bytes blake2b hex digest) into a signed 64-bit identifier.
+    Used as the 'contents' table rowid when the database is in 'dedup' storage mode.
+    """
+    return int.from_bytes(bytes.fromhex(checksum), 'big', signed=True)
 
 
 @dataclass
@@ -72,6 +150,680 @@ class _XRayStats:
         self.start_time = time.time()
 
 
+@dataclass
+class _XRayWriterStats:
+    """ Internal type used for storing the SQLite writer per-batch commit latency statics """
+    batches: int = 0
+    rows: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    last_latency: float = 0.0
+
+    def reset(self):
+        self.batches = 0
+        self.rows = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    def add(self, rows: int, latency: float):
+        self.batches += 1
+        self.rows += rows
+        self.total_latency += latency
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_latency_ms": round(self.total_latency * 1000 / self.batches, 3) if self.batches else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 3),
+            "last_latency_ms": round(self.last_latency * 1000, 3),
+        }
+
+
+@dataclass
+class _XRayIndexProgress:
+    """ Internal type used for reporting the progress of a running indexing pass """
+    active: bool = False
+    enumerating: bool = False
+    queued: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    start_time: float = 0.0
+    end_time: float = 0.0
+
+    def reset(self):
+        self.active = True
+        self.enumerating = True
+        self.queued = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.errors = 0
+        self.start_time = time.time()
+        self.end_time = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        elapsed = (self.end_time or time.time()) - self.start_time if self.start_time else 0.0
+        handled = self.changed + self.unchanged + self.errors
+        return {
+            "active": self.active,
+            "enumerating": self.enumerating,
+            "queued": self.queued,
+            "handled": handled,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "errors": self.errors,
+            "elapsed_sec": round(elapsed, 3),
+            "files_per_sec": int(handled / elapsed) if elapsed > 0 else 0,
+        }
+
+
+class _XRayExclusionMatcher:
+    """
+    Compiled form of the solution 'xray_excluded_path' glob patterns, built once at module initialization
+    instead of running fnmatch() against every pattern for every file.
+    - Patterns made of a literal prefix followed by a trailing '*' (the common 'some/sdk/path/*' form) are
+      matched with a single str.startswith() call over a tuple of prefixes.
+    - All other patterns are merged into one combined regular expression.
+    - Directory decisions are cached, so a pruned directory is evaluated once rather than once per file.
+    """
+
+    def __init__(self, patterns: list[str]):
+        prefixes: list[str] = []
+        file_patterns: list[str] = []
+        dir_patterns: list[str] = []
+
+        for pattern in patterns:
+            if pattern.endswith("*") and not any(ch in pattern[:-1] for ch in "*?["):
+                prefixes.append(pattern[:-1])
+                continue
+            file_patterns.append(pattern)
+            # A pattern ending with '*' that matches 'dir/' matches anything below 'dir/' as well
+            if pattern.endswith("*"):
+                dir_patterns.append(pattern)
+
+        self._prefixes: tuple[str, ...] = tuple(prefixes)
+        self._file_regex: Optional[re.Pattern] = self._compile(file_patterns)
+        self._dir_regex: Optional[re.Pattern] = self._compile(dir_patterns)
+        self._dir_cache: dict[str, bool] = {}
+
+    @staticmethod
+    def _compile(patterns: list[str]) -> Optional[re.Pattern]:
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{translate(pattern)})" for pattern in patterns))
+
+    def matches_file(self, path_str: str) -> bool:
+        """ Returns True if the full path matches any of the patterns, same as fnmatch() against each of them. """
+        if self._prefixes and path_str.startswith(self._prefixes):
+            return True
+        return self._file_regex is not None and self._file_regex.match(path_str) is not None
+
+    def matches_dir(self, dir_str: str) -> bool:
+        """ Returns True if every path below the directory is guaranteed to match, allowing it to be pruned. """
+        cached = self._dir_cache.get(dir_str)
+        if cached is None:
+            dir_prefix = dir_str.rstrip(os.sep) + os.sep
+            cached = bool((self._prefixes and dir_prefix.startswith(self._prefixes)) or
+                          (self._dir_regex is not None and self._dir_regex.match(dir_prefix) is not None))
+            self._dir_cache[dir_str] = cached
+        return cached
+
+
+class _XRayPathTable:
+    """
+    Compact, read-only form of the 'file_meta' rows preloaded by an indexing pass, used instead of a dictionary
+    of full path strings to metadata tuples.
+    - Rows are grouped by directory, each directory string is stored once and only file names are kept per entry,
+      looked up with a binary search within their directory's slice.
+    - Modification times, sizes, inodes and checksums (8 bytes blake2b digests) are held in typed arrays.
+    - A 'seen' bitmap replaces the set of paths met while indexing, stale entries are the ones never marked.
+    """
+
+    def __init__(self):
+        self._dir_ids: dict[str, int] = {}
+        self._dirs: list[str] = []
+        self._dir_start = array('L')  # Index of the first entry of each directory
+        self._names: list[str] = []
+        self._modified = array('d')
+        self._sizes = array('Q')
+        self._inodes = array('Q')
+        self._checksums = array('Q')
+        self._seen = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def extend(self, rows: Iterable[tuple[str, str, float, int, int, str]]) -> None:
+        """
+        Append (directory, name, modified, size, inode, checksum) rows.
+        Raises:
+            ValueError: If rows are not ordered by directory then name, or a directory's rows are not contiguous.
+        """
+        names = self._names
+        last_dir: Optional[str] = self._dirs[-1] if self._dirs else None
+        last_name: str = ""
+
+        # Bound methods, this loop runs once per indexed file
+        add_name, add_modified, add_size = names.append, self._modified.append, self._sizes.append
+        add_inode, add_checksum = self._inodes.append, self._checksums.append
+
+        for directory, name, modified, size, inode, checksum in rows:
+            if directory != last_dir:
+                if directory in self._dir_ids:
+                    raise ValueError(f"rows of directory '{directory}' are not contiguous")
+                self._dir_ids[directory] = len(self._dirs)
+                self._dirs.append(directory)
+                self._dir_start.append(len(names))
+                last_dir = directory
+            elif name <= last_name:
+                raise ValueError(f"rows of directory '{directory}' are not ordered by name")
+
+            last_name = name
+            add_name(name)
+            add_modified(modified)
+            add_size(size)
+            add_inode(inode)
+            add_checksum(int(checksum, 16))
+
+        self._seen = bytearray(len(names))
+
+    def find(self, path: str) -> int:
+        """ Index of the entry of 'path', or -1 if it was not preloaded """
+        directory, _sep, name = path.rpartition(os.sep)
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            return -1
+
+        start = self._dir_start[dir_id]
+        end = self._dir_start[dir_id + 1] if dir_id + 1 < len(self._dir_start) else len(self._names)
+        index = bisect_left(self._names, name, start, end)
+        return index if index < end and self._names[index] == name else -1
+
+    def stat_matches(self, index: int, modified: float, size: int, inode: int) -> bool:
+        """ Returns True if the stored stat() metadata of the entry is unchanged """
+        return self._modified[index] == modified and self._sizes[index] == size and self._inodes[index] == inode
+
+    def checksum_matches(self, index: int, checksum: str) -> bool:
+        """ Returns True if the stored content checksum of the entry is unchanged """
+        return self._checksums[index] == int(checksum, 16)
+
+    def mark_seen(self, index: int) -> None:
+        self._seen[index] = 1
+
+    def unseen_paths(self) -> Iterator[str]:
+        """ Full paths of the entries which were never marked as seen """
+        index = self._seen.find(0)
+        while index >= 0:
+            dir_id = bisect_right(self._dir_start, index) - 1
+            yield self._dirs[dir_id] + os.sep + self._names[index]
+            index = self._seen.find(0, index + 1)
+
+
+class _XRayInotify:
+    """
+    Minimal ctypes binding for the Linux inotify API, used by the XRay watcher to receive
+    file change events without adding a third-party dependency.
+    """
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    _EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._inotify_add_watch = libc.inotify_add_watch
+        self._inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._inotify_add_watch.restype = ctypes.c_int
+
+        self._fd: int = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._watches: dict[int, str] = {}
+
+    def add_watch(self, path: str) -> bool:
+        """
+        Start watching a single directory (inotify watches are not recursive).
+        Returns:
+            bool: True on success, False when the kernel refused the watch (e.g. watches limit reached).
+        """
+        wd = self._inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            return False
+        self._watches[wd] = path
+        return True
+
+    def read_events(self, timeout: float) -> list[tuple[str, int]]:
+        """
+        Wait up to 'timeout' seconds for events.
+        Returns:
+            list[tuple[str, int]]: (full path, event mask) pairs. Queue overflow is reported with an empty path.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events: list[tuple[str, int]] = []
+        offset = 0
+        while offset + self._EVENT_HEADER.size <= len(buffer):
+            wd, mask, _cookie, name_len = self._EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self._EVENT_HEADER.size
+            name = buffer[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+
+            if mask & self.IN_Q_OVERFLOW:
+                events.append(("", mask))
+                continue
+
+            directory = self._watches.get(wd)
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+
+            events.append((os.path.join(directory, os.fsdecode(name)) if name else directory, mask))
+
+        return events
+
+    def close(self) -> None:
+        with suppress(OSError):
+            os.close(self._fd)
+        self._watches.clear()
+
+
+def _declarator_name(node: Any) -> Optional[str]:
+    """ Descend a tree-sitter C declarator down to the declared identifier """
+    while node is not None:
+        if node.type in ("identifier", "field_identifier", "type_identifier"):
+            return node.text.decode("utf-8", errors="ignore")
+        if node.type == "parenthesized_declarator":
+            node = node.named_children[0] if node.named_children else None
+            continue
+        node = node.child_by_field_name("declarator")
+    return None
+
+
+def _is_function_declarator(node: Any) -> bool:
+    """ True when a declaration declarator is a function prototype rather than a variable """
+    while node is not None and node.type == "pointer_declarator":
+        node = node.child_by_field_name("declarator")
+    # 'int (*fp)(int)' is a function pointer variable, 'int *f(int)' is a prototype
+    return (node is not None and node.type == "function_declarator" and
+            node.child_by_field_name("declarator").type != "parenthesized_declarator")
+
+
+def _signature(source: bytes, start: int, end: int) -> str:
+    """ Single line, whitespace collapsed and length limited source excerpt """
+    return " ".join(source[start:end].decode("utf-8", errors="ignore").split())[:_XRAY_SYMBOL_SIGNATURE_MAX]
+
+
+def _declaration_prefix(source: bytes, node: Any) -> str:
+    """ Storage class, qualifiers and type of a declaration, without any struct / union / enum body """
+    type_node = node.child_by_field_name("type")
+    body = type_node.child_by_field_name("body") if type_node is not None else None
+    end = body.start_byte if body is not None else (type_node.end_byte if type_node is not None else node.start_byte)
+    return _signature(source, node.start_byte, end)
+
+
+def _extract_c_symbols(content: str) -> list[tuple[str, str, int, str]]:
+    """
+    Extract top level C definitions: functions, struct / union / enum types, typedefs, macros and global
+    variables. Declarations nested in preprocessor conditionals are included, 'extern' declarations and
+    prototypes are not since they are not definitions.
+    Args:
+        content (str): Source text, as stored in the index so that line numbers match.
+    Returns:
+        list[tuple]: (name, kind, line, signature) tuples, 'line' is 1-based.
+    """
+    parser = getattr(_xray_parsers, "c", None)
+    if parser is None:
+        parser = _xray_parsers.c = Parser(_XRAY_C_LANGUAGE)
+    source = content.encode("utf-8")
+    symbols: list[tuple[str, str, int, str]] = []
+
+    def _add(name: Optional[str], kind: str, node: Any, end: int, signature: Optional[str] = None):
+        if name:
+            symbols.append((name, kind, node.start_point[0] + 1,
+                            signature if signature is not None else _signature(source, node.start_byte, end)))
+
+    def _add_tagged(type_node: Any):
+        # struct / union / enum with a body is a definition, a bare 'struct foo' is only a reference
+        if type_node is None or type_node.type not in ("struct_specifier", "union_specifier", "enum_specifier"):
+            return
+        name_node = type_node.child_by_field_name("name")
+        body = type_node.child_by_field_name("body")
+        if name_node is not None and body is not None:
+            _add(name_node.text.decode("utf-8", errors="ignore"), type_node.type.split("_")[0], type_node,
+                 body.start_byte)
+
+    def _visit(node: Any):
+        for child in node.named_children:
+            kind = child.type
+            if kind == "function_definition":
+                body = child.child_by_field_name("body")
+                _add(_declarator_name(child.child_by_field_name("declarator")), "function", child,
+                     body.start_byte if body is not None else child.end_byte)
+            elif kind in ("preproc_def", "preproc_function_def"):
+                name_node = child.child_by_field_name("name")
+                end = (child.child_by_field_name("parameters") or name_node).end_byte
+                _add(name_node.text.decode("utf-8", errors="ignore"), "macro", child, end)
+            elif kind == "type_definition":
+                _add_tagged(child.child_by_field_name("type"))
+                for declarator in child.children_by_field_name("declarator"):
+                    _add(_declarator_name(declarator), "typedef", child, 0,
+                         f"{_declaration_prefix(source, child)} "
+                         f"{_signature(source, declarator.start_byte, declarator.end_byte)}")
+            elif kind == "declaration":
+                _add_tagged(child.child_by_field_name("type"))
+                if any(spec.type == "storage_class_specifier" and spec.text == b"extern" for spec in child.children):
+                    continue
+                for declarator in child.children_by_field_name("declarator"):
+                    target = (declarator.child_by_field_name("declarator")
+                              if declarator.type == "init_declarator" else declarator)
+                    if _is_function_declarator(target):
+                        continue
+                    _add(_declarator_name(target), "variable", child, 0,
+                         f"{_declaration_prefix(source, child)} "
+                         f"{_signature(source, target.start_byte, target.end_byte)}")
+            elif kind in ("struct_specifier", "union_specifier", "enum_specifier"):
+                _add_tagged(child)
+            elif kind in ("preproc_if", "preproc_ifdef", "preproc_else", "preproc_elif", "preproc_elifdef",
+                          "linkage_specification", "declaration_list"):
+                _visit(child)
+
+    _visit(parser.parse(source).root_node)
+    return symbols
+
+
+def _extract_includes(content: str) -> list[tuple[str, int]]:
+    """
+    Extract '#include' directives targets.
+    Args:
+        content (str): Source text, as stored in the index so that line numbers match.
+    Returns:
+        list[tuple]: (target, line) tuples, 'target' as written between the quotes or angle brackets.
+    """
+    includes: list[tuple[str, int]] = []
+    line, offset = 1, 0
+    for match in _XRAY_INCLUDE_RE.finditer(content):
+        line += content.count('\n', offset, match.start())
+        offset = match.start()
+        includes.append((match.group(1).strip(), line))
+    return includes
+
+
+def _minhash_signature(content: str) -> Optional[bytes]:
+    """
+    MinHash signature over the set of consecutive non-blank line pairs (2-gram shingles hashed with crc32),
+    using XRAY_MINHASH_PERMUTATIONS universal hash functions (a * x + b) mod (2^61 - 1).
+    The fraction of equal positions in two signatures estimates the Jaccard similarity of the files.
+    Args:
+        content (str): Source text.
+    Returns:
+        Optional[bytes]: Packed unsigned 64-bit signature, None for files too small to compare.
+    """
+    lines = [line for line in (raw.strip() for raw in content.split('\n')) if line]
+    shingles = {zlib.crc32(f"{first}\n{second}".encode('utf-8')) for first, second in zip(lines, lines[1:])}
+    if len(shingles) < XRAY_MINHASH_MIN_SHINGLES:
+        return None
+
+    prime = _XRAY_MINHASH_PRIME
+    return array('Q', [min([(a * x + b) % prime for x in shingles])
+                       for a, b in _XRAY_MINHASH_PERMUTATIONS]).tobytes()
+
+
+def _lsh_buckets(signature: bytes) -> list[tuple[int, int]]:
+    """
+    Split a MinHash signature into XRAY_LSH_BANDS bands and hash each band into a bucket, files sharing any
+    (band, bucket) pair are similarity candidates.
+    Returns:
+        list[tuple[int, int]]: (band, bucket) pairs, bucket is a signed 64-bit integer.
+    """
+    band_size = len(signature) // XRAY_LSH_BANDS
+    return [(band, int.from_bytes(hashlib.blake2b(signature[band * band_size:(band + 1) * band_size],
+                                                  digest_size=8).digest(), 'big', signed=True))
+            for band in range(XRAY_LSH_BANDS)]
+
+
+def _winnow_fingerprints(content: str) -> list[tuple[int, int, int]]:
+    """
+    Winnowing fingerprints over the significant lines of a file: every run of XRAY_FINGERPRINT_LINES lines gets
+    a Rabin-Karp rolling hash (over per-line crc32 values) and the rightmost minimal hash of each window of
+    XRAY_FINGERPRINT_WINDOW consecutive hashes is selected. Lines without any alphanumeric character (blank,
+    braces only) are ignored, so formatting differences do not break matches.
+    Args:
+        content (str): Source text, as stored in the index so that line numbers match.
+    Returns:
+        list[tuple[int, int, int]]: (hash, line_start, line_end) tuples, lines are 1-based and inclusive.
+    """
+    lines = [(zlib.crc32(text.encode('utf-8')), line_no)
+             for line_no, text in enumerate((raw.strip() for raw in content.split('\n')), start=1)
+             if any(ch.isalnum() for ch in text)]
+    k = XRAY_FINGERPRINT_LINES
+    if len(lines) < k:
+        return []
+
+    prime, base = _XRAY_MINHASH_PRIME, _XRAY_FINGERPRINT_BASE
+    top = pow(base, k - 1, prime)
+    rolling = 0
+    for line_hash, _line_no in lines[:k]:
+        rolling = (rolling * base + line_hash) % prime
+    grams = [rolling]
+    for index in range(k, len(lines)):
+        rolling = ((rolling - lines[index - k][0] * top) * base + lines[index][0]) % prime
+        grams.append(rolling)
+
+    fingerprints: list[tuple[int, int, int]] = []
+    last_selected = -1
+    window = XRAY_FINGERPRINT_WINDOW
+    for start in range(max(1, len(grams) - window + 1)):
+        selected = min(range(start, min(start + window, len(grams))), key=lambda _i: (grams[_i], -_i))
+        if selected != last_selected:
+            last_selected = selected
+            fingerprints.append((grams[selected], lines[selected][1], lines[selected + k - 1][1]))
+    return fingerprints
+
+
+def _required_literals(items: Any) -> list[list[str]]:
+    """
+    Extract the literal strings any match of a parsed regular expression must contain.
+    Args:
+        items (Any): A parsed pattern (or sub pattern) as returned by the regular expressions parser.
+    Returns:
+        list[list[str]]: Clauses which must all be satisfied, each clause being a list of alternatives.
+            Only literals of at least 3 characters are kept since shorter ones cannot be searched by trigrams.
+            Literals are split at whitespace, which the index may hold normalized (expanded tabs, collapsed
+            spaces) while the pattern is matched against the file as written.
+    """
+    clauses: list[list[str]] = []
+    run: list[str] = []
+
+    def _flush():
+        if len(run) >= 3:
+            clauses.append(["".join(run)])
+        run.clear()
+
+    for op, av in items:
+        if op is _sre_parser.LITERAL:
+            if chr(av).isspace():
+                _flush()
+            else:
+                run.append(chr(av))
+            continue
+
+        _flush()
+        if op is _sre_parser.SUBPATTERN:
+            clauses.extend(_required_literals(av[-1]))
+        elif op in (_sre_parser.MAX_REPEAT, _sre_parser.MIN_REPEAT,
+                    getattr(_sre_parser, "POSSESSIVE_REPEAT", None)) and av[0] >= 1:
+            clauses.extend(_required_literals(av[2]))
+        elif op is _sre_parser.ASSERT and av[0] == 1:  # Positive lookahead
+            clauses.extend(_required_literals(av[1]))
+        elif op is _sre_parser.BRANCH:
+            # Alternation: every branch must contribute a literal, the most selective clause of each is used
+            alternatives: list[str] = []
+            for branch in av[1]:
+                branch_clauses = _required_literals(branch)
+                if not branch_clauses:
+                    alternatives = []
+                    break
+                alternatives.extend(max(branch_clauses, key=lambda _clause: min(len(_lit) for _lit in _clause)))
+            if alternatives:
+                clauses.append(sorted(set(alternatives)))
+
+    _flush()
+    return clauses
+
+
+def _worker_process_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for worker process pools. The shell runs several threads by the time a pool is created, and a
+    forked child could inherit a lock held by one of them (logging, sqlite, imports) and never make progress.
+    Workers are therefore forked from a clean 'forkserver' process which preloads this module, or spawned
+    where 'forkserver' is not available.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _grep_files(paths: list[str], pattern: str, flags: int,
+                context: int) -> list[tuple[str, int, int, int, str, list[str], list[str]]]:
+    """
+    Grep worker entry point, kept at module level so it could be executed by worker processes. Files are read from
+    disk rather than from the (normalized) index, so reported lines and columns match what editors show.
+    Args:
+        paths (list[str]): Candidate files.
+        pattern (str): Regular expression.
+        flags (int): Regular expression flags.
+        context (int): Number of context lines to collect around each match.
+    Returns:
+        list[tuple]: (path, line, column, end column, text, lines before, lines after) per matching line,
+            lines and columns are 1-based.
+    """
+    regex = re.compile(pattern, flags)
+    matches: list[tuple[str, int, int, int, str, list[str], list[str]]] = []
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8', errors='ignore') as source_file:
+                lines = source_file.read().splitlines()
+        except OSError:
+            continue
+
+        for index, line in enumerate(lines):
+            match = regex.search(line)
+            if match is None:
+                continue
+            matches.append((path, index + 1, match.start() + 1, match.end() + 1, line,
+                            lines[max(0, index - context):index] if context else [],
+                            lines[index + 1:index + 1 + context] if context else []))
+    return matches
+
+
+def _read_source_file(path: str, filter_content: bool, index_symbols: bool = False, index_similarity: bool = False,
+                      index_fingerprints: bool = False) -> Optional[tuple]:
+    """
+    Read, optionally purify and checksum a single file. Kept at module level so it could be
+    executed by both reader threads and reader processes.
+    Args:
+        path (str): File to read.
+        filter_content (bool): Normalize the content prior to indexing.
+        index_symbols (bool): Extract C symbol definitions from supported file types.
+        index_similarity (bool): Compute a MinHash signature for supported file types.
+        index_fingerprints (bool): Compute block-level winnowing fingerprints for supported file types.
+    Returns:
+        Optional[tuple]: (content, checksum, ext, base, symbols, includes, minhash, fingerprints) or None if the
+            file should not be indexed. The last four are None when not extracted.
+    """
+    with open(path, encoding='utf-8', errors='ignore') as source_file:
+        content: Optional[str] = source_file.read()
+
+    if filter_content:
+        content = CoreXRayDB._filter_file_content(content)
+    if content is None:
+        return None
+
+    checksum = hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+    # Get file extension
+    base = os.path.basename(path)
+    file_ext = os.path.splitext(base)[1]
+    if file_ext:
+        file_ext = file_ext[1:].lower()  # remove dot and lowercase
+    else:
+        file_ext = base.lower()  # fallback to full name like "makefile"
+
+    symbols: Optional[list[tuple]] = None
+    includes: Optional[list[tuple]] = None
+    minhash: Optional[bytes] = None
+    fingerprints: Optional[list[tuple]] = None
+    if file_ext in _XRAY_SYMBOL_EXTENSIONS:
+        includes = _extract_includes(content)
+        if index_symbols:
+            with suppress(Exception):  # A parser failure should not prevent the content from being indexed
+                symbols = _extract_c_symbols(content)
+        if index_similarity:
+            minhash = _minhash_signature(content)
+        if index_fingerprints:
+            fingerprints = _winnow_fingerprints(content)
+
+    return content, checksum, file_ext, base, symbols, includes, minhash, fingerprints
+
+
+def _read_source_files_batch(batch: list[tuple[str, float, int, int]], filter_content: bool,
+                             index_symbols: bool = False, index_similarity: bool = False,
+                             index_fingerprints: bool = False) -> tuple[list[tuple], int, list[str]]:
+    """
+    Reader process entry point, reads a batch of files which passed the stat() based filters.
+    Args:
+        batch (list[tuple]): (path, mtime, size, inode) tuples.
+        filter_content (bool): Normalize the content prior to indexing.
+        index_symbols (bool): Extract C symbol definitions from supported file types.
+        index_similarity (bool): Compute a MinHash signature for supported file types.
+        index_fingerprints (bool): Compute block-level winnowing fingerprints for supported file types.
+    Returns:
+        tuple: (records ready for the writer, skipped count, error messages)
+    """
+    records: list[tuple] = []
+    skipped: int = 0
+    errors: list[str] = []
+
+    for path, mtime, size, inode in batch:
+        try:
+            result = _read_source_file(path, filter_content, index_symbols, index_similarity, index_fingerprints)
+            if result is None:
+                skipped += 1
+                continue
+            records.append((path, result[0], mtime, size, inode, *result[1:]))
+        except Exception as reader_error:
+            errors.append(f"Failed to read '{os.path.basename(path)}': {reader_error}")
+
+    return records, skipped, errors
+
+
 # noinspection SqlNoDataSourceInspection
 class CoreXRayDB(CoreModuleInterface):
 
@@ -85,12 +837,24 @@ class CoreXRayDB(CoreModuleInterface):
         self._index_path: Optional[Path] = None
         self._monitor_thread: Optional[threading.Thread] = None
         self._monitor_running: Optional[bool] = False
+        self._watcher_thread: Optional[threading.Thread] = None
+        self._watcher_running: bool = False
         self._lock = threading.Lock()
+        self._db_write_lock = threading.Lock()
+        self._db_read_pool = threading.local()  # Per thread read-only connection, see _get_pooled_connection()
+        self._db_generation: int = 0  # Bumped whenever the database file may have been replaced
+        self._db_active_queries: int = 0
         self._db_indexed_file_types: Optional[list[str]] = None
         self._db_connection: Optional[sqlite3.Connection] = None
         self._db_file: Optional[Path] = None
+        self._db_files: list[Path] = []  # All database files, one per managed path when sharding is enabled
+        self._db_shard_roots: list[tuple[str, Path]] = []  # (managed path prefix, database file), longest first
+        self._db_sharded: bool = False
+        self._refresh_roots: Optional[list[Path]] = None  # Managed paths re-indexed by the next pass, None for all
         self._db_indexing_log_frequency: int = 1000
         self._db_row_count: int = 0
+        self._writer_stats: _XRayWriterStats = _XRayWriterStats()
+        self._index_progress: _XRayIndexProgress = _XRayIndexProgress()
         self._db_last_indexed_date: Optional[datetime] = None
         self._db_last_indexed_age_days: Optional[int] = None
         self._clean_slate: bool = False
@@ -136,47 +900,18 @@ class CoreXRayDB(CoreModuleInterface):
 
             self._get_and_validate_paths()
 
-            self._db_indexed_file_types = self._configuration.get("db_indexed_file_types")
-            if not isinstance(self._db_indexed_file_types, list) or len(self._db_indexed_file_types) < 1:
-                raise RuntimeError("no indexed items defined")
-
-            # Required configuration property: 'db_version' must be a string.
-            # It indicates the expected schema version for the XRay engine-compatible database.
-            self._db_version: Optional[str] = self._configuration.get("db_version")
-            if not isinstance(self._db_version, str):
-                raise RuntimeError("Configuration error: 'db_version' must be specified as a string.")
-
-            # Required configuration property: 'db_meta_schema' must be a dictionary.
-            # This defines the metadata schema expected in the database's 'meta' table.
-            self._db_meta_schema: Optional[dict] = self._configuration.get("db_meta_schema")
-            if not isinstance(self._db_meta_schema, dict):
-                raise RuntimeError("Configuration error: 'db_meta_schema' must be specified as a dictionary.")
-
-            self._db_max_indexed_file_size_kb: int = self._configuration.get("db_max_indexed_file_size_kb", 1024)
-            self._db_min_indexed_file_size_bytes: int = self._configuration.get("db_min_indexed_file_size_bytes", 8)
-            self._db_non_indexed_path_patterns: list = self._configuration.get("db_non_indexed_path_patterns", [])
-            self._db_non_indexed_file_patterns = self._configuration.get("db_non_indexed_file_patterns", [])
-            self._db_filter_files_content = bool(
-                self._configuration.get("db_filter_files_content", self._db_filter_files_content))
-            self._db_extra_log_verbosity = bool(self._configuration.get("db_extra_log_verbosity", False))
-            self._db_indexing_log_frequency = int(
-                self._configuration.get("db_indexing_log_frequency", self._db_indexing_log_frequency))
-
-            # Number of days after which existing index data is considered stale
-            self._db_max_index_age_days: int = self._configuration.get("db_max_index_age_days", 30)
-
             # Load excluded paths list from the solution
             self._solution_excluded_paths: Any = self._solution.get_arbitrary_item(key="xray_excluded_path")
             if not isinstance(self._solution_excluded_paths, list) or len(self._solution_excluded_paths) < 1:
                 self._logger.warning("Solution's excluded paths are either undefined or incorrectly formatted.")
                 self._solution_excluded_paths = []
 
-            # Create regex pattern based on the configuration list
-            self._db_file = self._index_path / "autoforge.db"
+            self._load_configuration(self._configuration,
+                                     excluded_paths=[str(p) for p in self._solution_excluded_paths])
 
-            # Force 'clean slate' when the SQLite file is missing
-            if not self._db_file.exists():
-                self._logger.warning(f"Existing SQLite file '{str(self._db_file)}' not found")
+            # Force 'clean slate' when no SQLite file exists
+            if not any(db_file.exists() for db_file in self._db_files):
+                self._logger.warning(f"Existing SQLite database not found in '{str(self._index_path)}'")
                 self._clean_slate = True
 
             # Register this module with the package registry
@@ -196,6 +931,103 @@ class CoreXRayDB(CoreModuleInterface):
             self._state = XRayStateType.ERROR
             raise exception
 
+    def _load_configuration(self, configuration: dict[str, Any], excluded_paths: Optional[list[str]] = None) -> None:
+        """
+        Apply the 'db_*' settings of the package configuration, requires the managed and index paths to be set.
+        Args:
+            configuration (dict[str, Any]): The package configuration.
+            excluded_paths (Optional[list[str]]): Glob patterns of paths which are never indexed.
+        """
+        self._db_indexed_file_types = configuration.get("db_indexed_file_types")
+        if not isinstance(self._db_indexed_file_types, list) or len(self._db_indexed_file_types) < 1:
+            raise RuntimeError("no indexed items defined")
+
+        # Required configuration property: 'db_version' must be a string.
+        # It indicates the expected schema version for the XRay engine-compatible database.
+        self._db_version: Optional[str] = configuration.get("db_version")
+        if not isinstance(self._db_version, str):
+            raise RuntimeError("Configuration error: 'db_version' must be specified as a string.")
+
+        # Required configuration property: 'db_meta_schema' must be a dictionary.
+        # This defines the metadata schema expected in the database's 'meta' table.
+        self._db_meta_schema: Optional[dict] = configuration.get("db_meta_schema")
+        if not isinstance(self._db_meta_schema, dict):
+            raise RuntimeError("Configuration error: 'db_meta_schema' must be specified as a dictionary.")
+
+        self._db_max_indexed_file_size_kb: int = configuration.get("db_max_indexed_file_size_kb", 1024)
+        self._db_min_indexed_file_size_bytes: int = configuration.get("db_min_indexed_file_size_bytes", 8)
+        self._db_non_indexed_path_patterns: list = configuration.get("db_non_indexed_path_patterns", [])
+        self._db_non_indexed_file_patterns = configuration.get("db_non_indexed_file_patterns", [])
+        self._compiled_non_indexed_files_patterns = [re.compile(p) for p in self._db_non_indexed_file_patterns]
+        self._db_filter_files_content = bool(
+            configuration.get("db_filter_files_content", self._db_filter_files_content))
+        self._db_extra_log_verbosity = bool(configuration.get("db_extra_log_verbosity", False))
+        self._db_indexing_log_frequency = int(
+            configuration.get("db_indexing_log_frequency", self._db_indexing_log_frequency))
+
+        # Number of days after which existing index data is considered stale
+        self._db_max_index_age_days: int = configuration.get("db_max_index_age_days", 30)
+
+        # Optional live watcher mode: keep the index in sync with file changes once the DB is idle
+        self._db_watch_changes = bool(configuration.get("db_watch_changes", False))
+        self._db_watch_debounce_sec = float(configuration.get("db_watch_debounce_sec", 1.0))
+
+        # Reader backend: 'threads' (default) or 'processes' which runs content purification on all cores
+        self._db_reader_backend: str = str(configuration.get("db_reader_backend", "threads")).lower()
+        if self._db_reader_backend not in ("threads", "processes"):
+            raise RuntimeError(f"Configuration error: unsupported 'db_reader_backend' '{self._db_reader_backend}'")
+        self._db_reader_processes = int(configuration.get("db_reader_processes", 0)) or XRAY_NUM_WORKERS
+
+        # Writer transaction sizing: commit after N rows or after N seconds, whichever comes first
+        self._db_writer_commit_rows = int(configuration.get("db_writer_commit_rows", XRAY_BATCH_SIZE))
+        self._db_writer_commit_seconds = float(configuration.get("db_writer_commit_seconds", 2.0))
+
+        # Storage layout, 'plain': content stored per path, 'dedup': one content row per distinct checksum,
+        # 'compressed': as 'dedup' with the original text held compressed outside the trigram index.
+        self._db_storage_mode: str = str(configuration.get("db_storage_mode", "plain")).lower()
+        if self._db_storage_mode not in ("plain", "dedup", "compressed"):
+            raise RuntimeError(f"Configuration error: unsupported 'db_storage_mode' '{self._db_storage_mode}'")
+
+        # Extract C definitions into the 'symbols' table while indexing
+        self._db_index_symbols: bool = bool(configuration.get("db_index_symbols", True))
+
+        # Compute MinHash signatures and LSH buckets for near-duplicate detection while indexing
+        self._db_index_similarity: bool = bool(configuration.get("db_index_similarity", True))
+
+        # Compute winnowing fingerprints for block-level duplicate code detection while indexing
+        self._db_index_fingerprints: bool = bool(configuration.get("db_index_fingerprints", True))
+
+        # Pooled read-only query connections tuning
+        self._db_query_cache_size_kb: int = int(configuration.get("db_query_cache_size_kb", 65536))
+        self._db_query_mmap_size_mb: int = int(configuration.get("db_query_mmap_size_mb", 256))
+        self._db_query_cached_statements: int = int(
+            configuration.get("db_query_cached_statements", 128))
+
+        self._db_compression_codec: str = str(configuration.get("db_compression_codec", "zlib")).lower()
+        if self._db_compression_codec not in ("zlib", "zstd"):
+            raise RuntimeError(
+                f"Configuration error: unsupported 'db_compression_codec' '{self._db_compression_codec}'")
+        if self._db_compression_codec == "zstd" and zstandard is None:
+            self._logger.warning("'zstandard' is not installed, falling back to zlib compression")
+            self._db_compression_codec = "zlib"
+
+        self._exclusion_matcher = _XRayExclusionMatcher(patterns=excluded_paths or [])
+        self._skip_dir_cache: dict[str, bool] = {}
+
+        # Single database file, or one database file (shard) per managed path, each written by its own
+        # writer thread and merged at query time.
+        self._db_file = self._index_path / "autoforge.db"
+        self._db_sharded = bool(configuration.get("db_shard_by_path", False))
+        if self._db_sharded and len(self._managed_paths) > XRAY_MAX_SHARDS:
+            self._logger.warning(f"{len(self._managed_paths)} managed paths exceed the {XRAY_MAX_SHARDS} "
+                                 f"shards limit, using a single database")
+            self._db_sharded = False
+
+        shard_roots = [(str(root).rstrip(os.sep) + os.sep, self._shard_file(root) if self._db_sharded
+                        else self._db_file) for root in self._managed_paths]
+        self._db_files = list(dict.fromkeys(db_file for _prefix, db_file in shard_roots))
+        self._db_shard_roots = sorted(shard_roots, key=lambda shard: len(shard[0]), reverse=True)
+
     def _get_and_validate_paths(self):
         """" Retrieve paths from variables which could be a single str or alist and force the results into a list """
         managed_paths: Any = self._variables.get_by_folder_type(folder_type="SOURCES")
@@ -245,6 +1077,10 @@ class CoreXRayDB(CoreModuleInterface):
             if isinstance(initial_state, XRayStateType) and self._state != initial_state:
                 return self._state
 
+            # Queries started while indexing may still be running
+            if new_state == XRayStateType.IDLE and self._db_active_queries:
+                new_state = XRayStateType.DB_QUERY
+
             self._state = new_state
             return self._state
 
@@ -257,38 +1093,179 @@ class CoreXRayDB(CoreModuleInterface):
         with self._lock:
             return self._state
 
-    def _get_sql_connection(self, read_only: bool = False) -> sqlite3.Connection:
+    def _shard_file(self, root: Path) -> Path:
+        """ Database file holding the index of a single managed path, named after the path and a hash of it """
+        digest = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:8]
+        return self._index_path / f"autoforge_{root.name or 'root'}_{digest}.db"
+
+    def _shard_of(self, path_str: str) -> Path:
+        """ Database file indexing the given path, the shard of the innermost managed path containing it """
+        if not self._db_sharded:
+            return self._db_file
+        for prefix, db_file in self._db_shard_roots:
+            if path_str.startswith(prefix):
+                return db_file
+        return self._db_files[0]
+
+    def _query_schemas(self) -> list[str]:
+        """ Schema names of the databases attached to pooled query connections, see _get_pooled_connection() """
+        if not self._db_sharded:
+            return ["main"]
+        return [f"shard_{index}" for index in range(len(self._db_files))]
+
+    def _fan_out(self, query: str, params: tuple[Any, ...] = ()) -> tuple[str, tuple[Any, ...]]:
+        """
+        Expand a query written against a single database, with '{schema}' qualified table names, into a UNION ALL
+        over all shards. Needed for virtual tables which are not reachable through the merged views (FTS5 MATCH,
+        rank), note that bm25 ranks are computed per shard.
+        Returns:
+            tuple[str, tuple]: The expanded query and its parameters, repeated per shard.
+        """
+        schemas = self._query_schemas()
+        return " UNION ALL ".join(query.format(schema=schema) for schema in schemas), tuple(params) * len(schemas)
+
+    def _get_sql_connection(self, read_only: bool = False, db_file: Optional[Path] = None) -> sqlite3.Connection:
         """
         Returns a connection to the SQLite database.
         Args:
             read_only (bool): If True, opens the database in read-only mode.
+            db_file (Optional[Path]): Database file (shard) to open, defaults to the single database file.
         Returns:
             sqlite3.Connection: SQLite connection object.
         """
+        db_file = db_file or self._db_file
         if read_only:
-            return sqlite3.connect(f"file:{self._db_file}?mode=ro", uri=True)
-        return sqlite3.connect(str(self._db_file))
+            conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+        else:
+            conn = sqlite3.connect(str(db_file))
+
+        # Required by the 'compressed' storage layout, the 'content_text' view decompresses on read
+        conn.create_function("xray_decompress", 1, self._decompress_content, deterministic=True)
+        return conn
+
+    def _get_pooled_connection(self) -> sqlite3.Connection:
+        """
+        Returns the calling thread's persistent read-only connection, opening it on first use or when the
+        database was re-created since it was opened. Repeated statements are served from the connection
+        statement cache, so callers should pass constant SQL text with bound parameters.
+        When sharding is enabled all shards are attached read-only and the regular tables are exposed as
+        TEMP views merging them. Plain queries run unchanged across the whole index, full-text searches only
+        through the column form ('files.content MATCH'), while rank and bm25() require '_fan_out()'.
+        Returns:
+            sqlite3.Connection: Read-only SQLite connection owned by the calling thread.
+        """
+        conn: Optional[sqlite3.Connection] = getattr(self._db_read_pool, "conn", None)
+        if conn is not None and self._db_read_pool.generation == self._db_generation:
+            return conn
+
+        if conn is not None:
+            with suppress(sqlite3.Error):
+                conn.close()
+
+        if self._db_sharded:
+            conn = sqlite3.connect("file::memory:", uri=True, cached_statements=self._db_query_cached_statements)
+            for schema, db_file in zip(self._query_schemas(), self._db_files):
+                conn.execute("ATTACH DATABASE ? AS ?", (f"file:{db_file}?mode=ro", schema))
+        else:
+            conn = sqlite3.connect(f"file:{self._db_file}?mode=ro", uri=True,
+                                   cached_statements=self._db_query_cached_statements)
+
+        conn.create_function("xray_decompress", 1, self._decompress_content, deterministic=True)
+        for schema in self._query_schemas():
+            conn.execute(f"PRAGMA {schema}.cache_size = -{self._db_query_cache_size_kb}")
+            conn.execute(f"PRAGMA {schema}.mmap_size = {self._db_query_mmap_size_mb * 1024 * 1024}")
+        conn.execute("PRAGMA temp_store = MEMORY")  # Must precede the TEMP views, changing it drops them
+
+        if self._db_sharded:
+            for view in _XRAY_SHARDED_VIEWS:
+                conn.execute(f"CREATE TEMP VIEW {view} AS " + " UNION ALL ".join(
+                    f"SELECT * FROM {schema}.{view}" for schema in self._query_schemas()))
+
+        self._db_read_pool.conn = conn
+        self._db_read_pool.generation = self._db_generation
+        return conn
+
+    def _begin_query(self) -> None:
+        """
+        Register an active reader, any number of readers may run concurrently.
+        While indexing, queries are served from the last committed WAL snapshot and the state is left untouched.
+        Raises:
+            RuntimeError: If the database is not available for querying.
+        """
+        with self._lock:
+            if self._state not in (XRayStateType.IDLE, XRayStateType.DB_QUERY, XRayStateType.DB_READY,
+                                   XRayStateType.DB_INDEXING):
+                raise RuntimeError(f"Cannot execute query: DB is in {self._state.name} state")
+            self._db_active_queries += 1
+            if self._state == XRayStateType.IDLE:
+                self._state = XRayStateType.DB_QUERY
+
+    def _end_query(self) -> None:
+        """ Unregister an active reader, the last one to leave switches back to IDLE. """
+        with self._lock:
+            self._db_active_queries = max(0, self._db_active_queries - 1)
+            if not self._db_active_queries and self._state == XRayStateType.DB_QUERY:
+                self._state = XRayStateType.IDLE
+
+    def _compress_content(self, content: str) -> bytes:
+        """ Compress content using the configured codec ('compressed' storage mode) """
+        data = content.encode('utf-8')
+        if self._db_compression_codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return zlib.compress(data, 6)
+
+    def _decompress_content(self, data: Optional[bytes]) -> Optional[str]:
+        """ SQLite 'xray_decompress()' implementation, reverses _compress_content() """
+        if data is None:
+            return None
+        if self._db_compression_codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+        return zlib.decompress(data).decode('utf-8')
 
     def _initialize_database(self) -> None:
         """
-        Create or open the SQLite database file.
+        Create or open the SQLite database files, a single one or one per managed path when 'db_shard_by_path'
+        is enabled. Shards are validated and created independently, so a new or corrupted shard does not discard
+        the others. The module is in 'clean slate' mode only when all of them were created from scratch.
+        """
+
+        # Pooled query connections may refer to a file that is about to be replaced
+        self._db_generation += 1
+        self._db_row_count = 0
+        self._db_last_indexed_date = None
+
+        created = [self._initialize_database_file(db_file, clean_slate=self._clean_slate)
+                   for db_file in self._db_files]
+
+        # A newly created shard must be populated, regardless of when the others were indexed
+        if any(created):
+            self._db_last_indexed_date = None
+            self._db_last_indexed_age_days = None
+        self._clean_slate = all(created)
+
+    def _initialize_database_file(self, db_file: Path, clean_slate: bool) -> bool:
+        """
+        Create or open a single SQLite database file.
         If the database file does not exist, a new one is created with the required tables and
         indexing structure (FTS5 for full-text content and metadata table for checksums).
-        If `force_new` is True, an existing database will be deleted and rebuilt from scratch.
-
+        Args:
+            db_file (Path): The database file (shard) to open.
+            clean_slate (bool): If True, an existing database will be deleted and rebuilt from scratch.
+        Returns:
+            bool: True if the database was created from scratch.
         """
 
         # Normalize 'clean_slate' variable based on SQLite file existence.
-        if self._clean_slate:
-            if self._db_file.exists():
-                self._logger.warning(f"Existing SQLite file '{str(self._db_file)}' will be deleted")
-                self._db_file.unlink(missing_ok=True)
+        if clean_slate:
+            if db_file.exists():
+                self._logger.warning(f"Existing SQLite file '{str(db_file)}' will be deleted")
+                db_file.unlink(missing_ok=True)
         else:
-            if not self._db_file.exists():
-                self._logger.warning(f"Existing SQLite file '{str(self._db_file)}' not found, creating it")
-                self._clean_slate = True
+            if not db_file.exists():
+                self._logger.warning(f"Existing SQLite file '{str(db_file)}' not found, creating it")
+                clean_slate = True
 
-        if not self._clean_slate:
+        if not clean_slate:
 
             # ------------------------------------------------------------------
             #
@@ -296,10 +1273,10 @@ class CoreXRayDB(CoreModuleInterface):
             #
             # ------------------------------------------------------------------
 
-            self._logger.debug(f"Opening SQLite file: {str(self._db_file)}")
+            self._logger.debug(f"Opening SQLite file: {str(db_file)}")
             conn: Optional[sqlite3.Connection] = None
             try:
-                conn = sqlite3.connect(str(self._db_file))
+                conn = self._get_sql_connection(db_file=db_file)
                 cursor = conn.cursor()
 
                 # Fast settings for read-heavy use
@@ -315,28 +1292,29 @@ class CoreXRayDB(CoreModuleInterface):
                 # Detect presence of existing tables
                 # @formatter:off
                 cursor.execute("""
-                               SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'files';
+                               SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name = 'files';
                                """)
                 # @formatter:on
                 if not cursor.fetchone():
-                    self._logger.warning(f"Unable to fetch data from exiting an SQLite database '{str(self._db_file)}'")
-                    self._clean_slate = True
+                    self._logger.warning(f"Unable to fetch data from exiting an SQLite database '{str(db_file)}'")
+                    clean_slate = True
                 else:
                     cursor.execute("SELECT 1 FROM files LIMIT 1;")  # Fast schema check
 
-                    # Validate 'meta' table
-                    self._validate_meta_table()
+                    # Validate 'meta' table, an empty index is rebuilt
+                    if not self._validate_meta_table(db_file):
+                        clean_slate = True
 
             except Exception as sql_error:
                 self._logger.warning(f"Existing index is invalid or incompatible: {sql_error}")
                 try:
-                    self._logger.warning(f"Delinting corrupted SQLite database, deleting '{str(self._db_file)}'")
-                    self._db_file.unlink(missing_ok=True)
-                    self._clean_slate = True
+                    self._logger.warning(f"Delinting corrupted SQLite database, deleting '{str(db_file)}'")
+                    db_file.unlink(missing_ok=True)
+                    clean_slate = True
 
                 except Exception as delete_error:
                     raise RuntimeError(
-                        f"Error deleting corrupted SQLite database file '{str(self._db_file)}'") from delete_error
+                        f"Error deleting corrupted SQLite database file '{str(db_file)}'") from delete_error
             finally:
                 if conn:
                     conn.close()
@@ -344,36 +1322,39 @@ class CoreXRayDB(CoreModuleInterface):
         # ----------------------------------------------------------------------
         #
         # Creating SQLite tables:
-        # Data table: 'files', fields { path , content }
-        # Files metadata table:  'file_meta', fields { path, modified, checksum }
+        # Data table: 'files', fields { path , content }, rowid derived from the path.
+        #   In 'dedup' storage mode 'files' is a compatibility view over 'file_meta' joined with
+        #   'contents' { content }, which holds one row per distinct checksum (rowid derived from the checksum).
+        #   In 'compressed' storage mode 'contents' is an external-content FTS5 index whose text is read through
+        #   the 'content_text' view, decompressing 'content_blobs' { id, data } with xray_decompress().
+        # Files metadata table:  'file_meta', fields { path, modified, size, inode, checksum, content_id, ext, base }
+        # Symbols table: 'symbols', fields { name, kind, path, line, signature }
+        # Include graph table: 'includes', fields { src, target, resolved_path, line }
+        # Similarity tables: 'minhash' { path, signature }, 'lsh_buckets' { band, bucket, path }
+        # Block fingerprints table: 'fingerprints', fields { hash, path, line_start, line_end }
         # General metadata Key/Value table: 'meta', fields { db_version, db_creation_date .. }
         #
         # ----------------------------------------------------------------------
 
-        if self._clean_slate:
+        if clean_slate:
             conn: Optional[sqlite3.Connection] = None
             # noinspection SpellCheckingInspection
             try:
-                self._logger.info(f"Creating new SQLite database file at: {str(self._db_file)}")
-                conn = sqlite3.connect(str(str(self._db_file)))
+                self._logger.info(f"Creating new SQLite database file at: {str(db_file)}")
+                conn = self._get_sql_connection(db_file=db_file)
                 cursor = conn.cursor()
 
-                # Main paths and files content table
-                cursor.execute("""
-                    CREATE VIRTUAL TABLE IF NOT EXISTS files USING fts5(
-                        path UNINDEXED,
-                        content,
-                        tokenize = 'trigram'
-                    );
-                """)
-
-                # Per file metadata table
+                # Per file metadata table, 'modified', 'size' and 'inode' allow skipping unchanged files
+                # without reading them.
                 # @formatter:off
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS file_meta(
                         path TEXT PRIMARY KEY,
                         modified REAL,
+                        size INTEGER,
+                        inode INTEGER,
                         checksum TEXT,
+                        content_id INTEGER,
                         ext TEXT,
                         base TEXT
                     );
@@ -383,6 +1364,144 @@ class CoreXRayDB(CoreModuleInterface):
                 cursor.execute("""
                                CREATE INDEX IF NOT EXISTS idx_file_meta_path ON file_meta(path);
                                """)
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_file_meta_checksum ON file_meta(checksum);
+                               """)
+
+                if self._db_storage_mode == "compressed":
+                    # Compressed content addressed storage, only the trigram index itself is kept uncompressed
+                    # @formatter:off
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS content_blobs(
+                            id INTEGER PRIMARY KEY,
+                            data BLOB
+                        );
+                    """)
+                    cursor.execute("""
+                        CREATE VIEW IF NOT EXISTS content_text(id, content) AS
+                            SELECT id, xray_decompress(data) FROM content_blobs;
+                    """)
+                    # @formatter:on
+                    cursor.execute("""
+                        CREATE VIRTUAL TABLE IF NOT EXISTS contents USING fts5(
+                            content,
+                            content = 'content_text',
+                            content_rowid = 'id',
+                            tokenize = 'trigram'
+                        );
+                    """)
+
+                elif self._db_storage_mode == "dedup":
+                    # Content addressed storage, identical files share a single trigram indexed row
+                    cursor.execute("""
+                        CREATE VIRTUAL TABLE IF NOT EXISTS contents USING fts5(
+                            content,
+                            tokenize = 'trigram'
+                        );
+                    """)
+
+                if self._db_storage_mode in ("dedup", "compressed"):
+                    cursor.execute("""
+                                   CREATE INDEX IF NOT EXISTS idx_file_meta_content_id ON file_meta(content_id);
+                                   """)
+
+                    # Compatibility view for existing 'files' queries. Only the column form 'files.content MATCH'
+                    # goes through it, 'files MATCH', rank, bm25(), snippet() and highlight() need the FTS5 table
+                    # @formatter:off
+                    cursor.execute("""
+                        CREATE VIEW IF NOT EXISTS files(path, content) AS
+                            SELECT file_meta.path, contents.content
+                            FROM file_meta
+                            JOIN contents ON contents.rowid = file_meta.content_id;
+                    """)
+                    # @formatter:on
+                else:
+                    # Main paths and files content table
+                    cursor.execute("""
+                        CREATE VIRTUAL TABLE IF NOT EXISTS files USING fts5(
+                            path UNINDEXED,
+                            content,
+                            tokenize = 'trigram'
+                        );
+                    """)
+
+                # C symbol definitions, filled by the readers using tree-sitter
+                # @formatter:off
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS symbols(
+                        name TEXT,
+                        kind TEXT,
+                        path TEXT,
+                        line INTEGER,
+                        signature TEXT
+                    );
+                """)
+                # @formatter:on
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
+                               """)
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_symbols_path ON symbols(path);
+                               """)
+
+                # Include directives graph, 'resolved_path' is NULL for targets outside the indexed tree
+                # @formatter:off
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS includes(
+                        src TEXT,
+                        target TEXT,
+                        resolved_path TEXT,
+                        line INTEGER
+                    );
+                """)
+                # @formatter:on
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_includes_src ON includes(src);
+                               """)
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_includes_resolved_path ON includes(resolved_path);
+                               """)
+
+                # Near-duplicate detection: per file MinHash signature and its LSH (band, bucket) memberships
+                # @formatter:off
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS minhash(
+                        path TEXT PRIMARY KEY,
+                        signature BLOB
+                    );
+                """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS lsh_buckets(
+                        band INTEGER,
+                        bucket INTEGER,
+                        path TEXT
+                    );
+                """)
+                # @formatter:on
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_lsh_buckets_bucket ON lsh_buckets(band, bucket);
+                               """)
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_lsh_buckets_path ON lsh_buckets(path);
+                               """)
+
+                # Block-level duplicate detection: winnowing fingerprints with the line range they cover
+                # @formatter:off
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS fingerprints(
+                        hash INTEGER,
+                        path TEXT,
+                        line_start INTEGER,
+                        line_end INTEGER
+                    );
+                """)
+                # @formatter:on
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_fingerprints_hash ON fingerprints(hash);
+                               """)
+                cursor.execute("""
+                               CREATE INDEX IF NOT EXISTS idx_fingerprints_path ON fingerprints(path);
+                               """)
 
                 # Persistanr meta table
                 # @formatter:off
@@ -406,7 +1525,7 @@ class CoreXRayDB(CoreModuleInterface):
                 conn.commit()
 
                 # Populate the new 'meta' table with initial values
-                self._update_meta_table(clean_slate=True)
+                self._update_meta_table(clean_slate=True, db_file=db_file)
 
             except Exception as sql_error:
                 self._logger.warning(f"Existing SQLite database is invalid or incompatible: {sql_error}")
@@ -414,19 +1533,24 @@ class CoreXRayDB(CoreModuleInterface):
                 if conn:
                     conn.close()
 
-    def _validate_meta_table(self) -> Optional[bool]:
+        return clean_slate
+
+    def _validate_meta_table(self, db_file: Path) -> Optional[bool]:
         """
         Validates the persistent 'meta' table against the preloaded schema and the expected db_version field.
         - Ensures all required keys are present.
         - Confirms all values match the expected types (str, datetime, int, float).
         - Date fields are also double-checked and verified to be in the past and no older than one year.
         - Raises an error if the stored db_version is incompatible with the current engine version.
+        The oldest last indexing date and the sum of row counts are kept across shards.
+        Args:
+            db_file (Path): The database file (shard) to validate.
         Returns:
-            bool: True if an existing 'meta' table was found and validated.
+            bool: True if an existing 'meta' table was found and validated, False if the index is empty.
         """
         conn: Optional[sqlite3.Connection] = None
         try:
-            conn = self._get_sql_connection()
+            conn = self._get_sql_connection(db_file=db_file)
             cursor = conn.cursor()
             now = datetime.now(UTC)
             one_year_ago = now - timedelta(days=365)
@@ -486,16 +1610,26 @@ class CoreXRayDB(CoreModuleInterface):
                 raise RuntimeError(
                     f"'meta' table has an unsupported db_version '{existing_db_version}', expected '{self._db_version}'")
 
+            # The storage layout is fixed at creation time, a different configured mode requires a rebuild
+            existing_storage_mode = self._db_meta_data.get("storage_mode", "plain")
+            if existing_storage_mode != self._db_storage_mode:
+                raise RuntimeError(
+                    f"'meta' table storage mode '{existing_storage_mode}' differs from '{self._db_storage_mode}'")
+            existing_codec = self._db_meta_data.get("storage_codec", self._db_compression_codec)
+            if self._db_storage_mode == "compressed" and existing_codec != self._db_compression_codec:
+                raise RuntimeError(
+                    f"'meta' table compression codec '{existing_codec}' differs from '{self._db_compression_codec}'")
+
             # Validate the last indexing date as ISO string from meta table when we have it.
             raw_date: Optional[str] = self._db_meta_data.get("db_last_indexed_date", None)
             if raw_date is not None:
-                self._db_last_indexed_date = None
-                self._db_last_indexed_age_days = None
                 if isinstance(raw_date, str):
                     try:
                         parsed_date = datetime.fromisoformat(raw_date)
                         if parsed_date.tzinfo is None:
                             parsed_date = parsed_date.replace(tzinfo=UTC)  # assume UTC if not present
+                        if self._db_last_indexed_date is not None and self._db_last_indexed_date < parsed_date:
+                            parsed_date = self._db_last_indexed_date  # Another shard is older
                         self._db_last_indexed_date = parsed_date
                         self._db_last_indexed_age_days = (datetime.now(UTC) - parsed_date).days
                         self._logger.debug(f"Database was last indexed {self._db_last_indexed_age_days} days ago")
@@ -509,11 +1643,12 @@ class CoreXRayDB(CoreModuleInterface):
 
             # Get current records (indexed files) count in the 'files' table
             cursor.execute("SELECT COUNT(*) FROM files")
-            self._db_row_count = cursor.fetchone()[0]
-            self._logger.debug(f"DB row count in 'files': {self._db_row_count}")
-            if not self._db_row_count:
-                self._logger.warning(f"Empty 'files', forcing clean slate")
-                self._clean_slate = True
+            row_count = cursor.fetchone()[0]
+            self._db_row_count += row_count
+            self._logger.debug(f"DB row count in 'files': {row_count}")
+            if not row_count:
+                self._logger.warning(f"Empty 'files' in '{db_file.name}', forcing clean slate")
+                return False
 
             return True
 
@@ -523,16 +1658,17 @@ class CoreXRayDB(CoreModuleInterface):
             if conn:
                 conn.close()
 
-    def _update_meta_table(self, clean_slate: bool = False):
+    def _update_meta_table(self, clean_slate: bool = False, db_file: Optional[Path] = None):
         """
         Updates or optionally creates from scratch the persistent 'meta' table.
         Args:
             clean_slate (bool): If True, remove all metadata and insert fresh values.
                                 If False, only update the 'db_last_indexed_date' field.
+            db_file (Optional[Path]): The database file (shard) to update, defaults to the single database file.
         """
         conn: Optional[sqlite3.Connection] = None
         try:
-            conn = self._get_sql_connection()
+            conn = self._get_sql_connection(db_file=db_file)
             cursor = conn.cursor()
             now = datetime.now(UTC).isoformat()
 
@@ -556,7 +1692,9 @@ class CoreXRayDB(CoreModuleInterface):
                 ("host_name", platform.node()),
                 ("platform", platform.platform()),
                 ("xray_version", platform.python_version()),
-                ("auto_forge_version", self.auto_forge.version)
+                ("auto_forge_version", self.auto_forge.version),
+                ("storage_mode", self._db_storage_mode),
+                ("storage_codec", self._db_compression_codec)
             ]
 
             cursor.executemany(
@@ -584,6 +1722,8 @@ class CoreXRayDB(CoreModuleInterface):
         - Replaces tabs with 4 spaces
         - Collapses internal repeated spaces/tabs
         - Removes trailing empty lines
+        The whole buffer is processed by a few precompiled regex passes rather than line by line,
+        the output is identical to the former per-line implementation.
         Args:
             text (str): Input decoded file content.
         Returns:
@@ -597,24 +1737,319 @@ class CoreXRayDB(CoreModuleInterface):
             if text.startswith('\ufeff'):
                 text = text.lstrip('\ufeff')
 
-            text = text.replace('\r\n', '\n').replace('\n\r', '\n').replace('\r', '\n')
+            text = text.replace('\r\n', '\n').replace('\n\r', '\n').replace('\r', '\n').replace('\t', '    ')
 
-            lines = []
-            for line in text.split('\n'):
-                line = line.rstrip(" \t\v\f")
-                line = line.replace('\t', '    ')
+            # Strip trailing whitespace, a newline is appended so that the last line is handled as well
+            text = _XRAY_TRAILING_WS_RE.sub('\n', text + '\n')
 
-                # Collapse internal whitespace (but preserve leading indent)
-                line = re.sub(r'(?<=\S)[ \t]+(?=\S)', ' ', line)
-                lines.append(line)
+            # Collapse internal whitespace (but preserve leading indent)
+            text = _XRAY_INNER_WS_RE.sub(' ', text)
 
-            while lines and not lines[-1].strip():
-                lines.pop()
+            # Drop trailing empty lines: cut at the end of the line holding the last non-whitespace character
+            content_end = len(text.rstrip())
+            if not content_end:
+                return None
 
-            return '\n'.join(lines) if lines else None
+            return text[:text.find('\n', content_end)]
 
         return None  # Error
 
+    def _is_skipped_name(self, name: str) -> bool:
+        """ Returns True for hidden names and names listed in 'db_non_indexed_path_patterns' """
+        return name.startswith(".") or name in self._db_non_indexed_path_patterns
+
+    def _is_skipped_dir(self, dir_str: str) -> bool:
+        """
+        Directory level skip decision, cached so it is evaluated once per directory. A directory is skipped if
+        any of its parts below the managed root is hidden or non-indexed, or if everything below it is covered
+        by the excluded path patterns.
+        Args:
+            dir_str (str): The directory to evaluate.
+        Returns:
+            bool: True if the directory and everything below it should be skipped.
+        """
+        cached = self._skip_dir_cache.get(dir_str)
+        if cached is None:
+            relative = dir_str
+            for root in self._managed_paths or []:
+                root_str = str(root)
+                if dir_str == root_str or dir_str.startswith(root_str.rstrip(os.sep) + os.sep):
+                    relative = dir_str[len(root_str):]
+                    break
+
+            cached = (any(self._is_skipped_name(part) for part in relative.split(os.sep) if part)
+                      or self._exclusion_matcher.matches_dir(dir_str))
+            self._skip_dir_cache[dir_str] = cached
+        return cached
+
+    def _should_skip_path(self, path: Path) -> bool:
+        """
+        Determine if a file should be skipped during indexing, skips if:
+        - Any part below the managed root starts with '.' (hidden files/dirs)
+        - Any part below the managed root matches `self._non_indexed_path_patterns`
+        - Full path matches any pattern in `self._excluded_paths`
+        Args:
+            path (Path): The path to evaluate.
+        Returns:
+            bool: True if the path should be skipped, False otherwise.
+        """
+        if self._is_skipped_dir(os.path.dirname(path)) or self._is_skipped_name(path.name):
+            return True
+
+        # Check against excluded path patterns
+        return self._is_excluded_path(str(path))
+
+    def _is_excluded_path(self, path_str: str) -> bool:
+        """
+        Check a full path against the solution 'xray_excluded_path' patterns.
+        Args:
+            path_str (str): The path to evaluate.
+        Returns:
+            bool: True if the path matches any of the excluded patterns.
+        """
+        if self._exclusion_matcher.matches_file(path_str):
+            if self._db_extra_log_verbosity:
+                self._logger.warning(f"Skipping '{path_str}' due to excluded paths rule")
+            return True
+
+        return False
+
+    def _is_indexed_file_type(self, file_name: str) -> bool:
+        """ Returns True when the file name or its extension is listed in 'db_indexed_file_types' """
+        indexed_items = self._db_indexed_file_types or []
+        return file_name in indexed_items or os.path.splitext(file_name)[1][1:] in indexed_items
+
+    def _scan_managed_path(self, root: Path, file_queue: Queue) -> int:
+        """
+        Enumerate indexable files under a managed root using os.scandir().
+        Hidden, 'db_non_indexed_path_patterns' and excluded directories are pruned before descending into them, and
+        files are queued as soon as they are found so readers can start while enumeration is still running.
+        Args:
+            root (Path): Managed root to enumerate.
+            file_queue (Queue): Readers input queue.
+        Returns:
+            int: Number of files added to the queue.
+        """
+        count: int = 0
+        non_indexed_names = set(self._db_non_indexed_path_patterns)
+        pending_dirs: list[str] = [str(root)]
+        exclusion_matcher = self._exclusion_matcher
+
+        while pending_dirs:
+            dir_path = pending_dirs.pop()
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name.startswith(".") or name in non_indexed_names:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            # Prune directories entirely covered by the excluded path patterns
+                            if not exclusion_matcher.matches_dir(entry.path):
+                                pending_dirs.append(entry.path)
+                        elif (entry.is_file() and self._is_indexed_file_type(name)
+                              and not self._is_excluded_path(entry.path)):
+                            file_queue.put(Path(entry.path))
+                            count += 1
+            except OSError as scan_error:
+                self._logger.warning(f"File traversal failed for '{dir_path}': {scan_error}")
+
+        return count
+
+    def _is_indexed_file_size(self, file: Path, stat: os.stat_result) -> bool:
+        """
+        Check the file size against the configured indexing limits.
+        Args:
+            file (Path): The file to evaluate.
+            stat (os.stat_result): The file's stat() result.
+        Returns:
+            bool: True if the file size is within the allowed range, False otherwise.
+        """
+        size_kb = stat.st_size / 1024
+        if self._db_min_indexed_file_size_bytes <= stat.st_size and size_kb <= self._db_max_indexed_file_size_kb:
+            return True
+
+        if self._db_extra_log_verbosity:
+            if any(_pattern.match(file.name) for _pattern in self._compiled_non_indexed_files_patterns):
+                self._logger.warning(f"Skipping due to excluded path pattern: '{file.name}'")
+            else:
+                self._logger.warning(f"Skipping bad file size: '{file.name}' ({size_kb:.1f} KB)")
+        return False
+
+    def _read_file_record(self, file: Path, stat: os.stat_result) -> Optional[tuple]:
+        """
+        Read, optionally purify and checksum a single file.
+        Args:
+            file (Path): The file to read.
+            stat (os.stat_result): The file's stat() result.
+        Returns:
+            Optional[tuple]: (path, content, mtime, size, inode, checksum, ext, base, symbols, includes, minhash,
+                fingerprints) or None if the file should not be indexed. Read errors are propagated to the caller.
+        """
+        result = _read_source_file(str(file), self._db_filter_files_content, self._db_index_symbols,
+                                   self._db_index_similarity, self._db_index_fingerprints)
+        if result is None:
+            if self._db_extra_log_verbosity:
+                self._logger.warning(f"Skipping empty or invalid file '{file.name}' from '{str(file)}'")
+            return None
+
+        return (str(file), result[0], stat.st_mtime, stat.st_size, stat.st_ino, *result[1:])
+
+    def _write_records(self, conn: sqlite3.Connection, records: list[tuple]) -> None:
+        """
+        Insert or replace a batch of indexed files, the caller is responsible for committing.
+        Args:
+            conn (sqlite3.Connection): Writable connection.
+            records (list[tuple]): (path, content, mtime, size, inode, checksum, ext, base, symbols, includes,
+                minhash, fingerprints) tuples.
+        """
+        if self._db_storage_mode == "compressed":
+            # Store the compressed content once, and feed the external-content index with the plain text
+            for record in records:
+                content_id = _content_id(record[5])
+                cursor = conn.execute("INSERT OR IGNORE INTO content_blobs (id, data) VALUES (?, ?)",
+                                      (content_id, self._compress_content(record[1])))
+                if cursor.rowcount == 1:
+                    conn.execute("INSERT INTO contents (rowid, content) VALUES (?, ?)", (content_id, record[1]))
+
+        elif self._db_storage_mode == "dedup":
+            # Store the content once, files sharing a checksum only add a 'file_meta' row
+            conn.executemany("""
+                INSERT INTO contents (rowid, content)
+                SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM contents WHERE rowid = ?)
+            """, [(_content_id(r[5]), r[1], _content_id(r[5])) for r in records])
+        else:
+            conn.executemany("""
+                INSERT OR REPLACE INTO files (rowid, path, content)
+                VALUES (?, ?, ?)
+            """, [(_path_id(r[0]), r[0], r[1]) for r in records])
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO file_meta (path, modified, size, inode, checksum, content_id, ext, base)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(r[0], r[2], r[3], r[4], r[5], _content_id(r[5]), r[6], r[7]) for r in records])
+
+        # Symbols are kept per path, replaced as a whole whenever the file content changes
+        conn.executemany("DELETE FROM symbols WHERE path = ?", [(r[0],) for r in records])
+        conn.executemany("""
+            INSERT INTO symbols (name, kind, path, line, signature)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(name, kind, r[0], line, signature) for r in records if r[8] for name, kind, line, signature in r[8]])
+
+        # Include directives, 'resolved_path' is filled by _resolve_includes() once all files are known
+        conn.executemany("DELETE FROM includes WHERE src = ?", [(r[0],) for r in records])
+        conn.executemany("""
+            INSERT INTO includes (src, target, resolved_path, line)
+            VALUES (?, ?, NULL, ?)
+        """, [(r[0], target, line) for r in records if r[9] for target, line in r[9]])
+
+        # Near-duplicate detection, the signature and its LSH buckets
+        conn.executemany("DELETE FROM minhash WHERE path = ?", [(r[0],) for r in records])
+        conn.executemany("DELETE FROM lsh_buckets WHERE path = ?", [(r[0],) for r in records])
+        conn.executemany("INSERT INTO minhash (path, signature) VALUES (?, ?)",
+                         [(r[0], r[10]) for r in records if r[10]])
+        conn.executemany("INSERT INTO lsh_buckets (band, bucket, path) VALUES (?, ?, ?)",
+                         [(band, bucket, r[0]) for r in records if r[10] for band, bucket in _lsh_buckets(r[10])])
+
+        # Block-level copy-paste detection
+        conn.executemany("DELETE FROM fingerprints WHERE path = ?", [(r[0],) for r in records])
+        conn.executemany("INSERT INTO fingerprints (hash, path, line_start, line_end) VALUES (?, ?, ?, ?)",
+                         [(fp_hash, r[0], line_start, line_end) for r in records if r[11]
+                          for fp_hash, line_start, line_end in r[11]])
+
+    def _delete_records(self, conn: sqlite3.Connection, paths: list[str]) -> None:
+        """
+        Remove indexed files from the database, the caller is responsible for committing.
+        Args:
+            conn (sqlite3.Connection): Writable connection.
+            paths (list[str]): Paths to remove.
+        """
+        for i in range(0, len(paths), XRAY_BATCH_SIZE):
+            batch = paths[i:i + XRAY_BATCH_SIZE]
+            if self._db_storage_mode == "plain":
+                conn.executemany("DELETE FROM files WHERE rowid = ?", [(_path_id(p),) for p in batch])
+            conn.executemany("DELETE FROM file_meta WHERE path = ?", [(p,) for p in batch])
+            conn.executemany("DELETE FROM symbols WHERE path = ?", [(p,) for p in batch])
+            conn.executemany("DELETE FROM includes WHERE src = ?", [(p,) for p in batch])
+            conn.executemany("DELETE FROM minhash WHERE path = ?", [(p,) for p in batch])
+            conn.executemany("DELETE FROM lsh_buckets WHERE path = ?", [(p,) for p in batch])
+            conn.executemany("DELETE FROM fingerprints WHERE path = ?", [(p,) for p in batch])
+
+    def _delete_orphan_contents(self, conn: sqlite3.Connection) -> int:
+        """
+        Remove 'contents' rows no longer referenced by any file ('dedup' and 'compressed' storage modes),
+        the caller is responsible for committing.
+        Returns:
+            int: Number of removed rows.
+        """
+        if self._db_storage_mode == "compressed":
+            # External-content index entries must be deleted with the original text before the blob goes away
+            orphans = conn.execute("""
+                SELECT id, data FROM content_blobs
+                WHERE id NOT IN (SELECT content_id FROM file_meta WHERE content_id IS NOT NULL)
+            """).fetchall()
+            for content_id, data in orphans:
+                conn.execute("INSERT INTO contents (contents, rowid, content) VALUES ('delete', ?, ?)",
+                             (content_id, self._decompress_content(data)))
+                conn.execute("DELETE FROM content_blobs WHERE id = ?", (content_id,))
+            return len(orphans)
+
+        if self._db_storage_mode != "dedup":
+            return 0
+        cursor = conn.execute("""
+            DELETE FROM contents
+            WHERE rowid NOT IN (SELECT content_id FROM file_meta WHERE content_id IS NOT NULL)
+        """)
+        return max(cursor.rowcount, 0)
+
+    def _load_indexed_names(self) -> dict[str, list[str]]:
+        """ Map file names to the indexed paths carrying them, across all shards """
+        by_name: dict[str, list[str]] = {}
+        for db_file in self._db_files:
+            conn = self._get_sql_connection(read_only=True, db_file=db_file)
+            try:
+                for path, base in conn.execute("SELECT path, base FROM file_meta"):
+                    by_name.setdefault(base, []).append(path)
+            finally:
+                conn.close()
+        return by_name
+
+    def _resolve_includes(self, conn: sqlite3.Connection, by_name: Optional[dict[str, list[str]]] = None) -> int:
+        """
+        Resolve 'includes' targets to indexed files, the caller is responsible for committing.
+        A target is first looked up relative to the including file's directory, then among all indexed files whose
+        path ends with the target, preferring the candidate sharing the longest directory prefix with the includer.
+        Only rows whose resolution changed are updated, so repeated incremental passes are cheap.
+        Args:
+            conn (sqlite3.Connection): Writable connection.
+            by_name (Optional[dict[str, list[str]]]): Indexed paths per file name, see _load_indexed_names().
+                Required when sharding is enabled since targets may live in another shard, when omitted the
+                files indexed in 'conn' are used.
+        Returns:
+            int: Number of updated rows.
+        """
+        if by_name is None:
+            by_name = {}
+            for path, base in conn.execute("SELECT path, base FROM file_meta"):
+                by_name.setdefault(base, []).append(path)
+        indexed_paths = {path for paths in by_name.values() for path in paths}
+
+        updates: list[tuple[Optional[str], int]] = []
+        for rowid, src, target, resolved_path in conn.execute(
+                "SELECT rowid, src, target, resolved_path FROM includes").fetchall():
+            src_dir = os.path.dirname(src)
+            resolved: Optional[str] = os.path.normpath(os.path.join(src_dir, target))
+            if resolved not in indexed_paths:
+                suffix = os.sep + os.path.normpath(target).lstrip(os.sep)
+                candidates = [path for path in by_name.get(os.path.basename(target), ()) if path.endswith(suffix)]
+                resolved = max(candidates, key=lambda _path: (len(os.path.commonpath([_path, src_dir])), _path),
+                               default=None)
+            if resolved != resolved_path:
+                updates.append((resolved, rowid))
+
+        conn.executemany("UPDATE includes SET resolved_path = ? WHERE rowid = ?", updates)
+        return len(updates)
+
     def _perform_indexing(self) -> Optional[bool]:
         """
         Perform multithreaded indexing of managed file paths into a SQLite database.
@@ -625,16 +2060,26 @@ class CoreXRayDB(CoreModuleInterface):
         Key Features:
         - Uses multiple threads to read files concurrently for improved performance.
         - Employs a dedicated writer thread to avoid SQLite concurrency issues.
+        - Managed paths are enumerated in parallel with os.scandir(), hidden and ignored directories are
+          pruned before descending, and readers consume files while enumeration is still running.
         - Files are skipped if they are hidden or match predefined ignore patterns.
         - Files larger than a configurable threshold are skipped (with optional quiet pattern filtering).
+        - Files whose mtime, size and inode match 'file_meta' are skipped without being read.
         - Supports checksum-based change detection to avoid unnecessary re-indexing.
 
+        When 'db_reader_backend' is set to 'processes', reader threads only perform the cheap stat() based
+        filtering and hand batches of paths to a process pool, which reads, purifies and checksums them
+        outside the GIL. Results are streamed back to the same single writer thread.
+
+        When 'db_shard_by_path' is enabled every shard gets its own writer thread and connection, so managed
+        paths are written in parallel. A refresh limited to some managed paths (see refresh()) only preloads,
+        writes, compacts and checkpoints their shards, the others are merely re-resolved for include directives.
+
         Note: Ensure that 'BATCH_SIZE' and 'NUM_READERS' are tuned to the system capacity.
             Extremely high values may lead to memory exhaustion or database contention.
         """
 
         file_queue = Queue()
-        result_queue = Queue()
         count_lock = Lock()
         conn: Optional[sqlite3.Connection] = None
         total_processed: int = 0
@@ -642,61 +2087,29 @@ class CoreXRayDB(CoreModuleInterface):
         write_stats: _XRayStats = _XRayStats()
         indexing_start_time: float = time.time()
         last_log_time = indexing_start_time
-        paths = list(self._managed_paths or [])
-        meta_lookup = {}
-        seen_paths = set()
-        indexed_items = list(self._db_indexed_file_types or [])
-
-        def _should_skip_path(_path: Path) -> bool:
+        paths = list(self._refresh_roots or self._managed_paths or [])
+        path_prefixes = tuple(str(path).rstrip(os.sep) + os.sep for path in paths)
+        shard_files = list(dict.fromkeys(db_file for prefix, db_file in reversed(self._db_shard_roots)
+                                         if prefix.startswith(path_prefixes)))
+        result_queues: dict[Path, Queue] = {db_file: Queue() for db_file in shard_files}
+        meta_lookup: _XRayPathTable = _XRayPathTable()
+        process_pool: Optional[ProcessPoolExecutor] = None
+        future_queue: Queue = Queue()
+        queued_files: int = 0
+
+        def _route(_record: tuple):
+            """ Hand a reader result to the writer of the shard indexing its path """
+            result_queues[self._shard_of(_record[0])].put(_record)
+
+        def _walker_worker(_root: Path):
             """
-            Determine if a path should be skipped during indexing, skips if:
-            - Any part starts with '.' (hidden files/dirs)
-            - Any part matches `self._non_indexed_path_patterns`
-            - Full path matches any pattern in `self._excluded_paths`
-            Args:
-                _path (Path): The path to evaluate.
-            Returns:
-                bool: True if the path should be skipped, False otherwise.
+            Thread worker that enumerates a single managed path into the readers queue.
             """
-            # Check hidden parts and known non-indexed path names
-            if any(
-                    _part.startswith(".") or _part in self._db_non_indexed_path_patterns
-                    for _part in _path.parts
-            ):
-                return True
-
-            # Check against excluded path patterns
-            if self._solution_excluded_paths:
-                _path_str = str(_path)
-                if any(fnmatch(_path_str, pattern) for pattern in self._solution_excluded_paths):
-                    if self._db_extra_log_verbosity:
-                        self._logger.warning(f"Skipping '{_path_str}' due to excluded paths rule")
-                    return True
-
-            return False
-
-        def _add_files_to_queue() -> int:
-            """
-            Traverse configured paths and enqueue files that pass initial filters.
-            Returns:
-                int: Number of files added to the queue.
-            """
-
-            def _matches(_file: Path, _indexed_items: list[str]) -> bool:
-                """ Regex callback implementation """
-                return _file.name in _indexed_items or _file.suffix.lstrip(".") in _indexed_items
-
-            count = 0
-            try:
-                for path in paths:
-                    for file in path.rglob("*"):
-                        if file.is_file() and _matches(file, indexed_items) and not _should_skip_path(file):
-                            file_queue.put(file)
-                            count += 1
-            except Exception as e:
-                self._logger.warning(f"File traversal failed: {e}")
-
-            return count
+            nonlocal queued_files
+            _count = self._scan_managed_path(_root, file_queue)
+            with count_lock:
+                queued_files += _count
+                self._index_progress.queued = queued_files
 
         def _log_stats(_summarize: bool = False):
             """
@@ -750,88 +2163,98 @@ class CoreXRayDB(CoreModuleInterface):
             Determine and remove stale entries — present in DB but not indexed in this run.
             Only applies in non-clean-slate mode.
             """
-            nonlocal meta_lookup, seen_paths
-            _conn: Optional[sqlite3.Connection] = None
+            nonlocal meta_lookup
 
             if self._clean_slate:
                 return  # Nothing to compact when starting from scratch
 
-            db_paths = set(meta_lookup.keys())
-            stale_paths = db_paths - seen_paths
-
-            if not stale_paths:
+            stale_paths = list(meta_lookup.unseen_paths())
+            if stale_paths:
+                self._logger.debug(f"Removing {len(stale_paths)} stale entries from the DB")
+            else:
                 self._logger.info(f"DB is synchronized")
-                return  # Nothing to remove
 
-            self._logger.debug(f"Removing {len(stale_paths)} stale entries from the DB")
+            stale_by_shard: dict[Path, list[str]] = {}
+            for _path in stale_paths:
+                stale_by_shard.setdefault(self._shard_of(_path), []).append(_path)
 
-            try:
-                _conn = self._get_sql_connection()
-                stale_list = list(stale_paths)
-                for i in range(0, len(stale_list), XRAY_BATCH_SIZE):
-                    batch = stale_list[i:i + XRAY_BATCH_SIZE]
-                    _conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in batch])
-                    _conn.executemany("DELETE FROM file_meta WHERE path = ?", [(p,) for p in batch])
-                _conn.commit()
-
-            except Exception as cleanup_error:
-                self._logger.error(f"Failed to delete stale entries: {cleanup_error}")
-                _conn.rollback()
-            finally:
-                if _conn:
-                    _conn.close()
+            for _db_file in shard_files:
+                _conn: Optional[sqlite3.Connection] = None
+                try:
+                    _conn = self._get_sql_connection(db_file=_db_file)
+                    _stale = stale_by_shard.get(_db_file)
+                    if _stale:
+                        self._delete_records(_conn, _stale)
+                        self._db_row_count = max(0, self._db_row_count - len(_stale))
+
+                    # Changed and removed files may leave unreferenced shared contents behind
+                    _orphans = self._delete_orphan_contents(_conn)
+                    if _orphans:
+                        self._logger.debug(f"Removed {_orphans} unreferenced contents")
+                    _conn.commit()
+
+                except Exception as cleanup_error:
+                    self._logger.error(f"Failed to delete stale entries: {cleanup_error}")
+                    if _conn:
+                        _conn.rollback()
+                finally:
+                    if _conn:
+                        _conn.close()
 
         def _reader_worker():
             """
             Thread worker that reads and optionally purifies file content from the queue.
             - Skips large, binary, or excluded files.
+            - Skips reading files whose stat() metadata matches the preloaded 'file_meta' record.
             - Computes checksum.
             - Passes valid results to the writer queue.
             """
             nonlocal read_stats
             read_stats.start_time = time.time()
-            _compiled_non_indexed_files_patterns = [re.compile(p) for p in self._db_non_indexed_file_patterns]
+            _pending_batch: list[tuple[str, float, int, int]] = []
+
+            def _submit_batch():
+                """ Hand the pending paths to the process pool """
+                _future = process_pool.submit(_read_source_files_batch, list(_pending_batch),
+                                              self._db_filter_files_content, self._db_index_symbols,
+                                              self._db_index_similarity, self._db_index_fingerprints)
+                future_queue.put(_future)
+                _pending_batch.clear()
 
             while True:
                 _file = file_queue.get()
                 if _file is None:
+                    if _pending_batch:
+                        _submit_batch()
                     break
                 try:
                     _stat = _file.stat()
-                    _size_kb = _stat.st_size / 1024
-                    if (_stat.st_size < self._db_min_indexed_file_size_bytes) or (
-                            _size_kb > self._db_max_indexed_file_size_kb):
-                        if any(_pattern.match(_file.name) for _pattern in _compiled_non_indexed_files_patterns):
-                            if self._db_extra_log_verbosity:
-                                self._logger.warning(f"Skipping due to excluded path pattern: '{_file.name}'")
-                            read_stats.skipped += 1
-                            continue
+                    if not self._is_indexed_file_size(_file, _stat):
                         read_stats.skipped += 1
-                        if self._db_extra_log_verbosity:
-                            self._logger.warning(f"Skipping bad file size: '{_file.name}' ({_size_kb:.1f} KB)")
                         continue
 
-                    _content = _file.read_text(encoding='utf-8', errors='ignore')
-                    if self._db_filter_files_content:
-                        _content = self._filter_file_content(_content)
-
-                    if _content is None:
-                        read_stats.skipped += 1
-                        if self._db_extra_log_verbosity:
-                            self._logger.warning(f"Skipping empty or invalid file '{_file.name}' from '{str(_file)}'")
+                    # Fast path: metadata did not change since the last indexing, no need to read the file.
+                    # A content-less item is still sent so the writer accounts for it.
+                    _path_str = str(_file)
+                    _index = meta_lookup.find(_path_str)
+                    if _index >= 0 and meta_lookup.stat_matches(_index, _stat.st_mtime, _stat.st_size, _stat.st_ino):
+                        meta_lookup.mark_seen(_index)
+                        _route((_path_str, None, _stat.st_mtime, _stat.st_size, _stat.st_ino, None))
                         continue
 
-                    _checksum = hashlib.blake2b(_content.encode('utf-8'), digest_size=8).hexdigest()
+                    if process_pool is not None:
+                        _pending_batch.append((_path_str, _stat.st_mtime, _stat.st_size, _stat.st_ino))
+                        if len(_pending_batch) >= XRAY_READER_BATCH_SIZE:
+                            _submit_batch()
+                        continue
 
-                    # Get file extension
-                    _file_ext = _file.suffix
-                    if _file_ext:
-                        _file_ext = _file_ext[1:].lower()  # remove dot and lowercase
-                    else:
-                        _file_ext = _file.name.lower()  # fallback to full name like "makefile"
+                    _record = self._read_file_record(_file, _stat)
+                    if _record is None:
+                        read_stats.skipped += 1
+                        continue
 
                     # Add the queue
-                    result_queue.put((str(_file), _content, _stat.st_mtime, _checksum, _file_ext, _file.name))
+                    _route(_record)
                     read_stats.processed += 1
 
                 except Exception as reader_error:
@@ -840,35 +2263,74 @@ class CoreXRayDB(CoreModuleInterface):
                 finally:
                     file_queue.task_done()
 
-        def _writer_worker():
+        def _forwarder_worker():
+            """
+            Thread worker that streams process pool batch results to the writer queue in submission order.
+            """
+            nonlocal read_stats
+            while True:
+                _future: Optional[Future] = future_queue.get()
+                if _future is None:
+                    break
+                try:
+                    _records, _skipped, _errors = _future.result()
+                    for _record in _records:
+                        _route(_record)
+                    with count_lock:
+                        read_stats.processed += len(_records)
+                        read_stats.skipped += _skipped
+                        read_stats.errors += len(_errors)
+                    for _error in _errors:
+                        self._logger.error(_error)
+                except Exception as _batch_error:
+                    self._logger.error(f"Reader process failed: {_batch_error}")
+
+        def _writer_worker(_db_file: Path, _result_queue: Queue):
             """
-            Thread worker that consumes parsed file data and writes it to the SQLite index.
-            - Skips unchanged files based on checksum.
-            - Commits batched inserts.
+            Thread worker that consumes parsed file data and writes it to the SQLite index (one writer per shard).
+            - Skips unchanged files based on stat() metadata or checksum.
+            - Refreshes only the metadata of files that were touched but whose content did not change.
+            - Groups all statements into a single transaction which is committed every 'db_writer_commit_rows'
+              rows or 'db_writer_commit_seconds' seconds, whichever comes first.
+            - Keeps the 'files' row count incrementally and records per-batch commit latency.
             - Updates statistics.
             """
-            nonlocal conn, write_stats, meta_lookup, seen_paths
+            nonlocal write_stats, meta_lookup
 
+            _conn: Optional[sqlite3.Connection] = None
             _batch = []
-            _meta_batch = []
             _path = "<unknown>"
+            _pending_rows: int = 0  # Rows (inserts and metadata updates) in the open transaction
+            _new_rows: int = 0  # Inserted paths which were not previously indexed
+            _last_commit_time = time.monotonic()
+
+            def _flush():
+                """ Write pending records and commit the open transaction """
+                nonlocal _pending_rows, _new_rows, _last_commit_time
+                _start = time.perf_counter()
+                try:
+                    if _batch:
+                        self._write_records(_conn, _batch)
+                    _conn.commit()
+                    with count_lock:
+                        self._db_row_count += _new_rows
+                        if _pending_rows:
+                            self._writer_stats.add(rows=_pending_rows, latency=time.perf_counter() - _start)
+
+                except Exception as sql_error:
+                    self._logger.error(f"Batch insert failed at '{_path}': {sql_error}")
+                    _conn.rollback()
+                finally:
+                    _batch.clear()
+                    _pending_rows = _new_rows = 0
+                    _last_commit_time = time.monotonic()
 
             try:
                 write_stats.start_time = time.time()
-                conn = self._get_sql_connection()
-                conn.execute("BEGIN")
-
-                # Preload metadata table to allow skipping on index files which ware not changed
-                if not self._clean_slate:
-                    self._logger.debug(f"Preloading metadata..")
-                    meta_lookup = {
-                        row[0]: row[1]
-                        for row in conn.execute("SELECT path, checksum FROM file_meta")
-                    }
-                    self._logger.debug(f"Metadata preloaded size {len(meta_lookup)}")
+                _conn = self._get_sql_connection(db_file=_db_file)
 
                 while True:
-                    _item = result_queue.get()
+                    _item = _result_queue.get()
                     if _item is None:
                         self._logger.debug(f"Queue is empty, consumer thread stopped")
                         break
@@ -876,73 +2338,51 @@ class CoreXRayDB(CoreModuleInterface):
                     _log_stats()
 
                     try:
-                        _path, _content, _mtime, _checksum, _file_ext, _file_base = _item
-                        seen_paths.add(_path)
-
-                        # Skip unchanged files
-                        if not self._clean_slate:
-                            if _checksum == meta_lookup.get(_path):
-                                write_stats.skipped += 1
-                                continue
-
-                        _batch.append((_path, _content))
-                        _meta_batch.append((_path, _mtime, _checksum, _file_ext, _file_base))
-                        write_stats.processed += 1
-
-                        if len(_batch) >= XRAY_BATCH_SIZE:
-                            try:
-                                conn.executemany("""
-                                    INSERT OR REPLACE INTO files (path, content)
-                                    VALUES (?, ?)
-                                """, _batch)
-
-                                conn.executemany("""
-                                    INSERT OR REPLACE INTO file_meta (path, modified, checksum, ext, base)
-                                    VALUES (?, ?, ?, ?, ?)
-                                """, _meta_batch)
-
-                                conn.commit()
-                                _batch.clear()
-                                _meta_batch.clear()
-
-                            except Exception as sql_error:
-                                self._logger.error(f"Batch insert failed at '{_path}': {sql_error}")
-                                conn.rollback()
+                        _path, _content, _mtime, _size, _inode, _checksum = _item[:6]
+
+                        # Skip unchanged files, the reader already matched their stat() metadata
+                        if _content is None:
+                            write_stats.skipped += 1
+                            self._index_progress.unchanged += 1
+                            continue
+
+                        # Content is unchanged although the file was touched, refresh its metadata only
+                        _index = meta_lookup.find(_path)
+                        if _index >= 0:
+                            meta_lookup.mark_seen(_index)
+                        if _index >= 0 and meta_lookup.checksum_matches(_index, _checksum):
+                            _conn.execute("UPDATE file_meta SET modified = ?, size = ?, inode = ? WHERE path = ?",
+                                          (_mtime, _size, _inode, _path))
+                            write_stats.skipped += 1
+                            self._index_progress.unchanged += 1
+                            _pending_rows += 1
+                        else:
+                            _batch.append(_item)
+                            write_stats.processed += 1
+                            self._index_progress.changed += 1
+                            _pending_rows += 1
+                            if _index < 0:
+                                _new_rows += 1
+
+                        if (_pending_rows >= self._db_writer_commit_rows or
+                                time.monotonic() - _last_commit_time >= self._db_writer_commit_seconds):
+                            _flush()
 
                     except Exception as write_error:
                         self._logger.error(f"Failed to process '{os.path.basename(_path)}': {write_error}")
                         write_stats.errors += 1
+                        self._index_progress.errors += 1
                     finally:
-                        result_queue.task_done()
+                        _result_queue.task_done()
 
-                # Final flush
-                if _batch:
-                    try:
-                        conn.executemany("""
-                                    INSERT OR REPLACE INTO files (path, content)
-                                    VALUES (?, ?)
-                                """, _batch)
-                        conn.executemany("""
-                                    INSERT OR REPLACE INTO file_meta (path, modified, checksum, ext, base)
-                                    VALUES (?, ?, ?, ?, ?)
-                                """, _meta_batch)
-                        conn.commit()
-                        write_stats.processed += len(_batch)
-
-                        # Refresh current records (indexed files) count in the 'files' table post our indexing operation.
-                        self._db_row_count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
-                        self._logger.debug(f"DB row count in 'files': {self._db_row_count}")
-
-                    except Exception as sql_error:
-                        self._logger.error(f"Final batch insert failed: {sql_error}")
-                        conn.rollback()
+                # Final flush, the row count is maintained incrementally rather than recounted
+                _flush()
             finally:
-                if conn is not None:
-                    conn.close()
+                if _conn is not None:
+                    _conn.close()
                 _batch.clear()
-                _meta_batch.clear()
                 _log_stats(_summarize=True)
-                self._update_meta_table(clean_slate=False)
+                self._update_meta_table(clean_slate=False, db_file=_db_file)
 
         # ----------------------------------------------------------------------
         #
@@ -950,41 +2390,328 @@ class CoreXRayDB(CoreModuleInterface):
         #
         # ----------------------------------------------------------------------
 
-        self._logger.info(f"Starting background indexing, enumerating files ..")
-        queued_files = _add_files_to_queue()
-        if not queued_files:
-            self._logger.debug("No files matched indexing criteria — queue is empty.")
-            return True  # Nothing to do
+        # Preload metadata table to allow skipping files which ware not changed since the last indexing.
+        # Rows are split into directory and name and sorted by SQLite, as required by the compact path table.
+        # A partial refresh only considers the refreshed paths, so other paths are never seen as stale.
+        if not self._clean_slate:
+            self._logger.debug(f"Preloading metadata..")
+            try:
+                for db_file in shard_files:
+                    conn = self._get_sql_connection(read_only=True, db_file=db_file)
+                    conn.execute("PRAGMA temp_store = MEMORY")
+                    meta_lookup.extend(row for row in conn.execute("""
+                        SELECT substr(path, 1, length(path) - length(base) - 1) AS dir, base,
+                               modified, size, inode, checksum
+                        FROM file_meta ORDER BY dir, base
+                    """) if self._refresh_roots is None or (row[0] + os.sep).startswith(path_prefixes))
+                    conn.close()
+                    conn = None
+                self._logger.debug(f"Metadata preloaded size {len(meta_lookup)}")
+            except Exception as preload_error:
+                self._logger.warning(f"Failed to preload metadata, all files will be re-read: {preload_error}")
+                meta_lookup = _XRayPathTable()
+            finally:
+                if conn is not None:
+                    conn.close()
+                    conn = None
 
-        self._logger.debug(f"Found approximately {queued_files} files..")
+        self._logger.info(f"Starting background indexing, enumerating files ..")
+        self._index_progress.reset()
+        self._writer_stats.reset()
+        if self._clean_slate:
+            self._db_row_count = 0
         if self._db_filter_files_content:
             self._logger.debug("Indexed files will be normalized prior to indexing")
 
+        # Optional process pool, workers start from a forkserver since reader and writer threads are running
+        if self._db_reader_backend == "processes":
+            self._logger.debug(f"Using {self._db_reader_processes} reader processes")
+            process_pool = ProcessPoolExecutor(max_workers=self._db_reader_processes,
+                                               mp_context=_worker_process_context())
+
         # Create worker threads.
         readers = [Thread(target=_reader_worker, daemon=True, name="IndexerReader") for _ in range(XRAY_NUM_READERS)]
-        writer = Thread(target=_writer_worker, daemon=True, name="IndexerWriter")
+        writers = [Thread(target=_writer_worker, args=(db_file, result_queues[db_file]), daemon=True,
+                          name="IndexerWriter") for db_file in shard_files]
+        forwarder = Thread(target=_forwarder_worker, daemon=True, name="IndexerForwarder") if process_pool else None
 
         # Start all readers and writer thread
         for reader in readers:
             reader.start()
-        writer.start()
-
-        # Wait for all files to be processed
-        file_queue.join()
-        for _ in readers:
-            file_queue.put(None)
-        for r in readers:
-            r.join()
-
-        # Wait for the writer to complete
-        result_queue.join()
-        result_queue.put(None)
-        writer.join()
-
-        # Perform, database optimization
-        _compact()
+        for writer in writers:
+            writer.start()
+        if forwarder is not None:
+            forwarder.start()
+
+        # Enumerate all managed paths in parallel, readers are already consuming the queue
+        walkers = [Thread(target=_walker_worker, args=(path,), daemon=True, name="IndexerWalker") for path in paths]
+        for walker in walkers:
+            walker.start()
+
+        try:
+            for walker in walkers:
+                walker.join()
+            self._index_progress.enumerating = False
+            self._logger.debug(f"Found approximately {queued_files} files..")
+
+            # Wait for all files to be processed
+            file_queue.join()
+            for _ in readers:
+                file_queue.put(None)
+            for r in readers:
+                r.join()
+
+            # Wait for in-flight process pool batches to be forwarded to the writer
+            if forwarder is not None:
+                future_queue.put(None)
+                forwarder.join()
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown(wait=True)
+
+        # Wait for the writers to complete
+        for result_queue in result_queues.values():
+            result_queue.join()
+            result_queue.put(None)
+        for writer in writers:
+            writer.join()
+        self._logger.debug(f"DB row count in 'files': {self._db_row_count}")
+        self._logger.debug(f"Writer batches: {self._writer_stats.as_dict()}")
+
+        if not queued_files:
+            self._logger.debug("No files matched indexing criteria — queue is empty.")
+        else:
+            # Perform, database optimization
+            _compact()
+
+            # Map include directives to indexed files now that the full set of files is known, in every shard
+            # since directives may point into the refreshed paths.
+            try:
+                by_name = self._load_indexed_names() if self._db_sharded else None
+                for db_file in self._db_files:
+                    conn = self._get_sql_connection(db_file=db_file)
+                    self._logger.debug(f"Resolved {self._resolve_includes(conn, by_name)} include directives")
+                    conn.commit()
+                    conn.close()
+                    conn = None
+            except Exception as resolve_error:
+                self._logger.warning(f"Failed to resolve include directives: {resolve_error}")
+            finally:
+                if conn is not None:
+                    conn.close()
+                    conn = None
+
+        # Fold the WAL back into the main database file and truncate it
+        for db_file in shard_files:
+            try:
+                conn = self._get_sql_connection(db_file=db_file)
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except Exception as checkpoint_error:
+                self._logger.warning(f"WAL checkpoint failed: {checkpoint_error}")
+            finally:
+                if conn is not None:
+                    conn.close()
+                    conn = None
+
+        # Subsequent refreshes are incremental
+        self._clean_slate = False
+        self._refresh_roots = None
+        self._index_progress.active = False
+        self._index_progress.end_time = time.time()
+        return True
+
+    def _watch_tree(self, inotify: _XRayInotify, root: Path, pending: Optional[dict[str, bool]] = None) -> bool:
+        """
+        Recursively register inotify watches for a directory tree, pruning skipped directories.
+        Args:
+            inotify (_XRayInotify): The inotify instance.
+            root (Path): Directory to watch.
+            pending (Optional[dict[str, bool]]): When provided (a directory appeared after start-up),
+                indexable files found under it are marked for upsert.
+        Returns:
+            bool: False if the kernel watches limit was reached.
+        """
+        for dir_path, dir_names, file_names in os.walk(root):
+            if self._is_skipped_dir(dir_path):
+                dir_names.clear()
+                continue
+
+            if not inotify.add_watch(dir_path):
+                self._logger.warning(f"Unable to watch '{dir_path}', consider raising 'fs.inotify.max_user_watches'")
+                return False
+
+            if pending is not None:
+                for file_name in file_names:
+                    pending[os.path.join(dir_path, file_name)] = True
         return True
 
+    def _apply_watched_changes(self, pending: dict[str, bool]) -> None:
+        """
+        Push a small batch of watcher detected changes through the regular writer helpers.
+        Changes are committed per shard, include directives are then re-resolved in every shard.
+        Args:
+            pending (dict[str, bool]): Path to operation, True for upsert and False for delete.
+                Paths ending with a separator denote removed directories.
+        """
+        pending_by_shard: dict[Path, dict[str, bool]] = {}
+        for path_str, is_upsert in pending.items():
+            pending_by_shard.setdefault(self._shard_of(path_str), {})[path_str] = is_upsert
+
+        with self._db_write_lock:
+            changed: int = sum(self._apply_watched_shard_changes(db_file, shard_pending)
+                               for db_file, shard_pending in pending_by_shard.items())
+            if not changed:
+                return
+
+            conn: Optional[sqlite3.Connection] = None
+            try:
+                by_name = self._load_indexed_names() if self._db_sharded else None
+                for db_file in self._db_files:
+                    conn = self._get_sql_connection(db_file=db_file)
+                    self._resolve_includes(conn, by_name)
+                    conn.commit()
+                    conn.close()
+                    conn = None
+            except Exception as resolve_error:
+                self._logger.warning(f"Failed to resolve include directives: {resolve_error}")
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _apply_watched_shard_changes(self, db_file: Path, pending: dict[str, bool]) -> int:
+        """
+        Apply watcher detected changes belonging to a single shard in one transaction.
+        Args:
+            db_file (Path): The database file (shard) indexing the pending paths.
+            pending (dict[str, bool]): Path to operation, see _apply_watched_changes().
+        Returns:
+            int: Number of updated and removed files.
+        """
+        conn: Optional[sqlite3.Connection] = None
+        upserted: int = 0
+        new_rows: int = 0  # Upserted paths which were not indexed, after the removals
+        deleted: list[str] = []
+
+        try:
+            conn = self._get_sql_connection(db_file=db_file)
+            conn.execute("BEGIN")
+
+            # Removals go first, a directory removed and recreated within one debounce window keeps its new files
+            for path_str, is_upsert in pending.items():
+                if is_upsert:
+                    continue
+                if path_str.endswith(os.sep):
+                    deleted.extend(row[0] for row in conn.execute(
+                        "SELECT path FROM file_meta WHERE substr(path, 1, ?) = ?", (len(path_str), path_str)))
+                elif conn.execute("SELECT 1 FROM file_meta WHERE path = ?", (path_str,)).fetchone() is not None:
+                    deleted.append(path_str)
+            if deleted:
+                self._delete_records(conn, deleted)
+
+            for path_str, is_upsert in pending.items():
+                if not is_upsert:
+                    continue
+
+                file = Path(path_str)
+                if not self._is_indexed_file_type(file.name) or self._should_skip_path(file):
+                    continue
+                try:
+                    stat = file.stat()
+                    if not file.is_file() or not self._is_indexed_file_size(file, stat):
+                        continue
+
+                    record = self._read_file_record(file, stat)
+                    if record is None:
+                        continue
+                except OSError:
+                    continue  # Vanished before we got to it, a delete event will follow
+
+                path, _content, mtime, size, inode, checksum = record[:6]
+                row = conn.execute("SELECT checksum FROM file_meta WHERE path = ?", (path,)).fetchone()
+                if row is not None and row[0] == checksum:
+                    conn.execute("UPDATE file_meta SET modified = ?, size = ?, inode = ? WHERE path = ?",
+                                 (mtime, size, inode, path))
+                    continue
+
+                self._write_records(conn, [record])
+                upserted += 1
+                if row is None:
+                    new_rows += 1
+
+            if upserted or deleted:
+                self._delete_orphan_contents(conn)
+            conn.commit()
+            self._db_row_count = max(0, self._db_row_count + new_rows - len(deleted))
+
+            if upserted or deleted:
+                self._logger.debug(f"Watcher applied {upserted} updates and {len(deleted)} removals")
+            return upserted + len(deleted)
+
+        except Exception as watch_error:
+            self._logger.error(f"Failed to apply watched changes: {watch_error}")
+            if conn is not None:
+                conn.rollback()
+            return 0
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _watch(self) -> None:
+        """
+        Watcher thread: subscribes to inotify events under the managed paths and keeps the index current.
+        Events are debounced and applied only while the module is idle, changes that arrive during a full
+        indexing pass are applied once it completes. On event queue overflow, a full refresh is scheduled.
+        """
+        try:
+            inotify = _XRayInotify()
+        except Exception as inotify_error:
+            self._logger.warning(f"Live watcher is not available: {inotify_error}")
+            self._watcher_running = False
+            return
+
+        pending: dict[str, bool] = {}
+        last_event_time: float = 0.0
+
+        try:
+            for root in self._managed_paths or []:
+                if not self._watch_tree(inotify, root):
+                    break
+
+            self._logger.debug("Live watcher started")
+            while self._watcher_running:
+                for path_str, mask in inotify.read_events(timeout=0.5):
+                    last_event_time = time.time()
+
+                    if mask & _XRayInotify.IN_Q_OVERFLOW:
+                        self._logger.warning("Watcher events queue overflow, scheduling a full refresh")
+                        pending.clear()
+                        with suppress(RuntimeError):
+                            self.refresh()
+                        continue
+
+                    if mask & _XRayInotify.IN_ISDIR:
+                        if mask & (_XRayInotify.IN_CREATE | _XRayInotify.IN_MOVED_TO):
+                            self._watch_tree(inotify, Path(path_str), pending)
+                        elif mask & (_XRayInotify.IN_DELETE | _XRayInotify.IN_MOVED_FROM):
+                            pending[path_str.rstrip(os.sep) + os.sep] = False
+                        continue
+
+                    if mask & (_XRayInotify.IN_DELETE | _XRayInotify.IN_MOVED_FROM):
+                        pending[path_str] = False
+                    elif mask & (_XRayInotify.IN_CLOSE_WRITE | _XRayInotify.IN_MOVED_TO):
+                        pending[path_str] = True
+
+                if (pending and time.time() - last_event_time >= self._db_watch_debounce_sec
+                        and self._get_state() in (XRayStateType.IDLE, XRayStateType.DB_QUERY)):
+                    self._apply_watched_changes(pending)
+                    pending = {}
+
+        except Exception as watch_error:
+            self._logger.error(f"Live watcher error: {watch_error}")
+        finally:
+            inotify.close()
+            self._watcher_running = False
+
     def _monitor(self, *, force_clean_slate: Optional[bool] = False):
         """
         Internal monitoring thread responsible for managing the module state, including initialization,
@@ -1033,7 +2760,8 @@ class CoreXRayDB(CoreModuleInterface):
                         self._set_state(XRayStateType.DB_INDEXING)
                         self._tool_box.show_status(
                             message="XRayDB Refreshing indexes...", expire_after=2, erase_after=True)
-                        has_recently_indexed = self._perform_indexing()
+                        with self._db_write_lock:
+                            has_recently_indexed = self._perform_indexing()
 
                     if has_recently_indexed:
                         self._logger.info("Database initialized.")
@@ -1041,6 +2769,13 @@ class CoreXRayDB(CoreModuleInterface):
                             message="XRayDB is up and running.", expire_after=2, erase_after=True)
                         self._set_state(XRayStateType.IDLE)
 
+                        # Start the live watcher once, after the first successful indexing pass
+                        if self._db_watch_changes and not self._watcher_running:
+                            self._watcher_running = True
+                            self._watcher_thread = threading.Thread(target=self._watch, name="XRayWatcher",
+                                                                    daemon=True)
+                            self._watcher_thread.start()
+
                 # ------------------------------------------------------------------
                 # IDLE / DB_QUERY — No-op for now
                 # ------------------------------------------------------------------
@@ -1094,16 +2829,11 @@ class CoreXRayDB(CoreModuleInterface):
             Optional[str]: Result rows joined by newlines, or None on failure.
         """
 
-        conn: Optional[sqlite3.Connection] = None
-
-        # Safe conditional transition to query state
-        if self._set_state(new_state=XRayStateType.DB_QUERY,
-                           initial_state=XRayStateType.IDLE) != XRayStateType.DB_QUERY:
-            raise RuntimeError("Cannot execute query: DB not in IDLE state")
+        cursor: Optional[sqlite3.Cursor] = None
+        self._begin_query()
 
         try:
-            conn = self._get_sql_connection(read_only=True)
-            cursor = conn.cursor()
+            cursor = self._get_pooled_connection().cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
 
@@ -1116,10 +2846,10 @@ class CoreXRayDB(CoreModuleInterface):
             raise db_error from db_error
 
         finally:
-            if conn:
-                conn.close()
-            # Switch back to idle
-            self._set_state(new_state=XRayStateType.IDLE, initial_state=XRayStateType.DB_QUERY)
+            if cursor:
+                cursor.close()
+            # Switch back to idle once no other query is running
+            self._end_query()
 
     def query_raw(self, query: str, params: Optional[tuple[Any, ...]] = None, print_table: bool = False) -> Optional[
         list[tuple]]:
@@ -1132,16 +2862,11 @@ class CoreXRayDB(CoreModuleInterface):
         Returns:
             Optional[list[tuple]]: List of result tuples, or None if query fails.
         """
-        conn: Optional[sqlite3.Connection] = None
-
-        # Safe conditional transition to query state
-        if self._set_state(new_state=XRayStateType.DB_QUERY,
-                           initial_state=XRayStateType.IDLE) != XRayStateType.DB_QUERY:
-            raise RuntimeError("Cannot execute query: DB not in IDLE state")
+        cursor: Optional[sqlite3.Cursor] = None
+        self._begin_query()
 
         try:
-            conn = self._get_sql_connection(read_only=True)
-            cursor = conn.cursor()
+            cursor = self._get_pooled_connection().cursor()
 
             if params:
                 cursor.execute(query, params)
@@ -1167,25 +2892,507 @@ class CoreXRayDB(CoreModuleInterface):
             raise db_error from db_error
 
         finally:
-            if conn:
-                conn.close()
-            # Switch back to idle
-            self._set_state(new_state=XRayStateType.IDLE, initial_state=XRayStateType.DB_QUERY)
+            if cursor:
+                cursor.close()
+            # Switch back to idle once no other query is running
+            self._end_query()
 
-    def refresh(self) -> Optional[int]:
+    def _iter_pages(self, query: str, params: Optional[tuple[Any, ...]],
+                    page_size: int) -> Iterator[tuple[list[str], list[tuple]]]:
+        """
+        Execute a SQL query on the pooled connection and lazily yield (column names, rows) pages.
+        The reader registration is held until the generator is exhausted or closed.
+        """
+        cursor: Optional[sqlite3.Cursor] = None
+        self._begin_query()
+
+        try:
+            cursor = self._get_pooled_connection().cursor()
+            cursor.execute(query, params or ())
+            columns = [desc[0] for desc in cursor.description or ()]
+            while True:
+                rows = cursor.fetchmany(max(1, page_size))
+                if not rows:
+                    break
+                yield columns, rows
+
+        finally:
+            if cursor:
+                cursor.close()
+            self._end_query()
+
+    def iter_query(self, query: str, params: Optional[tuple[Any, ...]] = None,
+                   page_size: int = XRAY_QUERY_PAGE_SIZE) -> Iterator[list[tuple]]:
+        """
+        Execute a SQL query and lazily yield its result in pages, so the first rows are available immediately
+        and memory use is bounded by the page size rather than by the result size.
+        Note: The query keeps its read snapshot open until the generator is exhausted or closed, for long
+            interactive browsing prefer iter_keyset() which uses a short statement per page.
+        Args:
+            query (str): SQL query to run.
+            params (Optional[tuple]): Optional SQL parameters for safe substitution.
+            page_size (int): Maximum number of rows per yielded page.
+        Yields:
+            list[tuple]: Up to 'page_size' result rows.
+        """
+        pages = self._iter_pages(query, params, page_size)
+        try:
+            for _columns, rows in pages:
+                yield rows
+        finally:
+            pages.close()
+
+    def iter_keyset(self, table: str, columns: list[str], key_column: str = "path", where: Optional[str] = None,
+                    params: Optional[tuple[Any, ...]] = None, page_size: int = XRAY_QUERY_PAGE_SIZE,
+                    after: Optional[Any] = None) -> Iterator[list[tuple]]:
+        """
+        Keyset paginated scan, each page is a separate 'WHERE key > last ORDER BY key LIMIT n' statement, so no
+        snapshot is held between pages and resuming from a known key costs the same as starting over.
+        Args:
+            table (str): Table or view name, for example 'file_meta'.
+            columns (list[str]): Selected columns.
+            key_column (str): Unique, indexed ordering column, added to the selection when missing.
+            where (Optional[str]): Optional extra SQL filter, combined with AND.
+            params (Optional[tuple]): Parameters for the 'where' filter.
+            page_size (int): Maximum number of rows per yielded page.
+            after (Optional[Any]): Resume after this key value, None starts from the beginning.
+        Yields:
+            list[tuple]: Up to 'page_size' result rows, ordered by 'key_column'.
+        """
+        for identifier in [table, key_column, *columns]:
+            if not _XRAY_SQL_IDENTIFIER_RE.match(identifier):
+                raise ValueError(f"Invalid SQL identifier '{identifier}'")
+
+        selected = list(columns) if key_column in columns else [*columns, key_column]
+        key_index = selected.index(key_column)
+        select = f"SELECT {', '.join(selected)} FROM {table} WHERE " + (f"({where}) AND " if where else "")
+        first_page_sql = f"{select}1 ORDER BY {key_column} LIMIT ?"
+        next_page_sql = f"{select}{key_column} > ? ORDER BY {key_column} LIMIT ?"
+        page_size = max(1, page_size)
+
+        while True:
+            if after is None:
+                rows = self.query_raw(first_page_sql, (*(params or ()), page_size))
+            else:
+                rows = self.query_raw(next_page_sql, (*(params or ()), after, page_size))
+            if not rows:
+                return
+            yield rows
+            if len(rows) < page_size:
+                return
+            after = rows[-1][key_index]
+
+    def print_query(self, query: str, params: Optional[tuple[Any, ...]] = None,
+                    page_size: int = XRAY_QUERY_PAGE_SIZE, title: Optional[str] = "Query Results") -> int:
+        """
+        Execute a SQL query and stream its result to the console as Rich tables, one table per page, so output
+        starts with the first page and memory use stays bounded.
+        Args:
+            query (str): SQL query to run.
+            params (Optional[tuple]): Optional SQL parameters for safe substitution.
+            page_size (int): Rows rendered per table.
+            title (Optional[str]): Title shown above the first page.
+        Returns:
+            int: Number of printed rows.
+        """
+        printed_rows: int = 0
+        pages = self._iter_pages(query, params, page_size)
+        try:
+            for columns, rows in pages:
+                table = Table(title=title if not printed_rows else None, header_style="bold magenta",
+                              show_header=not printed_rows, show_lines=False, box=box.ROUNDED)
+                for col in columns:
+                    table.add_column(str(col).title(), overflow="ellipsis", style="white")
+                for row in rows:
+                    table.add_row(*[self._format_cell(cell, col) for cell, col in zip(row, columns)])
+
+                self._console.print(table)
+                printed_rows += len(rows)
+        finally:
+            pages.close()
+
+        return printed_rows
+
+    def get_file_meta(self, path: Union[str, Path]) -> Optional[tuple]:
+        """
+        Look up the stored metadata of a single indexed file.
+        Args:
+            path (Union[str, Path]): Absolute file path.
+        Returns:
+            Optional[tuple]: (path, modified, size, inode, checksum, ext, base), or None if not indexed.
+        """
+        rows = self.query_raw(
+            "SELECT path, modified, size, inode, checksum, ext, base FROM file_meta WHERE path = ?", (str(path),))
+        return rows[0] if rows else None
+
+    def find_files_by_checksum(self, checksum: str) -> list[str]:
+        """
+        Look up all indexed files sharing the given content checksum.
+        Args:
+            checksum (str): Content checksum as stored in 'file_meta'.
+        Returns:
+            list[str]: Matching file paths, sorted.
+        """
+        rows = self.query_raw("SELECT path FROM file_meta WHERE checksum = ? ORDER BY path", (checksum,))
+        return [row[0] for row in rows or []]
+
+    def find_files_by_name(self, name: str) -> list[str]:
+        """
+        Look up indexed files by file name (the 'base' column), for example 'main.c'.
+        Args:
+            name (str): File name without directory.
+        Returns:
+            list[str]: Matching file paths, sorted.
+        """
+        rows = self.query_raw("SELECT path FROM file_meta WHERE base = ? ORDER BY path", (name,))
+        return [row[0] for row in rows or []]
+
+    def find_symbol(self, name: str, kind: Optional[str] = None, limit: int = 500) -> list[tuple]:
+        """
+        Indexed "where is X defined" lookup. Shell style wildcards ('*', '?') are accepted in 'name'.
+        Args:
+            name (str): Symbol name, for example 'main' or 'xray_*'.
+            kind (Optional[str]): Restrict to 'function', 'struct', 'union', 'enum', 'typedef', 'macro' or 'variable'.
+            limit (int): Maximum number of results.
+        Returns:
+            list[tuple]: (name, kind, path, line, signature) tuples ordered by name and path.
+        """
+        operator = "GLOB" if any(ch in name for ch in "*?[") else "="
+        if kind is None:
+            rows = self.query_raw(f"""
+                SELECT name, kind, path, line, signature FROM symbols
+                WHERE name {operator} ? ORDER BY name, path, line LIMIT ?
+            """, (name, limit))
+        else:
+            rows = self.query_raw(f"""
+                SELECT name, kind, path, line, signature FROM symbols
+                WHERE name {operator} ? AND kind = ? ORDER BY name, path, line LIMIT ?
+            """, (name, kind, limit))
+        return rows or []
+
+    def _resolve_file_argument(self, file: Union[str, Path]) -> list[str]:
+        """
+        Map a user supplied file reference to indexed paths: an absolute path, a file name ('foo.h')
+        or a trailing path fragment ('include/foo.h').
+        """
+        file = str(file)
+        if os.path.isabs(file):
+            return [os.path.normpath(file)]
+
+        suffix = os.sep + os.path.normpath(file)
+        return [path for path in self.find_files_by_name(os.path.basename(file))
+                if path.endswith(suffix) or os.sep not in file]
+
+    def find_includers(self, file: Union[str, Path], max_depth: int = _XRAY_INCLUDE_MAX_DEPTH,
+                       translation_units_only: bool = False) -> list[tuple[str, int]]:
+        """
+        Transitive reverse include lookup: which files (directly or indirectly) include the given file.
+        Args:
+            file (Union[str, Path]): Absolute path, file name or trailing path fragment of the included file.
+            max_depth (int): Maximum include chain length, 1 returns direct includers only.
+            translation_units_only (bool): Only report '.c' files.
+        Returns:
+            list[tuple[str, int]]: (path, depth) tuples, ordered by depth then path.
+        """
+        return self._walk_include_graph(file, max_depth, reverse=True, translation_units_only=translation_units_only)
+
+    def find_includees(self, file: Union[str, Path], max_depth: int = _XRAY_INCLUDE_MAX_DEPTH) -> list[tuple[str, int]]:
+        """
+        Transitive include lookup: which indexed files the given file (directly or indirectly) includes.
+        Args:
+            file (Union[str, Path]): Absolute path, file name or trailing path fragment of the including file.
+            max_depth (int): Maximum include chain length, 1 returns direct includes only.
+        Returns:
+            list[tuple[str, int]]: (path, depth) tuples, ordered by depth then path.
+        """
+        return self._walk_include_graph(file, max_depth, reverse=False)
+
+    def _walk_include_graph(self, file: Union[str, Path], max_depth: int, reverse: bool,
+                            translation_units_only: bool = False) -> list[tuple[str, int]]:
+        """ Recursive CTE walk of the 'includes' graph, shared by find_includers() and find_includees() """
+        seeds = self._resolve_file_argument(file)
+        if not seeds:
+            return []
+
+        # UNION (rather than UNION ALL) keeps cyclic include graphs bounded
+        if reverse:
+            step = """
+                SELECT includes.src, graph.depth + 1 FROM includes
+                JOIN graph ON includes.resolved_path = graph.path
+                WHERE graph.depth < ?"""
+        else:
+            step = """
+                SELECT includes.resolved_path, graph.depth + 1 FROM includes
+                JOIN graph ON includes.src = graph.path
+                WHERE includes.resolved_path IS NOT NULL AND graph.depth < ?"""
+
+        rows = self.query_raw(f"""
+            WITH RECURSIVE graph(path, depth) AS (
+                SELECT path, 0 FROM file_meta WHERE path IN ({", ".join("?" for _ in seeds)})
+                UNION {step}
+            )
+            SELECT graph.path, MIN(graph.depth) AS depth FROM graph
+            JOIN file_meta ON file_meta.path = graph.path
+            WHERE graph.depth > 0 {"AND file_meta.ext = 'c'" if translation_units_only else ""}
+            GROUP BY graph.path
+            ORDER BY depth, graph.path
+        """, (*seeds, max(1, min(max_depth, _XRAY_INCLUDE_MAX_DEPTH))))
+        return rows or []
+
+    def find_similar_files(self, threshold: float = 0.8, extensions: Optional[list[str]] = None,
+                           limit: int = 500) -> list[tuple[float, list[str]]]:
+        """
+        Report clusters of near-identical files. Candidate pairs are files sharing at least one LSH bucket,
+        their similarity is estimated from the stored MinHash signatures and pairs above the threshold are
+        merged into clusters (union-find), so no pairwise comparison of all files is needed.
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity (0..1) of line pairs.
+            extensions (Optional[list[str]]): Restrict to these file extensions, default 'c' and 'h'.
+            limit (int): Maximum number of reported clusters.
+        Returns:
+            list[tuple[float, list[str]]]: (lowest linking similarity, sorted paths) per cluster, largest first.
+        """
+        extensions = extensions or list(_XRAY_SYMBOL_EXTENSIONS)
+        placeholders = ", ".join("?" for _ in extensions)
+        parent: dict[str, str] = {}
+        link_similarity: dict[str, float] = {}
+        signatures: dict[str, array] = {}
+
+        def _find(_path: str) -> str:
+            while parent.setdefault(_path, _path) != _path:
+                parent[_path] = parent[parent[_path]]
+                _path = parent[_path]
+            return _path
+
+        def _signature(_path: str) -> array:
+            if _path not in signatures:
+                row = self.query_raw("SELECT signature FROM minhash WHERE path = ?", (_path,))
+                signatures[_path] = array('Q', row[0][0]) if row else array('Q')
+            return signatures[_path]
+
+        # Candidate pairs, oversized buckets are skipped since they hold unrelated boilerplate-only files
+        for rows in self.iter_query(f"""
+            WITH members AS (
+                SELECT lsh_buckets.band, lsh_buckets.bucket, lsh_buckets.path FROM lsh_buckets
+                JOIN file_meta ON file_meta.path = lsh_buckets.path
+                WHERE file_meta.ext IN ({placeholders})
+            ),
+            buckets AS (
+                SELECT band, bucket FROM members GROUP BY band, bucket HAVING COUNT(*) BETWEEN 2 AND ?
+            )
+            SELECT DISTINCT a.path, b.path FROM buckets
+            JOIN members a ON a.band = buckets.band AND a.bucket = buckets.bucket
+            JOIN members b ON b.band = buckets.band AND b.bucket = buckets.bucket AND a.path < b.path
+        """, (*extensions, XRAY_LSH_MAX_BUCKET_SIZE)):
+            for first, second in rows:
+                first_root, second_root = _find(first), _find(second)
+                if first_root == second_root:
+                    continue
+                first_signature, second_signature = _signature(first), _signature(second)
+                if not first_signature or len(first_signature) != len(second_signature):
+                    continue
+                similarity = sum(x == y for x, y in zip(first_signature, second_signature)) / len(first_signature)
+                if similarity >= threshold:
+                    parent[second_root] = first_root
+                    link_similarity[first_root] = min(similarity, link_similarity.get(first_root, 1.0),
+                                                      link_similarity.get(second_root, 1.0))
+
+        clusters: dict[str, list[str]] = {}
+        for path in parent:
+            clusters.setdefault(_find(path), []).append(path)
+
+        result = [(link_similarity.get(root, 1.0), sorted(paths)) for root, paths in clusters.items() if len(paths) > 1]
+        result.sort(key=lambda cluster: (-len(cluster[1]), -cluster[0], cluster[1][0]))
+        return result[:limit]
+
+    def find_duplicate_blocks(self, min_lines: int = 10, extensions: Optional[list[str]] = None,
+                              limit: int = 500) -> list[tuple[int, str, int, int, str, int, int]]:
+        """
+        Report copy-pasted regions. Locations sharing a fingerprint are paired by an indexed self-join on
+        'fingerprints.hash', then consecutive overlapping matches between the same two files are merged into
+        regions. Fingerprints occurring more than XRAY_FINGERPRINT_MAX_OCCURRENCES times are ignored as boilerplate.
+        Args:
+            min_lines (int): Minimum region length in source lines.
+            extensions (Optional[list[str]]): Restrict to these file extensions, default 'c' and 'h'.
+            limit (int): Maximum number of reported regions.
+        Returns:
+            list[tuple]: (lines, path_a, start_a, end_a, path_b, start_b, end_b) tuples, largest regions first.
+        """
+        extensions = extensions or list(_XRAY_SYMBOL_EXTENSIONS)
+        placeholders = ", ".join("?" for _ in extensions)
+        regions: list[tuple[int, str, int, int, str, int, int]] = []
+        current_pair: Optional[tuple[str, str]] = None
+        open_regions: list[list[int]] = []  # [start_a, end_a, start_b, end_b] for the current pair of files
+
+        def _close_regions(_before_line: Optional[int] = None):
+            """ Emit the open regions which can no longer grow (all of them when '_before_line' is None) """
+            _still_open = []
+            for _region in open_regions:
+                if _before_line is not None and _region[1] + 1 >= _before_line:
+                    _still_open.append(_region)
+                elif _region[1] - _region[0] + 1 >= min_lines:
+                    regions.append((_region[1] - _region[0] + 1, current_pair[0], _region[0], _region[1],
+                                    current_pair[1], _region[2], _region[3]))
+            open_regions[:] = _still_open
+
+        for rows in self.iter_query(f"""
+            WITH duplicated AS (
+                SELECT hash FROM fingerprints GROUP BY hash HAVING COUNT(*) BETWEEN 2 AND ?
+            ),
+            members AS (
+                SELECT fingerprints.hash, fingerprints.path, fingerprints.line_start, fingerprints.line_end
+                FROM duplicated
+                JOIN fingerprints ON fingerprints.hash = duplicated.hash
+                JOIN file_meta ON file_meta.path = fingerprints.path
+                WHERE file_meta.ext IN ({placeholders})
+            )
+            SELECT a.path, a.line_start, a.line_end, b.path, b.line_start, b.line_end
+            FROM members a
+            JOIN members b ON b.hash = a.hash
+                AND (a.path < b.path OR (a.path = b.path AND a.line_end < b.line_start))
+            ORDER BY a.path, b.path, a.line_start, b.line_start
+        """, (XRAY_FINGERPRINT_MAX_OCCURRENCES, *extensions)):
+            for path_a, start_a, end_a, path_b, start_b, end_b in rows:
+                if (path_a, path_b) != current_pair:
+                    if current_pair is not None:
+                        _close_regions()
+                    current_pair = (path_a, path_b)
+                else:
+                    _close_regions(_before_line=start_a)  # Rows are ordered by 'a.line_start'
+
+                # Extend a region whose both sides overlap or touch this match, otherwise start a new one
+                for region in open_regions:
+                    if start_a <= region[1] + 1 and region[2] - 1 <= start_b <= region[3] + 1:
+                        region[1], region[3] = max(region[1], end_a), max(region[3], end_b)
+                        break
+                else:
+                    open_regions.append([start_a, end_a, start_b, end_b])
+
+        if current_pair is not None:
+            _close_regions()
+
+        regions.sort(key=lambda region: (-region[0], region[1], region[2]))
+        return regions[:limit]
+
+    @staticmethod
+    def _build_trigram_query(pattern: str, flags: int = 0) -> Optional[str]:
+        """
+        Translate the literals required by a regular expression into an FTS5 query, for example
+        'foo_\\w+_(init|exit)' yields '"foo_" AND ("exit" OR "init")'.
+        Returns:
+            Optional[str]: FTS5 MATCH expression, None when the pattern has no usable literal.
+        """
+        clauses = _required_literals(_sre_parser.parse(pattern, flags))
+        if not clauses:
+            return None
+
+        def _phrase(_literal: str) -> str:
+            return '"' + _literal.replace('"', '""') + '"'
+
+        return " AND ".join(_phrase(clause[0]) if len(clause) == 1 else
+                            "(" + " OR ".join(_phrase(_literal) for _literal in clause) + ")" for clause in clauses)
+
+    def grep(self, pattern: str, extensions: Optional[list[str]] = None, ignore_case: bool = False,
+             context: int = 0, limit: Optional[int] = None
+             ) -> Iterator[tuple[str, int, int, int, str, list[str], list[str]]]:
+        """
+        Regular expression search over the indexed files. The literals the pattern requires are turned into an FTS5
+        trigram query which selects candidate files, ranked by relevance (bm25). Candidates are then matched in a
+        pool of worker processes and results are yielded as soon as each batch completes, in ranking order.
+        Args:
+            pattern (str): Python regular expression, matched line by line.
+            extensions (Optional[list[str]]): Restrict to these file extensions.
+            ignore_case (bool): Case-insensitive matching.
+            context (int): Number of context lines reported around each match.
+            limit (Optional[int]): Stop after this many matching lines.
+        Yields:
+            tuple: (path, line, column, end column, text, lines before, lines after), 1-based lines and columns.
+        """
+        flags = re.IGNORECASE if ignore_case else 0
+        re.compile(pattern, flags)  # Fail early on invalid patterns
+        trigram_query = self._build_trigram_query(pattern, flags)
+
+        ext_filter = ""
+        params: list[Any] = []
+        if extensions:
+            ext_filter = f"file_meta.ext IN ({', '.join('?' for _ in extensions)})"
+            params.extend(extensions)
+
+        if trigram_query is None:
+            self._logger.debug(f"No literal could be extracted from '{pattern}', scanning all indexed files")
+            query = f"SELECT path FROM file_meta {'WHERE ' + ext_filter if ext_filter else ''} ORDER BY path"
+        else:
+            # The trigram index is queried in each shard, candidates are then merged by rank
+            if self._db_storage_mode == "plain":
+                shard_query = f"""
+                    SELECT files.path, files.rank FROM {{schema}}.files
+                    JOIN {{schema}}.file_meta ON file_meta.path = files.path
+                    WHERE files MATCH ? {'AND ' + ext_filter if ext_filter else ''}
+                """
+            else:
+                shard_query = f"""
+                    SELECT file_meta.path, contents.rank FROM {{schema}}.contents
+                    JOIN {{schema}}.file_meta ON file_meta.content_id = contents.rowid
+                    WHERE contents MATCH ? {'AND ' + ext_filter if ext_filter else ''}
+                """
+            query, shard_params = self._fan_out(shard_query, (trigram_query, *params))
+            query = f"SELECT path FROM ({query}) ORDER BY rank"
+            params = list(shard_params)
+
+        workers = XRAY_NUM_WORKERS
+        pending: deque = deque()
+        produced = 0
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=_worker_process_context())
+        pages = self.iter_query(query, tuple(params), page_size=XRAY_GREP_BATCH_SIZE)
+        try:
+            def _completed(_max_pending: int):
+                """ Yield the results of the oldest batches, keeping the output in ranking order """
+                while pending and (len(pending) > _max_pending or pending[0].done()):
+                    yield from pending.popleft().result()
+
+            for rows in pages:
+                pending.append(pool.submit(_grep_files, [row[0] for row in rows], pattern, flags, context))
+                for result in _completed(_max_pending=workers * 2):
+                    yield result
+                    produced += 1
+                    if limit and produced >= limit:
+                        return
+
+            for result in _completed(_max_pending=0):
+                yield result
+                produced += 1
+                if limit and produced >= limit:
+                    return
+        finally:
+            pages.close()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def refresh(self, root: Optional[Union[str, Path]] = None) -> Optional[int]:
         """
         Triggers an immediate reindexing of the SQLite database by simulating an outdated
         last-indexed timestamp. This forces the monitor thread to re-enter the indexing state.
         Can only be executed when the system is in the IDLE state.
+        Args:
+            root (Optional[Union[str, Path]]): Only re-index this managed path, other paths are neither read
+                nor compacted and, when 'db_shard_by_path' is enabled, their shards are not written.
         """
+        refresh_roots: Optional[list[Path]] = None
+        if root is not None:
+            root = Path(root).resolve()
+            refresh_roots = [path for path in self._managed_paths or [] if path.resolve() == root]
+            if not refresh_roots:
+                raise ValueError(f"'{root}' is not a managed path")
+
         # Simulate an old last-indexed date to force reindexing
         self._db_last_indexed_date = datetime(1970, 1, 1, tzinfo=timezone.utc)
         self._db_last_indexed_age_days = 0
 
-        # Attempt to reset the state to DB_READY, only if it's already IDLE
-        if self._set_state(new_state=XRayStateType.DB_READY,
-                           initial_state=XRayStateType.IDLE) != XRayStateType.DB_READY:
-            raise RuntimeError("Cannot refresh: DB is not in READY state")
+        # Attempt to reset the state to DB_READY, only if it's already IDLE (possibly serving queries)
+        with self._lock:
+            if self._state not in (XRayStateType.IDLE, XRayStateType.DB_QUERY):
+                raise RuntimeError("Cannot refresh: DB is not in READY state")
+            self._refresh_roots = refresh_roots
+            self._state = XRayStateType.DB_READY
 
         return 0
 
@@ -1213,6 +3420,19 @@ class CoreXRayDB(CoreModuleInterface):
             else:
                 raise RuntimeError(exception_message) from exception
 
+    @property
+    def writer_stats(self) -> dict[str, Any]:
+        """ Per-batch commit statistics of the last indexing pass, useful for tuning 'db_writer_commit_*' """
+        return self._writer_stats.as_dict()
+
+    @property
+    def indexing_progress(self) -> dict[str, Any]:
+        """
+        Progress of the running (or last) indexing pass. 'queued' keeps growing while 'enumerating' is set,
+        queries remain available meanwhile and see the rows committed so far.
+        """
+        return self._index_progress.as_dict()
+
     @property
     def state(self) -> XRayStateType:
         with self._lock:
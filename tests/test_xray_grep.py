@@ -0,0 +1,32 @@
+"""
+Script:         test_xray_grep.py
+Author:         AutoForge Team
+
+Description:
+    Checks that the trigram prefilter used by 'CoreXRayDB.grep()' never rejects a file the pattern matches,
+    in particular when the pattern holds whitespace which the index stores normalized.
+"""
+
+import re
+
+import pytest
+
+# AutoForge imports
+from auto_forge.core.xray import CoreXRayDB
+
+
+@pytest.mark.parametrize("pattern, line", [
+    ("int\tmain", "int\tmain(void)"),
+    ("foo  bar", "    x = foo  bar;"),
+    ("return\t  value;", "\treturn\t  value;   "),
+])
+def test_trigram_query_matches_normalized_content(pattern: str, line: str):
+    assert re.search(pattern, line)
+
+    trigram_query = CoreXRayDB._build_trigram_query(pattern)
+    assert trigram_query is not None
+
+    # Every phrase of the query must be found in the content as stored in the index
+    indexed_content = CoreXRayDB._filter_file_content(line + "\n")
+    for phrase in re.findall(r'"((?:[^"]|"")*)"', trigram_query):
+        assert phrase.replace('""', '"') in indexed_content, trigram_query